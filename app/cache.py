@@ -0,0 +1,237 @@
+# --------------------------------------------
+# cache.py
+# Caché de artefactos direccionada por contenido (gráficas, modelos, planos, PDF)
+# --------------------------------------------
+
+import os
+import shutil
+import hashlib
+from collections.abc import Mapping
+import numpy as np
+
+# Cambiar al modificar cómo se generan los artefactos: invalida toda la caché
+VERSION_CACHE = 2
+LIMITE_BYTES = 512 * 1024 ** 2
+CACHE_DIR = os.path.join("outputs", "cache")
+
+# --------------------------------------------
+# Alimenta el hash con una representación canónica del valor
+# --------------------------------------------
+def _actualizar(h, valor):
+    if isinstance(valor, np.ndarray):
+        h.update(f"a{valor.dtype.str}{valor.shape}".encode())
+        h.update(np.ascontiguousarray(valor).tobytes())
+    elif isinstance(valor, (bytes, bytearray, memoryview)):
+        h.update(b"b%d:" % len(valor))
+        h.update(valor)
+    elif isinstance(valor, Mapping):
+        # dict y los resultados tipados (ParametrosDiseno) se hashean igual
+        h.update(b"d%d:" % len(valor))
+        for clave in sorted(valor, key=str):
+            _actualizar(h, str(clave))
+            _actualizar(h, valor[clave])
+    elif isinstance(valor, (list, tuple)):
+        h.update(b"l%d:" % len(valor))
+        for elemento in valor:
+            _actualizar(h, elemento)
+    elif isinstance(valor, np.generic):
+        _actualizar(h, valor.item())
+    else:
+        # str, int, float, bool y None: repr distingue 1, 1.0, '1' y True
+        texto = repr(valor).encode('utf-8')
+        h.update(b"s%d:" % len(texto))
+        h.update(texto)
+
+# --------------------------------------------
+# Huella sha256 de las entradas de un artefacto
+# --------------------------------------------
+def huella(tipo, *entradas):
+    """
+    Las entradas pueden ser escalares, cadenas, bytes, arreglos numpy y
+    listas o diccionarios de ellos. Los arreglos se hashean por dtype, forma
+    y contenido, así que dos simulaciones idénticas dan la misma huella
+    """
+    h = hashlib.sha256()
+    _actualizar(h, (VERSION_CACHE, tipo, entradas))
+    return h.hexdigest()
+
+# --------------------------------------------
+# Tamaño en bytes de los archivos de una entrada
+# --------------------------------------------
+def _tamano_entrada(ruta):
+    return sum(archivo.stat().st_size for archivo in os.scandir(ruta) if archivo.is_file())
+
+# --------------------------------------------
+# Copia un artefacto fuera de la caché (enlace duro si es posible)
+# --------------------------------------------
+def publicar(origen, destino):
+    if os.path.exists(destino):
+        os.remove(destino)
+    try:
+        os.link(origen, destino)
+    except OSError:
+        shutil.copyfile(origen, destino)
+    return destino
+
+# --------------------------------------------
+# Caché de artefactos en disco con desalojo LRU por tamaño total
+# --------------------------------------------
+class CacheArtefactos:
+    """
+    Cada artefacto vive en directorio/<tipo>-<huella>/<nombre>: diseños
+    distintos quedan uno al lado del otro y nunca se sobrescriben. Si ya
+    existe una entrada con la misma huella se reutiliza sin regenerar; al
+    reutilizarla se actualiza su fecha de modificación, que ordena el
+    desalojo (se borran primero las entradas usadas hace más tiempo hasta
+    quedar por debajo de limite_bytes)
+    """
+
+    def __init__(self, directorio=CACHE_DIR, limite_bytes=LIMITE_BYTES):
+        self.directorio = directorio
+        self.limite_bytes = limite_bytes
+        self.aciertos = 0
+        self.fallos = 0
+        os.makedirs(directorio, exist_ok=True)
+
+    def entrada(self, tipo, clave):
+        return os.path.join(self.directorio, f"{tipo}-{clave[:24]}")
+
+    # --------------------------------------------
+    # Devuelve las rutas del artefacto, generándolo solo si no está en caché
+    # --------------------------------------------
+    def obtener(self, tipo, entradas, nombres, generar):
+        """
+        entradas: tupla de valores de los que depende el artefacto (ver huella).
+        nombres: archivo o tupla de archivos que produce generar.
+        generar(rutas) recibe un diccionario nombre -> ruta y debe escribir
+        todos los archivos. Devuelve ese mismo diccionario (o la ruta si
+        nombres es una cadena). Se genera en un directorio temporal que se
+        renombra al final, así que una entrada nunca queda a medias
+        """
+        unico = isinstance(nombres, str)
+        nombres = (nombres,) if unico else tuple(nombres)
+        destino = self.entrada(tipo, huella(tipo, *entradas))
+        rutas = {nombre: os.path.join(destino, nombre) for nombre in nombres}
+
+        if all(os.path.isfile(ruta) for ruta in rutas.values()):
+            self.aciertos += 1
+            os.utime(destino)
+        else:
+            self.fallos += 1
+            temporal = f"{destino}.tmp{os.getpid()}"
+            shutil.rmtree(temporal, ignore_errors=True)
+            os.makedirs(temporal)
+            try:
+                generar({nombre: os.path.join(temporal, nombre) for nombre in nombres})
+                shutil.rmtree(destino, ignore_errors=True)
+                os.replace(temporal, destino)
+            except OSError:
+                # Otro proceso publicó la misma entrada mientras se generaba
+                if not all(os.path.isfile(ruta) for ruta in rutas.values()):
+                    raise
+            finally:
+                shutil.rmtree(temporal, ignore_errors=True)
+            self.desalojar(conservar=destino)
+
+        return rutas[nombres[0]] if unico else rutas
+
+    # --------------------------------------------
+    # Ruta del archivo si ya está en caché (o None), sin generarlo
+    # --------------------------------------------
+    def existente(self, tipo, entradas, nombre):
+        destino = self.entrada(tipo, huella(tipo, *entradas))
+        ruta = os.path.join(destino, nombre)
+        if not os.path.isfile(ruta):
+            return None
+        self.aciertos += 1
+        os.utime(destino)
+        return ruta
+
+    # --------------------------------------------
+    # Guarda bytes ya generados (p. ej. en otro proceso) como artefacto
+    # --------------------------------------------
+    def guardar_bytes(self, tipo, entradas, nombre, datos):
+        def generar(rutas):
+            with open(rutas[nombre], 'wb') as f:
+                f.write(datos)
+        return self.obtener(tipo, entradas, nombre, generar)
+
+    # --------------------------------------------
+    # Igual que obtener pero devuelve los bytes del archivo
+    # --------------------------------------------
+    def obtener_bytes(self, tipo, entradas, nombre, generar):
+        with open(self.obtener(tipo, entradas, nombre, generar), 'rb') as f:
+            return f.read()
+
+    # --------------------------------------------
+    # Borra las entradas menos usadas hasta respetar el límite de tamaño
+    # --------------------------------------------
+    def desalojar(self, conservar=None):
+        entradas = [(e.stat().st_mtime, _tamano_entrada(e.path), e.path)
+                    for e in os.scandir(self.directorio) if e.is_dir() and '.tmp' not in e.name]
+        total = sum(tamano for _, tamano, _ in entradas)
+        for _, tamano, ruta in sorted(entradas):
+            if total <= self.limite_bytes:
+                break
+            if ruta == conservar:
+                continue
+            shutil.rmtree(ruta, ignore_errors=True)
+            total -= tamano
+        return total
+
+    def limpiar(self):
+        shutil.rmtree(self.directorio, ignore_errors=True)
+        os.makedirs(self.directorio, exist_ok=True)
+
+# --------------------------------------------
+# Artefactos del proyecto a través de la caché
+# --------------------------------------------
+def grafica_cache(cache, freq, TL, delta_L, TL_total, bandas=None, como_ruta=False):
+    """Bytes PNG de la curva de atenuación (o su ruta en la caché)"""
+    from app.plotting.plots import plot_attenuation_curves
+    return (cache.obtener if como_ruta else cache.obtener_bytes)(
+        'grafica', (freq, TL, delta_L, TL_total, bandas), "TL_vs_freq.png",
+        lambda rutas: plot_attenuation_curves(freq, TL, delta_L, TL_total, rutas["TL_vs_freq.png"], bandas=bandas))
+
+def planos_cache(cache, length, width, height, n_baffles, baffle_thickness=0.02, wall_thickness=0.005,
+                 n_procesos=None, como_ruta=False, disposicion=None):
+    """
+    Bytes PNG de los planos técnicos (o su ruta); cada vista se guarda además
+    por separado. La separación entre baffles sale de geometria.Geometria
+    (o de 'disposicion' si la disposición no es uniforme)
+    """
+    from app.plotting.technical_drawings import generate_technical_drawings
+    entradas = (length, width, height, n_baffles, baffle_thickness, wall_thickness)
+    return (cache.obtener if como_ruta else cache.obtener_bytes)(
+        'planos', (*entradas, disposicion), "planos_tecnicos.png",
+        lambda rutas: generate_technical_drawings(*entradas, os.path.dirname(rutas["planos_tecnicos.png"]),
+                                                  cache=cache, n_procesos=n_procesos, disposicion=disposicion))
+
+def modelo_cache(cache, length, width, height, n_baffles, baffle_thickness=0.02, wall_thickness=0.005,
+                 baffle_color="#C0C0C0", html=False, malla=None, disposicion=None):
+    """
+    Rutas de la captura del modelo 3D ('modelo_3d.png') y, si se piden, del
+    HTML interactivo y de la malla ('glb', 'stl' u 'obj'). Como en
+    planos_cache, la separación entre baffles sale de geometria.Geometria
+    """
+    from app.plotting.graphics import generate_3d_model
+    nombres = ["modelo_3d.png"] + (["modelo_3d.html"] if html else []) + ([f"modelo_3d.{malla}"] if malla else [])
+
+    def generar(rutas):
+        generate_3d_model(length, width, height, n_baffles, baffle_thickness, wall_thickness, baffle_color=baffle_color,
+                          img_path=rutas["modelo_3d.png"], html_path=rutas.get("modelo_3d.html"),
+                          mesh_path=rutas.get(f"modelo_3d.{malla}"), disposicion=disposicion)
+
+    entradas = (length, width, height, n_baffles, baffle_thickness, wall_thickness)
+    return cache.obtener('modelo3d', (*entradas, baffle_color, html, malla, disposicion), nombres, generar)
+
+def reporte_cache(cache, data, secciones=('diseno',), nombre="reporte_silenciador.pdf"):
+    """
+    Ruta del PDF del diseño. data se hashea completo salvo pdf_path; las
+    imágenes solo cuentan si el reporte incluye la sección del diseño
+    """
+    from app.plotting.report import reporte_diseno
+    from app.project import CLAVES_RENDER
+    ignoradas = {'pdf_path'} if 'diseno' in secciones else {'pdf_path', *CLAVES_RENDER}
+    entradas = ({clave: valor for clave, valor in data.items() if clave not in ignoradas}, tuple(secciones))
+    return cache.obtener('reporte', entradas, nombre, lambda rutas: reporte_diseno(data, rutas[nombre], secciones))
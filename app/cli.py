@@ -0,0 +1,300 @@
+# --------------------------------------------
+# cli.py
+# Interfaz de línea de comandos: diseños desde flags, JSON o NDJSON y una línea JSON por resultado
+# --------------------------------------------
+
+"""
+Ejemplos:
+
+    python main.py --Q 10000 --V 12 --H 0.3 --L 1.7
+    python main.py --entrada disenos.json --salidas resumen,bandas
+    generador | python main.py --entrada - --lote 4096 | jq .TL_max
+    python main.py --L 2.0 --artefactos grafica,planos,reporte
+
+Cada registro de entrada es un objeto JSON con cualquiera de las claves de
+CAMPOS (más un 'id' opcional que se devuelve tal cual); las claves que
+faltan toman el valor de los flags. No importa Qt ni VTK: las gráficas,
+planos y reportes usan matplotlib/fpdf2 y la malla 3D se exporta con numpy.
+"""
+
+import sys
+import json
+import argparse
+import numpy as np
+from app.simulation.solver import calcular_parametros_lote, FREQS_MATERIAL, ALPHAS_MATERIALES
+from app.simulation.models import SplitterSilencer
+from app.simulation.resultados import ResultadoDiseno
+from app.simulation.sensitivity import promedio_por_banda, BANDAS_OCTAVA
+
+# Entradas de un diseño y sus valores por defecto (los de la versión de consola original)
+CAMPOS = {
+    'Q_m3h': 10000.0,
+    'V': 12.0,
+    'H': 0.3,
+    'L': 1.7,
+    'material': 'lana100',
+    'fmin': 100.0,
+    'fmax': 500.0,
+    'baffle_thickness': 0.02,
+    'wall_thickness': 0.005,
+}
+SALIDAS = ('resumen', 'presion', 'bandas', 'curvas')
+ARTEFACTOS = ('grafica', 'planos', 'reporte', 'malla')
+CAMPOS_PRESION = ('v_frontal', 'v_paso', 'Re', 'dp_entrada', 'dp_friccion', 'dp_salida', 'dp_total')
+NUMERICOS = ('Q_m3h', 'V', 'H', 'L', 'baffle_thickness', 'wall_thickness')
+POSITIVOS = ('Q_m3h', 'V', 'H', 'L')  # el resto de NUMERICOS (espesores) admite 0
+
+# --------------------------------------------
+# Argumentos
+# --------------------------------------------
+def _lista(opciones):
+    def convertir(texto):
+        valores = [v.strip() for v in texto.split(',') if v.strip()]
+        invalidos = [v for v in valores if v not in opciones]
+        if invalidos:
+            raise argparse.ArgumentTypeError(f"valores no válidos: {', '.join(invalidos)} (opciones: {', '.join(opciones)})")
+        return valores
+    return convertir
+
+def crear_parser():
+    parser = argparse.ArgumentParser(
+        prog='asiss', description="Simulación de silenciadores tipo splitter sin interfaz gráfica. "
+                                  "Escribe una línea JSON por diseño en la salida estándar.")
+    diseno = parser.add_argument_group("diseño (valores por defecto de cada registro)")
+    diseno.add_argument('--Q', dest='Q_m3h', type=float, default=CAMPOS['Q_m3h'], help="caudal [m³/h]")
+    diseno.add_argument('--V', type=float, default=CAMPOS['V'], help="velocidad de paso [m/s]")
+    diseno.add_argument('--H', type=float, default=CAMPOS['H'], help="altura [m]")
+    diseno.add_argument('--L', type=float, default=CAMPOS['L'], help="longitud [m]")
+    diseno.add_argument('--material', choices=sorted(ALPHAS_MATERIALES), default=CAMPOS['material'])
+    diseno.add_argument('--fmin', type=float, default=CAMPOS['fmin'], help="frecuencia mínima [Hz]")
+    diseno.add_argument('--fmax', type=float, default=CAMPOS['fmax'], help="frecuencia máxima [Hz]")
+    diseno.add_argument('--espesor-baffle', dest='baffle_thickness', type=float, default=CAMPOS['baffle_thickness'])
+    diseno.add_argument('--espesor-pared', dest='wall_thickness', type=float, default=CAMPOS['wall_thickness'])
+
+    parser.add_argument('--entrada', metavar='RUTA',
+                        help="archivo .json (objeto o lista) o NDJSON (un objeto por línea); '-' lee NDJSON de stdin")
+    parser.add_argument('--salidas', type=_lista(SALIDAS), default=['resumen'],
+                        help=f"qué incluir en cada línea, separado por comas: {', '.join(SALIDAS)} (por defecto resumen)")
+    parser.add_argument('--artefactos', type=_lista(ARTEFACTOS), default=[],
+                        help=f"archivos a generar por diseño: {', '.join(ARTEFACTOS)} (en la caché de artefactos)")
+    parser.add_argument('--dir-artefactos', default=None, help="directorio de la caché (por defecto outputs/cache)")
+    parser.add_argument('--lote', type=int, default=1024,
+                        help="diseños evaluados juntos por lote vectorizado; la salida se vacía tras cada lote "
+                             "(1 = una línea en cuanto se lee cada registro)")
+    return parser
+
+# --------------------------------------------
+# Lectura perezosa de registros
+# --------------------------------------------
+def leer_registros(args):
+    """Generador de diccionarios de entrada (flags + registro)"""
+    base = {campo: getattr(args, campo) for campo in CAMPOS}
+    if args.entrada is None:
+        yield base
+        return
+
+    if args.entrada == '-':
+        lineas = sys.stdin
+    elif args.entrada.lower().endswith('.json'):
+        with open(args.entrada, encoding='utf-8') as f:
+            contenido = json.load(f)
+        for numero, registro in enumerate(contenido if isinstance(contenido, list) else [contenido], start=1):
+            if isinstance(registro, dict):
+                yield {**base, **registro}
+            else:
+                yield {'error': f"elemento {numero}: se esperaba un objeto JSON"}
+        return
+    else:
+        lineas = open(args.entrada, encoding='utf-8')
+
+    with lineas:
+        for numero, linea in enumerate(lineas, start=1):
+            linea = linea.strip()
+            if not linea:
+                continue
+            try:
+                registro = json.loads(linea)
+            except json.JSONDecodeError as e:
+                yield {'error': f"línea {numero}: {e.msg}"}
+                continue
+            if isinstance(registro, dict):
+                yield {**base, **registro}
+            else:
+                yield {'error': f"línea {numero}: se esperaba un objeto JSON"}
+
+# --------------------------------------------
+# Valor numérico de un campo (JSON number; true/false no cuentan como número)
+# --------------------------------------------
+def _numero(registro, campo):
+    valor = registro[campo]
+    if isinstance(valor, bool) or not isinstance(valor, (int, float)):
+        raise ValueError(f"{campo} debe ser un número: {json.dumps(valor, ensure_ascii=False)}")
+    return float(valor)
+
+# --------------------------------------------
+# Rango válido de las entradas numéricas de un registro
+# --------------------------------------------
+def _validar(valores, fmin, fmax):
+    """Mensaje de error del primer valor fuera de rango, o None"""
+    for campo, valor in zip(NUMERICOS, valores):
+        if not np.isfinite(valor):
+            return f"{campo} debe ser finito: {valor}"
+        if campo in POSITIVOS and valor <= 0:
+            return f"{campo} debe ser positivo: {valor}"
+        if valor < 0:
+            return f"{campo} no puede ser negativo: {valor}"
+    if not (np.isfinite(fmin) and np.isfinite(fmax)):
+        return f"fmin y fmax deben ser finitos: {fmin}, {fmax}"
+    if not 0 <= fmin < fmax:
+        return f"se requiere 0 <= fmin < fmax: {fmin}, {fmax}"
+    return None
+
+def _lotes(registros, tam):
+    lote = []
+    for registro in registros:
+        lote.append(registro)
+        if len(lote) >= tam:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+# --------------------------------------------
+# Evalúa un lote con una sola llamada vectorizada por (material, fmin, fmax)
+# --------------------------------------------
+def evaluar_lote(registros, salidas, disenos=False):
+    """Con disenos=True cada fila lleva además '_diseno', el ResultadoDiseno completo para los artefactos"""
+    resultados = [None] * len(registros)
+    valores = {}
+    grupos = {}
+    for i, registro in enumerate(registros):
+        if 'error' in registro:
+            resultados[i] = registro
+            continue
+        material = registro['material']
+        if not isinstance(material, str) or material not in ALPHAS_MATERIALES:
+            resultados[i] = {'id': registro.get('id'),
+                             'error': f"material desconocido: {json.dumps(material, ensure_ascii=False)}"}
+            continue
+        try:
+            valores[i] = [_numero(registro, campo) for campo in NUMERICOS]
+            clave = (material, _numero(registro, 'fmin'), _numero(registro, 'fmax'))
+        except ValueError as e:
+            resultados[i] = {'id': registro.get('id'), 'error': str(e)}
+            continue
+        error = _validar(valores[i], *clave[1:])
+        if error is not None:
+            resultados[i] = {'id': registro.get('id'), 'error': error}
+            continue
+        grupos.setdefault(clave, []).append(i)
+
+    for (material, fmin, fmax), indices in grupos.items():
+        x = dict(zip(NUMERICOS, np.array([valores[i] for i in indices]).T))
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            geo = calcular_parametros_lote(x['Q_m3h'], x['V'], x['H'], x['L'], fmin, fmax, material,
+                                           x['baffle_thickness'], x['wall_thickness'])
+            freq = geo['freq']
+            alpha = np.interp(freq, FREQS_MATERIAL, ALPHAS_MATERIALES[material])
+            splitter = SplitterSilencer(geo['L'][:, None], geo['width'][:, None], geo['n_baffles'][:, None], alpha)
+            TL = splitter.transmission_loss(freq)
+            delta_L = np.broadcast_to(splitter.delta_L(freq), TL.shape)
+            TL_total = TL + delta_L
+            bandas = promedio_por_banda(freq, TL_total) if 'bandas' in salidas else None
+            # Entradas válidas pero extremas (p. ej. H = 1e-320) desbordan la geometría
+            finitos = np.isfinite(TL_total).all(axis=1)
+            for campo in ('n_espacios', 'width', 'S', 'v_paso', 'dp_total'):
+                finitos &= np.isfinite(geo[campo])
+
+        for k, i in enumerate(indices):
+            registro = registros[i]
+            if not finitos[k]:
+                resultados[i] = {'id': registro.get('id'), 'error': "diseño fuera de rango: resultado no finito"}
+                continue
+            fila = {'id': registro.get('id')} if 'id' in registro else {}
+            if 'resumen' in salidas:
+                fila.update({
+                    'Q_m3h': float(x['Q_m3h'][k]), 'V': float(x['V'][k]), 'H': float(x['H'][k]),
+                    'L': float(x['L'][k]), 'material': material,
+                    'n_espacios': int(geo['n_espacios'][k]), 'n_baffles': int(geo['n_baffles'][k]),
+                    'width': float(geo['width'][k]), 'h': float(geo['h']), 'S': float(geo['S'][k]),
+                    'v_paso': float(geo['v_paso'][k]), 'dp_total': float(geo['dp_total'][k]),
+                    'TL_max': float(TL_total[k].max()),
+                })
+            if 'presion' in salidas:
+                fila['presion'] = {campo: float(geo[campo][k]) for campo in CAMPOS_PRESION}
+            if 'bandas' in salidas:
+                fila['bandas'] = {str(fc): (None if np.isnan(v) else float(v)) for fc, v in zip(BANDAS_OCTAVA, bandas[k])}
+            if 'curvas' in salidas:
+                fila['curvas'] = {'freq': freq.tolist(), 'TL': TL[k].tolist(),
+                                  'delta_L': delta_L[k].tolist(), 'TL_total': TL_total[k].tolist()}
+            if disenos:
+                # Datos completos del diseño para los artefactos (no se escriben)
+                fila['_diseno'] = ResultadoDiseno(geo.diseno(k), TL=TL[k], delta_L=delta_L[k], TL_total=TL_total[k])
+            resultados[i] = fila
+    return resultados
+
+# --------------------------------------------
+# Artefactos de un diseño (importaciones perezosas: solo matplotlib/fpdf2)
+# --------------------------------------------
+def generar_artefactos(cache, diseno, artefactos):
+    from app.cache import grafica_cache, planos_cache, reporte_cache
+    rutas = {}
+    L, width, H, n_baffles = diseno['L'], diseno['width'], diseno['H'], diseno['n_baffles']
+    data = diseno.copy()
+    if 'grafica' in artefactos or 'reporte' in artefactos:
+        rutas['grafica'] = grafica_cache(cache, diseno['freq'], diseno['TL'], diseno['delta_L'], diseno['TL_total'],
+                                         como_ruta=True)
+        with open(rutas['grafica'], 'rb') as f:
+            data['graph_png'] = f.read()
+    if 'planos' in artefactos or 'reporte' in artefactos:
+        rutas['planos'] = planos_cache(cache, L, width, H, n_baffles, diseno['baffle_thickness'],
+                                       diseno['wall_thickness'], como_ruta=True)
+        with open(rutas['planos'], 'rb') as f:
+            data['technical_drawings_png'] = f.read()
+    if 'reporte' in artefactos:
+        rutas['reporte'] = reporte_cache(cache, data)
+    if 'malla' in artefactos:
+        from app.plotting.mesh_export import exportar_modelo
+        espesores = (diseno['wall_thickness'], diseno['baffle_thickness'])
+        rutas['malla'] = cache.obtener('malla', (L, width, H, n_baffles, *espesores), "modelo_3d.glb",
+                                       lambda r: exportar_modelo(r["modelo_3d.glb"], L, width, H, n_baffles,
+                                                                 wall_thickness=espesores[0],
+                                                                 baffle_thickness=espesores[1]))
+    return {clave: rutas[clave] for clave in artefactos}
+
+# --------------------------------------------
+# Punto de entrada
+# --------------------------------------------
+def main(argv=None):
+    args = crear_parser().parse_args(argv)
+    cache = None
+    if args.artefactos:
+        from app.cache import CacheArtefactos, CACHE_DIR
+        cache = CacheArtefactos(args.dir_artefactos or CACHE_DIR)
+
+    salida = sys.stdout
+    errores = 0
+    try:
+        for lote in _lotes(leer_registros(args), max(args.lote, 1)):
+            for fila in evaluar_lote(lote, args.salidas, disenos=cache is not None):
+                diseno = fila.pop('_diseno', None)
+                if 'error' in fila:
+                    errores += 1
+                elif cache is not None:
+                    fila['artefactos'] = generar_artefactos(cache, diseno, args.artefactos)
+                try:
+                    # NaN/Infinity no son JSON válido: el diseño se informa como error
+                    linea = json.dumps(fila, ensure_ascii=False, allow_nan=False)
+                except ValueError:
+                    errores += 'error' not in fila
+                    linea = json.dumps({'id': fila.get('id'), 'error': "resultado no finito"}, ensure_ascii=False)
+                salida.write(linea + '\n')
+            salida.flush()
+    except BrokenPipeError:
+        # El consumidor cerró la tubería (p. ej. 'head'): terminar sin traza
+        sys.stderr.close()
+        return 0
+    return 1 if errores else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -4,28 +4,97 @@
 # --------------------------------------------
 
 import os
+import functools
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QSpinBox, QDoubleSpinBox, 
                            QComboBox, QPushButton, QFormLayout, QTabWidget, QTextEdit, 
-                           QScrollArea, QColorDialog, QGroupBox, QDialog, QLineEdit, QGridLayout)
+                           QScrollArea, QColorDialog, QGroupBox, QDialog, QLineEdit, QGridLayout,
+                           QCheckBox, QSlider, QTableWidget, QTableWidgetItem, QAbstractItemView)
 from PyQt5.QtGui import QFont, QPixmap, QIcon
-from PyQt5.QtCore import Qt
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
-from pyvistaqt import QtInteractor
+from PyQt5.QtCore import Qt, QTimer
 import numpy as np
-from matplotlib.image import imread
 import io
 import base64
+# matplotlib (lienzos Qt) y pyvistaqt (VTK) se importan al construir la
+# pestaña que los usa, no al arrancar la aplicación
+
+# Frecuencias donde se marcan las curvas de la gráfica de atenuación [Hz]
+FRECUENCIAS_MARCADORES = np.array([100, 250, 350, 500])
+
+# Curvas seleccionables en la comparación (etiqueta -> clave en ComparacionDisenos)
+CURVAS_COMPARACION = {'Atenuación total': 'TL_total', 'TL': 'TL', 'ΔL': 'delta_L'}
+
+# Columnas de la tabla comparativa: (encabezado, campo, formato)
+COLUMNAS_COMPARACION = (
+    ("Diseño", 'nombre', '{}'), ("Material", 'material', '{}'),
+    ("Q [m³/h]", 'Q_m3h', '{:.0f}'), ("V [m/s]", 'V', '{:.2f}'), ("H [m]", 'H', '{:.2f}'),
+    ("L [m]", 'L', '{:.2f}'), ("Ancho [m]", 'width', '{:.3f}'), ("Baffles", 'n_baffles', '{:.0f}'),
+    ("ΔP [Pa]", 'dp_total', '{:.1f}'), ("Atenuación máx. [dB]", 'TL_max', '{:.1f}'),
+    ("125 Hz [dB]", 'banda0', '{:.1f}'), ("250 Hz [dB]", 'banda1', '{:.1f}'), ("500 Hz [dB]", 'banda2', '{:.1f}'),
+)
+
+# --------------------------------------------
+# Curva TL de referencia que se muestra en la gráfica (por tramos)
+# --------------------------------------------
+def _tl_visible(freq):
+    """
+    Bajas frecuencias (≤ 250 Hz): 5-12 dB; medias (≤ 350 Hz): 12-18 dB;
+    altas: 18-25 dB. Evaluado por tramos sobre todo el arreglo
+    """
+    freq = np.asarray(freq, dtype=float)
+    bajas = 5 + 7 * np.clip((freq - 100) / 150, 0, None) ** 1.2
+    medias = 12 + 6 * np.clip((freq - 250) / 100, 0, None) ** 1.1
+    altas = 18 + 7 * np.clip((freq - 350) / 150, 0, None) ** 0.9
+    return np.select([freq <= 250, freq <= 350], [bajas, medias], altas)
+
+# --------------------------------------------
+# Ecuación LaTeX como imagen PNG embebida en HTML (no depende del diseño)
+# --------------------------------------------
+@functools.lru_cache(maxsize=None)
+def _latex_a_html(formula, fontsize=10):  # Tamaño reducido
+    import matplotlib.pyplot as plt
+    fig = plt.figure(figsize=(0.01, 0.01))
+    fig.text(0, 0, f"${formula}$", fontsize=fontsize)
+    
+    buffer = io.BytesIO()
+    plt.savefig(buffer, format='png', dpi=200, bbox_inches='tight', pad_inches=0.03, transparent=True)
+    buffer.seek(0)
+    img_str = base64.b64encode(buffer.read()).decode('utf-8')
+    plt.close(fig)
+    
+    return f'<img src="data:image/png;base64,{img_str}" style="vertical-align:middle; max-width:90%;">'
+
+# --------------------------------------------
+# Aplaza una actualización hasta que su pestaña esté a la vista
+# --------------------------------------------
+def _al_mostrar(pestana):
+    """
+    Decorador para los update_* de GUIInterface: si la pestaña (nombre del
+    atributo) no es la visible, se guarda solo la última llamada y se
+    ejecuta al mostrarla, creando antes sus widgets si hace falta
+    """
+    def decorador(metodo):
+        @functools.wraps(metodo)
+        def envoltura(self, *args, **kwargs):
+            self.cuando_visible(getattr(self, pestana), metodo, self, *args, **kwargs)
+        return envoltura
+    return decorador
 
 # --------------------------------------------
 # Clase de la interfaz gráfica principal
 # --------------------------------------------
 class GUIInterface(QWidget):
-    def __init__(self, simulate_callback, update_3d_callback, export_txt_callback, export_math_callback):
+    def __init__(self, simulate_callback, update_3d_callback, export_txt_callback, export_math_callback,
+                 sensitivity_callback=None, pareto_callback=None, pareto_select_callback=None,
+                 pareto_report_callback=None, export_mesh_callback=None, live_callback=None,
+                 pin_callback=None, unpin_callback=None, save_project_callback=None, open_project_callback=None,
+                 auralize_callback=None):
         super().__init__()
         # Guardar callbacks para usar más tarde
-        self._callbacks = [simulate_callback, update_3d_callback, export_txt_callback, export_math_callback]
+        self._callbacks = [simulate_callback, update_3d_callback, export_txt_callback, export_math_callback,
+                           sensitivity_callback, pareto_callback, pareto_select_callback,
+                           pareto_report_callback, export_mesh_callback, live_callback,
+                           pin_callback, unpin_callback, save_project_callback, open_project_callback,
+                           auralize_callback]
         
         # Layout principal horizontal
         main_layout = QHBoxLayout(self)
@@ -169,11 +238,23 @@ class GUIInterface(QWidget):
         self.input_material.setToolTip(material_tooltip)
         self.input_material.currentIndexChanged.connect(self.check_custom_material)
         
+        self.input_mc = QSpinBox()
+        self.input_mc.setRange(0, 10000000)
+        self.input_mc.setSingleStep(10000)
+        self.input_mc.setValue(0)
+        self.input_mc.setStyleSheet(input_style)
+        mc_label = QLabel("Muestras Monte Carlo:")
+        mc_label.setStyleSheet(label_style)
+        mc_tooltip = "Número de muestras para la banda de incertidumbre (0 = desactivado)"
+        mc_label.setToolTip(mc_tooltip)
+        self.input_mc.setToolTip(mc_tooltip)
+        
         form.addRow(q_label, self.input_Q)
         form.addRow(v_label, self.input_V)
         form.addRow(h_label, self.input_H)
         form.addRow(l_label, self.input_L)
         form.addRow(material_label, self.input_material)
+        form.addRow(mc_label, self.input_mc)
         
         # Selector de color con mejor estilo
         self.baffle_color = "#C0C0C0"  # Gris metálico por defecto
@@ -201,6 +282,25 @@ class GUIInterface(QWidget):
         
         left_panel_layout.addWidget(params_group)
         
+        # Sliders para explorar Q, V, H y L en vivo (solo recalculan las curvas)
+        live_group = QGroupBox("Ajuste en vivo")
+        live_group.setStyleSheet(group_style)
+        live_form = QFormLayout(live_group)
+        self._live_timer = QTimer(self)
+        self._live_timer.setSingleShot(True)
+        self._live_timer.setInterval(30)  # Agrupa los eventos del slider (debounce)
+        self._live_timer.timeout.connect(self._on_live_timeout)
+        self.sliders = {}
+        for nombre, spin, paso in (("Q", self.input_Q, 100), ("V", self.input_V, 0.1),
+                                   ("H", self.input_H, 0.01), ("L", self.input_L, 0.01)):
+            self.sliders[nombre] = self._crear_slider(spin, paso)
+            live_form.addRow(QLabel(nombre + ":"), self.sliders[nombre])
+        self.live_info = QLabel("Mueva un slider para ver la curva al instante.")
+        self.live_info.setWordWrap(True)
+        live_form.addRow(self.live_info)
+        
+        left_panel_layout.addWidget(live_group)
+        
         # Botón de simulación con mejor estilo
         button_group = QGroupBox("Acciones")
         button_group.setStyleSheet(group_style)
@@ -227,6 +327,25 @@ class GUIInterface(QWidget):
         self.btn_simulate.setIcon(QIcon.fromTheme("system-run"))
         button_layout.addWidget(self.btn_simulate)
         
+        # Botón para el reporte de sensibilidad
+        self.btn_sensitivity = QPushButton("Reporte de sensibilidad")
+        self.btn_sensitivity.setToolTip("Calcula ∂TL/∂parámetro por banda e índices de Sobol del diseño actual")
+        button_layout.addWidget(self.btn_sensitivity)
+        
+        # Botón para escuchar el efecto del silenciador sobre una grabación
+        self.btn_auralize = QPushButton("Auralizar WAV")
+        self.btn_auralize.setToolTip("Filtra una grabación de ruido de ventilador/ducto con la atenuación del diseño actual")
+        button_layout.addWidget(self.btn_auralize)
+        
+        # Botones para guardar y abrir proyectos (archivo binario)
+        project_layout = QHBoxLayout()
+        self.btn_save_project = QPushButton("Guardar proyecto")
+        self.btn_open_project = QPushButton("Abrir proyecto")
+        self.btn_open_project.setToolTip("Recupera entradas, resultados, comparación e imágenes sin recalcular")
+        project_layout.addWidget(self.btn_save_project)
+        project_layout.addWidget(self.btn_open_project)
+        button_layout.addLayout(project_layout)
+        
         left_panel_layout.addWidget(button_group)
         
         # Agregar espacio flexible al final
@@ -263,30 +382,138 @@ class GUIInterface(QWidget):
             }
         """)
         
-        # Pestaña para el modelo 3D
-        self.model_3d = QWidget()
-        model_layout = QVBoxLayout(self.model_3d)
+        # Las pestañas con VTK o lienzos de matplotlib se crean vacías; sus
+        # widgets se construyen la primera vez que se muestran
+        self._constructores = {}
+        self._pendientes = {}
+        self.model_3d = self._agregar_pestana("Modelo 3D", self._crear_pestana_3d,
+                                              "Ejecute una simulación para ver el modelo 3D.")
+        self.graph_tab = self._agregar_pestana("Atenuación", self._crear_pestana_grafica)
+        self.tech_tab = self._agregar_pestana("Planos Técnicos", self._crear_pestana_planos)
+        self.pareto_tab = self._agregar_pestana("Pareto", self._crear_pestana_pareto)
+        self.comparison_tab = self._agregar_pestana("Comparación", self._crear_pestana_comparacion)
+        self.tabs.currentChanged.connect(self._on_tab_changed)
+        
+        # Agregar tabs al panel derecho
+        right_layout.addWidget(self.tabs)
+        
+        # Añadir panel izquierdo y derecho al layout principal
+        main_layout.addWidget(left_panel, 30)  # 30% del ancho
+        main_layout.addWidget(right_panel, 70)  # 70% del ancho
+        
+        # Conectar botón de simulación con su callback
+        self.btn_simulate.clicked.connect(self._callbacks[0])
+        if self._callbacks[4] is not None:
+            self.btn_sensitivity.clicked.connect(self._callbacks[4])
+        else:
+            self.btn_sensitivity.setEnabled(False)
+        if self._callbacks[9] is None:
+            live_group.setEnabled(False)
+        if self._callbacks[10] is None or self._callbacks[11] is None:
+            self.comparison_tab.setEnabled(False)
+        for boton, callback in ((self.btn_save_project, self._callbacks[12]), (self.btn_open_project, self._callbacks[13]),
+                                (self.btn_auralize, self._callbacks[14])):
+            if callback is not None:
+                boton.clicked.connect(callback)
+            else:
+                boton.setEnabled(False)
+
+        # Añadir valores iniciales para el material personalizado
+        self.custom_material = {
+            'freqs': [125, 250, 500],
+            'alphas': [0.5, 0.7, 0.9],
+            'name': 'Material personalizado'
+        }
+
+    # --------------------------------------------
+    # Pestaña vacía cuyo contenido se crea al mostrarla por primera vez
+    # --------------------------------------------
+    def _agregar_pestana(self, titulo, constructor, aviso=None):
+        contenedor = QWidget()
+        layout = QVBoxLayout(contenedor)
+        etiqueta = None
+        if aviso is not None:
+            etiqueta = QLabel(aviso)
+            etiqueta.setAlignment(Qt.AlignCenter)
+            layout.addWidget(etiqueta)
+        self._constructores[contenedor] = (constructor, etiqueta)
+        self.tabs.addTab(contenedor, titulo)
+        return contenedor
+
+    def _asegurar_pestana(self, contenedor):
+        """Construye los widgets de la pestaña si aún no existen"""
+        if contenedor not in self._constructores:
+            return
+        constructor, etiqueta = self._constructores.pop(contenedor)
+        if etiqueta is not None:
+            contenedor.layout().removeWidget(etiqueta)
+            etiqueta.deleteLater()
+        constructor(contenedor.layout())
+
+    # --------------------------------------------
+    # Ejecuta ahora o al mostrar la pestaña (solo la última llamada por función)
+    # --------------------------------------------
+    def cuando_visible(self, contenedor, funcion, *args, **kwargs):
+        """Las actualizaciones de pestañas ocultas no dibujan nada hasta que se muestran"""
+        if self.tabs.currentWidget() is contenedor:
+            self._asegurar_pestana(contenedor)
+            funcion(*args, **kwargs)
+        else:
+            self._pendientes.setdefault(contenedor, {})[funcion] = (args, kwargs)
+
+    def _on_tab_changed(self, index):
+        contenedor = self.tabs.widget(index)
+        if contenedor is None:
+            return
+        self._asegurar_pestana(contenedor)
+        for funcion, (args, kwargs) in self._pendientes.pop(contenedor, {}).items():
+            funcion(*args, **kwargs)
+
+    # --------------------------------------------
+    # Pestaña del modelo 3D (visor VTK y exportación de la malla)
+    # --------------------------------------------
+    def _crear_pestana_3d(self, model_layout):
+        from pyvistaqt import QtInteractor
         
         # PyVista Qt interactor para visualización 3D
         self.plotter = QtInteractor(self.model_3d)
         model_layout.addWidget(self.plotter)
         
+        # Exportación de la malla compacta (GLB/STL/OBJ)
+        mesh_layout = QHBoxLayout()
+        self.input_mesh_format = QComboBox()
+        self.input_mesh_format.addItems(["GLB", "STL", "OBJ"])
+        self.input_mesh_format.setToolTip("GLB para navegadores, STL/OBJ para visores CAD")
+        self.input_mesh_low = QCheckBox("Vista previa ligera")
+        self.input_mesh_low.setToolTip("Carcasa como conducto abierto y cada baffle como un solo plano")
+        self.btn_export_mesh = QPushButton("Exportar modelo 3D")
+        mesh_layout.addWidget(self.input_mesh_format)
+        mesh_layout.addWidget(self.input_mesh_low)
+        mesh_layout.addWidget(self.btn_export_mesh)
+        model_layout.addLayout(mesh_layout)
+        if self._callbacks[8] is not None:
+            self.btn_export_mesh.clicked.connect(self._callbacks[8])
+        else:
+            self.btn_export_mesh.setEnabled(False)
+        
         # Añadir resumen de dimensiones 3D (primera pestaña perdida)
         self.summary_3d_box = QTextEdit()
         self.summary_3d_box.setReadOnly(True)
         self.summary_3d_box.setAcceptRichText(True)  # Asegurarse que acepta formato HTML
         model_layout.addWidget(self.summary_3d_box)
-        
-        self.tabs.addTab(self.model_3d, "Modelo 3D")
-        
-        # Pestaña para gráficas de TL
-        self.graph_tab = QWidget()
-        graph_layout = QVBoxLayout(self.graph_tab)
+
+    # --------------------------------------------
+    # Pestaña de la gráfica de atenuación y su resumen
+    # --------------------------------------------
+    def _crear_pestana_grafica(self, graph_layout):
+        from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+        from matplotlib.figure import Figure
         
         # Canvas matplotlib para gráficas
-        self.fig = plt.figure(figsize=(10, 6), dpi=100)
+        self.fig = Figure(figsize=(10, 6), dpi=100)
         self.canvas = FigureCanvas(self.fig)  # Este es el nombre correcto que debemos usar
         graph_layout.addWidget(self.canvas)
+        self._init_plot()
         
         # Añadir resumen de datos acústicos debajo del gráfico
         self.summary_box = QTextEdit()
@@ -317,35 +544,90 @@ class GUIInterface(QWidget):
             }
         """)
         graph_layout.addWidget(self.summary_box)
-        
-        self.tabs.addTab(self.graph_tab, "Atenuación")
-        
-        # Pestaña para planos técnicos (segunda pestaña perdida)
-        self.tech_tab = QWidget()
-        tech_layout = QVBoxLayout(self.tech_tab)
+
+    # --------------------------------------------
+    # Pestaña de planos técnicos
+    # --------------------------------------------
+    def _crear_pestana_planos(self, tech_layout):
+        from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+        from matplotlib.figure import Figure
         
         self.technical_fig = Figure(figsize=(10, 6), dpi=100)
         self.technical_canvas = FigureCanvas(self.technical_fig)
         tech_layout.addWidget(self.technical_canvas)
-        
-        self.tabs.addTab(self.tech_tab, "Planos Técnicos")
-        
-        # Agregar tabs al panel derecho
-        right_layout.addWidget(self.tabs)
-        
-        # Añadir panel izquierdo y derecho al layout principal
-        main_layout.addWidget(left_panel, 30)  # 30% del ancho
-        main_layout.addWidget(right_panel, 70)  # 70% del ancho
-        
-        # Conectar botón de simulación con su callback
-        self.btn_simulate.clicked.connect(self._callbacks[0])
 
-        # Añadir valores iniciales para el material personalizado
-        self.custom_material = {
-            'freqs': [125, 250, 500],
-            'alphas': [0.5, 0.7, 0.9],
-            'name': 'Material personalizado'
-        }
+    # --------------------------------------------
+    # Pestaña del explorador de frente de Pareto
+    # --------------------------------------------
+    def _crear_pestana_pareto(self, pareto_layout):
+        from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+        from matplotlib.figure import Figure
+        
+        self.btn_pareto = QPushButton("Calcular frente de Pareto")
+        self.btn_pareto.setToolTip("Barrido de velocidad, altura y longitud para el caudal y material actuales")
+        pareto_layout.addWidget(self.btn_pareto)
+        
+        self.btn_pareto_report = QPushButton("Exportar reporte del frente (PDF)")
+        self.btn_pareto_report.setToolTip("Un PDF con una sección por diseño del frente y una tabla comparativa")
+        pareto_layout.addWidget(self.btn_pareto_report)
+        
+        self.pareto_fig = Figure(figsize=(10, 6), dpi=100)
+        self.pareto_canvas = FigureCanvas(self.pareto_fig)
+        self.pareto_canvas.mpl_connect('pick_event', self._on_pareto_pick)
+        pareto_layout.addWidget(self.pareto_canvas)
+        
+        self.pareto_info = QLabel("Haga clic en un punto del frente para cargar ese diseño.")
+        pareto_layout.addWidget(self.pareto_info)
+        self._pareto_indices = None
+        
+        for boton, callback in ((self.btn_pareto, self._callbacks[5]), (self.btn_pareto_report, self._callbacks[7])):
+            if callback is not None:
+                boton.clicked.connect(callback)
+            else:
+                boton.setEnabled(False)
+
+    # --------------------------------------------
+    # Pestaña de comparación de diseños fijados
+    # --------------------------------------------
+    def _crear_pestana_comparacion(self, comparison_layout):
+        from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+        from matplotlib.figure import Figure
+        from matplotlib.collections import LineCollection
+        
+        comparison_buttons = QHBoxLayout()
+        self.btn_pin = QPushButton("Fijar diseño actual")
+        self.btn_pin.setToolTip("Agrega el último diseño simulado a la comparación")
+        self.btn_unpin = QPushButton("Quitar seleccionados")
+        self.btn_unpin_all = QPushButton("Limpiar")
+        self.input_comparison_curve = QComboBox()
+        self.input_comparison_curve.addItems(list(CURVAS_COMPARACION))
+        self.input_comparison_curve.currentIndexChanged.connect(self._on_comparison_curve)
+        for widget in (self.btn_pin, self.btn_unpin, self.btn_unpin_all, self.input_comparison_curve):
+            comparison_buttons.addWidget(widget)
+        comparison_layout.addLayout(comparison_buttons)
+        
+        # Todas las curvas en una sola LineCollection (un único artista)
+        self.comparison_fig = Figure(figsize=(10, 5), dpi=100)
+        self.comparison_canvas = FigureCanvas(self.comparison_fig)
+        self.comparison_ax = self.comparison_fig.add_subplot(111)
+        self.comparison_lines = LineCollection([], linewidths=1.2)
+        self.comparison_ax.add_collection(self.comparison_lines)
+        self.comparison_ax.set_xlabel("Frecuencia [Hz]")
+        self.comparison_ax.grid(True, alpha=0.3, linestyle='--')
+        comparison_layout.addWidget(self.comparison_canvas, 3)
+        
+        self.comparison_table = QTableWidget(0, len(COLUMNAS_COMPARACION))
+        self.comparison_table.setHorizontalHeaderLabels([c[0] for c in COLUMNAS_COMPARACION])
+        self.comparison_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.comparison_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.comparison_table.itemSelectionChanged.connect(self._on_comparison_select)
+        comparison_layout.addWidget(self.comparison_table, 2)
+        self._comparacion = None
+        
+        if self._callbacks[10] is not None and self._callbacks[11] is not None:
+            self.btn_pin.clicked.connect(self._callbacks[10])
+            self.btn_unpin.clicked.connect(self._on_comparison_unpin)
+            self.btn_unpin_all.clicked.connect(lambda: self._callbacks[11](list(range(self.comparison_table.rowCount()))))
 
     # --------------------------------------------
     # Selector de color para los baffles
@@ -371,66 +653,286 @@ class GUIInterface(QWidget):
     # --------------------------------------------
     # Actualiza la gráfica en la pestaña correspondiente
     # --------------------------------------------
-    def update_plot(self, freq, TL, delta_L, TL_total):
-        """Actualiza la gráfica en la pestaña correspondiente"""
-        self.fig.clear()
-        ax1 = self.fig.add_subplot(111)
-        ax2 = ax1.twinx()
-        
+    @_al_mostrar('graph_tab')
+    def update_plot(self, freq, TL, delta_L, TL_total, bandas=None):
+        """
+        Actualiza la gráfica en la pestaña correspondiente. Solo cambia los
+        datos de los artistas persistentes; si los ejes y la leyenda no
+        cambian se redibujan únicamente las curvas sobre el fondo guardado
+        (blitting), lo que permite seguir los sliders en tiempo real
+        """
         # SOLUCIÓN: Generar curvas no lineales que se parecen más al comportamiento acústico real
-        TL_visible = np.zeros_like(freq)
-        
-        # Generar valores que simulan el comportamiento acústico real
-        for i, f in enumerate(freq):
-            if f <= 250:
-                # Bajas frecuencias: incremento leve (5-12 dB)
-                TL_visible[i] = 5 + 7 * ((f - 100) / 150)**1.2
-            elif f <= 350:
-                # Medias frecuencias: incremento moderado (12-18 dB)
-                TL_visible[i] = 12 + 6 * ((f - 250) / 100)**1.1
-            else:
-                # Altas frecuencias: incremento más abrupto (18-25 dB)
-                TL_visible[i] = 18 + 7 * ((f - 350) / 150)**0.9
+        TL_visible = _tl_visible(freq)
         
         # Recalcular la atenuación total
         TL_total_visible = TL_visible + delta_L
         
-        # CAMBIO: Primero graficar líneas sin marcadores
-        ax1.plot(freq, TL_visible, label='TL(f)', color='tab:blue', linewidth=2.5)
-        ax1.plot(freq, TL_total_visible, label='Atenuación total', color='tab:green', linewidth=2)
-        ax2.plot(freq, delta_L, label='ΔL(f)', color='tab:red', linestyle='--')
-        
-        # Luego añadir solo los marcadores en las frecuencias de corte
-        # Encontrar los índices de las frecuencias clave
-        freq_keys = [100, 250, 350, 500]
-        for key_freq in freq_keys:
-            # Encontrar el índice más cercano a esta frecuencia
-            idx = np.argmin(np.abs(freq - key_freq))
-            
-            # Añadir marcadores solo en estos puntos específicos
-            ax1.plot(freq[idx], TL_visible[idx], 'o', color='tab:blue', 
-                     markersize=7, markerfacecolor='white', markeredgewidth=1.5)
-            ax1.plot(freq[idx], TL_total_visible[idx], 's', color='tab:green', 
-                     markersize=7, markerfacecolor='white', markeredgewidth=1.5)
-            ax2.plot(freq[idx], delta_L[idx], '^', color='tab:red', 
-                     markersize=6, markerfacecolor='white', markeredgewidth=1.5)
+        self.line_TL.set_data(freq, TL_visible)
+        self.line_total.set_data(freq, TL_total_visible)
+        self.line_delta_L.set_data(freq, delta_L)
+        
+        # Marcadores solo en las frecuencias de corte (índice más cercano a cada una)
+        idx = np.argmin(np.abs(freq[:, None] - FRECUENCIAS_MARCADORES[None, :]), axis=0)
+        self.markers_TL.set_data(freq[idx], TL_visible[idx])
+        self.markers_total.set_data(freq[idx], TL_total_visible[idx])
+        self.markers_delta_L.set_data(freq[idx], delta_L[idx])
+        
+        # Banda de confianza Monte Carlo: percentiles de TL_total (la magnitud
+        # que muestrea monte_carlo) junto a su valor nominal, en su propio eje
+        band_label = None
+        ylim_modelo = self.ax3.get_ylim()
+        if bandas is not None:
+            q_bajo, q_alto = min(bandas['percentiles']), max(bandas['percentiles'])
+            bajo, alto = bandas['percentiles'][q_bajo], bandas['percentiles'][q_alto]
+            self.band.set_data(freq, bajo, alto)
+            self.line_modelo.set_data(freq, TL_total)
+            band_label = f'Banda P{q_bajo}–P{q_alto}'
+            y_min, y_max = min(bajo.min(), TL_total.min()), max(alto.max(), TL_total.max())
+            margen_y = 0.05 * max(y_max - y_min, 1.0)
+            ylim_modelo = (y_min - margen_y, y_max + margen_y)
+        for artista in (self.ax3, self.band, self.line_modelo):
+            artista.set_visible(bandas is not None)
+        
+        # Cambios de rango de frecuencias, del eje del modelo o de leyenda
+        # requieren un redibujado completo
+        margen = 0.05 * (freq[-1] - freq[0])
+        xlim = (freq[0] - margen, freq[-1] + margen)
+        if xlim != self.ax1.get_xlim() or ylim_modelo != self.ax3.get_ylim() or band_label != self._band_label:
+            self.ax1.set_xlim(*xlim)
+            self.ax3.set_ylim(*ylim_modelo)
+            if band_label != self._band_label:
+                self._update_plot_legend(band_label)
+                self.fig.tight_layout()
+            self.canvas.draw_idle()
+        else:
+            self._blit_plot()
+
+    # --------------------------------------------
+    # Crea una sola vez los ejes y los artistas de la gráfica de atenuación
+    # --------------------------------------------
+    def _init_plot(self):
+        self.ax1 = self.fig.add_subplot(111)
+        self.ax2 = self.ax1.twinx()
+        
+        # Artistas animados: no se dibujan en el fondo, se pintan con blitting
+        self.line_TL, = self.ax1.plot([], [], label='TL(f)', color='tab:blue', linewidth=2.5, animated=True)
+        self.line_total, = self.ax1.plot([], [], label='Atenuación total', color='tab:green', linewidth=2, animated=True)
+        self.line_delta_L, = self.ax2.plot([], [], label='ΔL(f)', color='tab:red', linestyle='--', animated=True)
+        self.markers_TL, = self.ax1.plot([], [], 'o', color='tab:blue', markersize=7,
+                                         markerfacecolor='white', markeredgewidth=1.5, animated=True)
+        self.markers_total, = self.ax1.plot([], [], 's', color='tab:green', markersize=7,
+                                            markerfacecolor='white', markeredgewidth=1.5, animated=True)
+        self.markers_delta_L, = self.ax2.plot([], [], '^', color='tab:red', markersize=6,
+                                              markerfacecolor='white', markeredgewidth=1.5, animated=True)
+
+        # Eje propio para TL_total del modelo y su banda Monte Carlo (solo con incertidumbre)
+        self.ax3 = self.ax1.twinx()
+        self.ax3.spines['right'].set_position(('axes', 1.12))
+        self.line_modelo, = self.ax3.plot([], [], label='TL_total (modelo)', color='tab:purple',
+                                          linewidth=1.5, animated=True)
+        self.band = self.ax3.fill_between([0, 1], [0, 0], [0, 0], color='tab:purple', alpha=0.2, animated=True)
+        for artista in (self.ax3, self.band, self.line_modelo):
+            artista.set_visible(False)
+        self._plot_artists = (self.band, self.line_modelo, self.line_TL, self.line_total, self.markers_TL,
+                              self.markers_total, self.line_delta_L, self.markers_delta_L)
         
         # Etiquetas
-        ax1.set_xlabel("Frecuencia [Hz]")
-        ax1.set_ylabel("Atenuación [dB]", color='tab:blue')
-        ax2.set_ylabel("Atenuación adicional ΔL [dB]", color='tab:red')
+        self.ax1.set_xlabel("Frecuencia [Hz]")
+        self.ax1.set_ylabel("Atenuación [dB]", color='tab:blue')
+        self.ax2.set_ylabel("Atenuación adicional ΔL [dB]", color='tab:red')
+        self.ax3.set_ylabel("TL_total del modelo [dB]", color='tab:purple')
         
         # Establecer límites de ejes para valores realistas y visibles
-        ax1.set_ylim(0, 35)  # Ajustar para mostrar valores entre 0-35 dB
-        ax2.set_ylim(0, 10)  # Ajustar para delta_L
+        self.ax1.set_ylim(0, 35)  # Ajustar para mostrar valores entre 0-35 dB
+        self.ax2.set_ylim(0, 10)  # Ajustar para delta_L
         
         # Estilo
-        ax1.tick_params(axis='y', labelcolor='tab:blue')
-        ax2.tick_params(axis='y', labelcolor='tab:red')
-        ax1.grid(True, alpha=0.3, linestyle='--')
-        self.fig.legend(loc='upper right')
+        self.ax1.tick_params(axis='y', labelcolor='tab:blue')
+        self.ax2.tick_params(axis='y', labelcolor='tab:red')
+        self.ax3.tick_params(axis='y', labelcolor='tab:purple')
+        self.ax1.grid(True, alpha=0.3, linestyle='--')
+        
+        self.plot_legend = None
+        self._band_label = None
+        self._update_plot_legend(None)
         self.fig.tight_layout()
-        self.canvas.draw()
+        
+        # El fondo se vuelve a capturar en cada redibujado completo (p. ej. al redimensionar)
+        self._plot_background = None
+        self.canvas.mpl_connect('draw_event', self._on_plot_draw)
+
+    # --------------------------------------------
+    # Rehace la leyenda (solo cuando aparece o desaparece la banda)
+    # --------------------------------------------
+    def _update_plot_legend(self, band_label):
+        if self.plot_legend is not None:
+            self.plot_legend.remove()
+        handles = [self.line_TL, self.line_total, self.line_delta_L]
+        if band_label is not None:
+            self.band.set_label(band_label)
+            handles += [self.line_modelo, self.band]
+        self.plot_legend = self.fig.legend(handles=handles, loc='upper right')
+        self._band_label = band_label
+
+    # --------------------------------------------
+    # Guarda el fondo tras un redibujado completo y pinta las curvas encima
+    # --------------------------------------------
+    def _on_plot_draw(self, event):
+        self._plot_background = self.canvas.copy_from_bbox(self.fig.bbox)
+        for artist in self._plot_artists:
+            self.fig.draw_artist(artist)
+
+    # --------------------------------------------
+    # Redibuja solo las curvas sobre el fondo guardado
+    # --------------------------------------------
+    def _blit_plot(self):
+        if self._plot_background is None:
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self._plot_background)
+        for artist in self._plot_artists:
+            self.fig.draw_artist(artist)
+        self.canvas.blit(self.fig.bbox)
+
+    # --------------------------------------------
+    # Slider entero asociado a un spinbox (valor = posición · paso)
+    # --------------------------------------------
+    def _crear_slider(self, spin, paso):
+        slider = QSlider(Qt.Horizontal)
+        slider.setRange(int(round(spin.minimum() / paso)), int(round(spin.maximum() / paso)))
+        slider.setValue(int(round(spin.value() / paso)))
+
+        def slider_a_spin(posicion):
+            spin.blockSignals(True)
+            spin.setValue(posicion * paso)
+            spin.blockSignals(False)
+            self._live_timer.start()
+
+        def spin_a_slider(valor):
+            slider.blockSignals(True)
+            slider.setValue(int(round(valor / paso)))
+            slider.blockSignals(False)
+
+        slider.valueChanged.connect(slider_a_spin)
+        spin.valueChanged.connect(spin_a_slider)
+        return slider
+
+    # --------------------------------------------
+    # Recalcula en vivo cuando el slider deja de emitir eventos
+    # --------------------------------------------
+    def _on_live_timeout(self):
+        if self._callbacks[9] is not None:
+            self._callbacks[9]()
+
+    # --------------------------------------------
+    # Superpone los diseños fijados y completa la tabla comparativa
+    # --------------------------------------------
+    @_al_mostrar('comparison_tab')
+    def update_comparison(self, comparacion):
+        """
+        comparacion es una simulation.comparison.ComparacionDisenos. La gráfica
+        se actualiza con set_segments sobre una sola LineCollection; en la
+        tabla solo se agregan las filas nuevas (se rehace si se quitaron diseños)
+        """
+        from matplotlib import colormaps
+        
+        self._comparacion = comparacion
+        n = len(comparacion)
+        curva = CURVAS_COMPARACION[self.input_comparison_curve.currentText()]
+        
+        self.comparison_lines.set_segments(comparacion.segmentos(curva))
+        self.comparison_lines.set_color(colormaps['viridis'](np.linspace(0, 1, max(n, 2)))[:n])
+        self.comparison_lines.set_linewidths(1.2)
+        self.comparison_ax.set_ylabel(f"{self.input_comparison_curve.currentText()} [dB]")
+        self.comparison_ax.set_xlim(comparacion.freq[0], comparacion.freq[-1])
+        Y = comparacion.curva(curva)
+        if n and np.isfinite(Y).any():
+            y_min, y_max = np.nanmin(Y), np.nanmax(Y)
+            margen = 0.05 * max(y_max - y_min, 1.0)
+            self.comparison_ax.set_ylim(y_min - margen, y_max + margen)
+        self.comparison_canvas.draw_idle()
+        
+        tabla = self.comparison_table
+        if n < tabla.rowCount():
+            tabla.setRowCount(0)
+        for i in range(tabla.rowCount(), n):
+            tabla.insertRow(i)
+            for j, (_, campo, formato) in enumerate(COLUMNAS_COMPARACION):
+                if campo == 'nombre':
+                    texto = comparacion.nombres[i]
+                elif campo == 'material':
+                    texto = comparacion.materiales[i]
+                elif campo.startswith('banda'):
+                    texto = formato.format(comparacion.bandas[i, int(campo[5:])])
+                else:
+                    texto = formato.format(comparacion.escalar(campo)[i])
+                tabla.setItem(i, j, QTableWidgetItem(texto))
+
+    # --------------------------------------------
+    # Resalta en la gráfica los diseños seleccionados en la tabla
+    # --------------------------------------------
+    def _on_comparison_select(self):
+        if self._comparacion is None:
+            return
+        seleccion = [indice.row() for indice in self.comparison_table.selectionModel().selectedRows()]
+        anchos = np.full(len(self._comparacion), 1.2)
+        anchos[seleccion] = 3.0
+        self.comparison_lines.set_linewidths(anchos)
+        self.comparison_canvas.draw_idle()
+
+    def _on_comparison_unpin(self):
+        seleccion = sorted(indice.row() for indice in self.comparison_table.selectionModel().selectedRows())
+        if seleccion:
+            self._callbacks[11](seleccion)
+
+    def _on_comparison_curve(self):
+        if self._comparacion is not None:
+            self.update_comparison(self._comparacion)
+
+    # --------------------------------------------
+    # Muestra el barrido y su frente de Pareto en la pestaña correspondiente
+    # --------------------------------------------
+    @_al_mostrar('pareto_tab')
+    def update_pareto(self, barrido, indices_frente, max_puntos_fondo=20000):
+        """Dibuja ancho vs. atenuación máxima; el color del frente indica la caída de presión"""
+        self.pareto_fig.clear()
+        ax = self.pareto_fig.add_subplot(111)
+        
+        # Diseños dominados como fondo (submuestreados para mantener la fluidez)
+        n = len(barrido['width'])
+        fondo = np.arange(n) if n <= max_puntos_fondo else np.linspace(0, n - 1, max_puntos_fondo).astype(int)
+        ax.scatter(barrido['width'][fondo], barrido['TL_max'][fondo], s=4, color='lightgray', label='Diseños evaluados')
+        
+        # Frente de Pareto seleccionable
+        puntos = ax.scatter(barrido['width'][indices_frente], barrido['TL_max'][indices_frente],
+                            c=barrido['dp'][indices_frente], s=12 + 12 * barrido['L'][indices_frente],
+                            cmap='viridis', edgecolors='black', linewidths=0.5, picker=5, label='Frente de Pareto')
+        self.pareto_fig.colorbar(puntos, ax=ax, label='Caída de presión [Pa]')
+        
+        ax.set_xlabel("Ancho total [m]")
+        ax.set_ylabel("Atenuación máxima [dB]")
+        ax.set_title(f"{len(indices_frente)} diseños no dominados de {n} (tamaño del punto ∝ L)")
+        ax.grid(True, alpha=0.3, linestyle='--')
+        ax.legend(loc='lower right')
+        self.pareto_fig.tight_layout()
+        self.pareto_canvas.draw()
+        
+        self._pareto_barrido = barrido
+        self._pareto_indices = indices_frente
+
+    # --------------------------------------------
+    # Carga el diseño del frente sobre el que se hizo clic
+    # --------------------------------------------
+    def _on_pareto_pick(self, event):
+        if self._pareto_indices is None or self._callbacks[6] is None or not len(event.ind):
+            return
+        indice = int(self._pareto_indices[event.ind[0]])
+        b = self._pareto_barrido
+        self.pareto_info.setText(
+            f"Diseño cargado: V = {b['V'][indice]:.2f} m/s, H = {b['H'][indice]:.2f} m, L = {b['L'][indice]:.2f} m, "
+            f"ancho = {b['width'][indice]:.3f} m, ΔP ≈ {b['dp'][indice]:.1f} Pa"
+        )
+        self._callbacks[6](indice)
 
     # --------------------------------------------
     # Actualiza el resumen textual de parámetros/resultados
@@ -438,6 +940,7 @@ class GUIInterface(QWidget):
 # --------------------------------------------
 # Actualiza el resumen textual de parámetros/resultados
 # --------------------------------------------
+    @_al_mostrar('graph_tab')
     def update_summary(self, summary_text):
         """Actualiza el resumen textual de parámetros/resultados"""
         # Eliminar espacios al principio para detectar HTML correctamente
@@ -450,6 +953,7 @@ class GUIInterface(QWidget):
     # --------------------------------------------
     # Actualiza el resumen de dimensiones 3D
     # --------------------------------------------
+    @_al_mostrar('model_3d')
     def update_3d_summary(self, summary_text):
         """Actualiza el resumen de dimensiones 3D"""
         # Eliminar espacios al principio para detectar HTML correctamente
@@ -462,13 +966,18 @@ class GUIInterface(QWidget):
     # --------------------------------------------
     # Actualiza los planos técnicos
     # --------------------------------------------
+    @_al_mostrar('tech_tab')
     def update_technical_drawings(self, technical_path):
-        """Muestra los planos técnicos en la pestaña correspondiente"""
+        """Muestra los planos técnicos (ruta o bytes PNG en memoria) en la pestaña correspondiente"""
+        from matplotlib.image import imread
+        
         fig = self.technical_canvas.figure
         fig.clear()
         
-        if os.path.exists(technical_path):
-            img = imread(technical_path)
+        if isinstance(technical_path, (bytes, bytearray)):
+            technical_path = io.BytesIO(technical_path)
+        if not isinstance(technical_path, str) or os.path.exists(technical_path):
+            img = imread(technical_path, format='png')
             ax = fig.add_subplot(111)
             ax.imshow(img)
             ax.axis('off')
@@ -481,84 +990,75 @@ class GUIInterface(QWidget):
     # --------------------------------------------
     def update_math_fundamentals(self, params):
         """Muestra los fundamentos matemáticos con ecuaciones LaTeX"""
-        if not hasattr(self, 'math_text'):
-            # Si no existe la pestaña de matemáticas, la creamos
-            self.math_widget = QWidget()
-            math_layout = QVBoxLayout(self.math_widget)
-            
-            # Crear un scroll area para contener todo el contenido matemático
-            math_scroll = QScrollArea()
-            math_scroll.setWidgetResizable(True)
-            math_content = QWidget()
-            math_content_layout = QVBoxLayout(math_content)
-            
-            # Título principal
-            title_label = QLabel("FUNDAMENTOS MATEMÁTICOS Y METODOLOGÍA DE CÁLCULO")
-            title_font = QFont("Arial", 14, QFont.Bold)
-            title_label.setFont(title_font)
-            title_label.setAlignment(Qt.AlignCenter)
-            math_content_layout.addWidget(title_label)
-            
-            # Contenedor para el texto matemático con formato
-            self.math_text = QTextEdit()
-            self.math_text.setReadOnly(True)
-            math_font = QFont("Cambria", 11)
-            self.math_text.setFont(math_font)
-            math_content_layout.addWidget(self.math_text)
-            
-            # Botón para exportar matemática como PDF
-            self.btn_export_math = QPushButton("Exportar fundamentos matemáticos (PDF)")
-            math_content_layout.addWidget(self.btn_export_math)
-            
-            # Configurar el scroll area
-            math_scroll.setWidget(math_content)
-            math_layout.addWidget(math_scroll)
-            
-            # Importante: añadir la pestaña al TabWidget
-            self.tabs.addTab(self.math_widget, "Fundamentos Matemáticos")
-            
-            # Conectar el botón de exportar PDF
-            self.btn_export_math.clicked.connect(self._callbacks[3])
-        
-        # Importar librerías necesarias para generar imágenes LaTeX
-        import matplotlib.pyplot as plt
+        if not hasattr(self, 'math_widget'):
+            # La pestaña aparece con la primera simulación y se llena al mostrarla
+            self.math_widget = self._agregar_pestana("Fundamentos Matemáticos", self._crear_pestana_fundamentos)
+        self._mostrar_fundamentos(params)
+
+    # --------------------------------------------
+    # Pestaña de fundamentos matemáticos
+    # --------------------------------------------
+    def _crear_pestana_fundamentos(self, math_layout):
+        # Crear un scroll area para contener todo el contenido matemático
+        math_scroll = QScrollArea()
+        math_scroll.setWidgetResizable(True)
+        math_content = QWidget()
+        math_content_layout = QVBoxLayout(math_content)
+        
+        # Título principal
+        title_label = QLabel("FUNDAMENTOS MATEMÁTICOS Y METODOLOGÍA DE CÁLCULO")
+        title_font = QFont("Arial", 14, QFont.Bold)
+        title_label.setFont(title_font)
+        title_label.setAlignment(Qt.AlignCenter)
+        math_content_layout.addWidget(title_label)
+        
+        # Contenedor para el texto matemático con formato
+        self.math_text = QTextEdit()
+        self.math_text.setReadOnly(True)
+        math_font = QFont("Cambria", 11)
+        self.math_text.setFont(math_font)
+        math_content_layout.addWidget(self.math_text)
+        
+        # Botón para exportar matemática como PDF
+        self.btn_export_math = QPushButton("Exportar fundamentos matemáticos (PDF)")
+        math_content_layout.addWidget(self.btn_export_math)
+        
+        # Configurar el scroll area
+        math_scroll.setWidget(math_content)
+        math_layout.addWidget(math_scroll)
+        
+        # Conectar el botón de exportar PDF
+        self.btn_export_math.clicked.connect(self._callbacks[3])
+
+    # --------------------------------------------
+    # Rellena los fundamentos con los valores del diseño
+    # --------------------------------------------
+    @_al_mostrar('math_widget')
+    def _mostrar_fundamentos(self, params):
         from matplotlib import rcParams
-        import io
-        import base64
         
         # Configurar matplotlib para LaTeX bonito
         rcParams['mathtext.fontset'] = 'cm'
         rcParams['font.family'] = 'serif'
         
-        # Función para convertir ecuaciones LaTeX a imágenes base64 embebidas en HTML
-        def latex_to_html(formula, fontsize=10):  # Tamaño reducido
-            fig = plt.figure(figsize=(0.01, 0.01))
-            fig.text(0, 0, f"${formula}$", fontsize=fontsize)
-            
-            buffer = io.BytesIO()
-            plt.savefig(buffer, format='png', dpi=200, bbox_inches='tight', pad_inches=0.03, transparent=True)
-            buffer.seek(0)
-            img_str = base64.b64encode(buffer.read()).decode('utf-8')
-            plt.close(fig)
-            
-            return f'<img src="data:image/png;base64,{img_str}" style="vertical-align:middle; max-width:90%;">'
+        # Las imágenes de las ecuaciones se generan una sola vez (_latex_a_html en caché)
         
         # Preparar las fórmulas LaTeX (sin f-strings que contengan backslashes)
-        velocidad_sonido = latex_to_html("c = 343 \\ \\text{m/s}")
-        conversion_caudal = latex_to_html("Q \\ [\\text{m}^3/\\text{s}] = \\frac{Q \\ [\\text{m}^3/\\text{h}]}{3600}")
-        area_paso = latex_to_html("S = \\frac{Q}{V}")
+        velocidad_sonido = _latex_a_html("c = 343 \\ \\text{m/s}")
+        conversion_caudal = _latex_a_html("Q \\ [\\text{m}^3/\\text{s}] = \\frac{Q \\ [\\text{m}^3/\\text{h}]}{3600}")
+        area_paso = _latex_a_html("S = \\frac{Q}{V}")
         
-        separacion_baffles = latex_to_html("h = \\frac{\\lambda_{max}}{8} = \\frac{c}{8 \\cdot f_{max}} = \\frac{c}{16 \\cdot f_{max}}")
-        numero_espacios = latex_to_html("n_{espacios} = \\lceil \\frac{S}{H \\cdot 2h} \\rceil")
-        numero_baffles = latex_to_html("n_{baffles} = n_{espacios} - 1")
+        separacion_baffles = _latex_a_html("h = \\frac{\\lambda_{max}}{8} = \\frac{c}{8 \\cdot f_{max}} = \\frac{c}{16 \\cdot f_{max}}")
+        numero_espacios = _latex_a_html("n_{espacios} = \\lceil \\frac{S}{H \\cdot 2h} \\rceil")
+        numero_baffles = _latex_a_html("n_{baffles} = n_{espacios} - 1")
         
-        ancho_interior = latex_to_html("interior\\_width = n_{baffles} \\cdot t_{baffle} + n_{espacios} \\cdot 2h")
-        ancho_total = latex_to_html("width = interior\\_width + 2 \\cdot t_{pared}")
+        ancho_interior = _latex_a_html("interior\\_width = n_{baffles} \\cdot t_{baffle} + n_{espacios} \\cdot 2h")
+        ancho_total = _latex_a_html("width = interior\\_width + 2 \\cdot t_{pared}")
         
-        numero_onda = latex_to_html("k = \\frac{\\omega}{c} - j\\alpha")
-        transmision_loss = latex_to_html("TL = 10 \\cdot \\log_{10}\\left(e^{2\\alpha L}\\right)")
-        atenuacion_adicional = latex_to_html("\\Delta L = 1.05 \\cdot \\alpha^{1.4} \\cdot \\frac{a}{h}")
-        atenuacion_total = latex_to_html("\\text{Atenuación total} = TL + \\Delta L")
+        numero_onda = _latex_a_html("k = \\frac{\\omega}{c} - j\\alpha")
+        transmision_loss = _latex_a_html("TL = 10 \\cdot \\log_{10}\\left(e^{2\\alpha L}\\right)")
+        atenuacion_adicional = _latex_a_html("\\Delta L = 1.05 \\cdot \\alpha^{1.4} \\cdot \\frac{a}{h}")
+        atenuacion_total = _latex_a_html("\\text{Atenuación total} = TL + \\Delta L")
         
         # El resto del código HTML para las fórmulas
         html_content = f"""
@@ -770,13 +1270,6 @@ class GUIInterface(QWidget):
         
         # Actualizar el contenido HTML
         self.math_text.setHtml(html_content)
-        
-        # Conectar el botón de exportar si aún no está conectado
-        try:
-            self.btn_export_math.clicked.disconnect()
-        except:
-            pass
-        self.btn_export_math.clicked.connect(self._callbacks[3])  # El callback exportar_math_pdf
 
     # --------------------------------------------
     # Verifica si se seleccionó el material personalizado
@@ -5,29 +5,41 @@
 
 import sys
 import os
+import time
 from datetime import datetime
+
+# Referencia para medir el arranque en frío (--medir-arranque)
+_INICIO = time.perf_counter()
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 
 import numpy as np
-from PyQt5.QtWidgets import QApplication, QMainWindow, QMessageBox
+from PyQt5.QtWidgets import QApplication, QMainWindow, QMessageBox, QFileDialog
+from PyQt5.QtCore import QTimer
 from gui_interface import GUIInterface
 from app.simulation.solver import calcular_parametros, calcular_parametros_custom
 from app.simulation.models import SplitterSilencer
-from app.plotting.plots import plot_attenuation_curves
-from app.plotting.graphics import generate_3d_model
-from app.plotting.docs import export_pdf
-from app.plotting.technical_drawings import generate_technical_drawings
+from app.simulation.resultados import ResultadoDiseno
+from app.simulation.uncertainty import monte_carlo
+from app.simulation.sensitivity import exportar_reporte_sensibilidad
+from app.simulation.pareto import barrido_disenos, frente_barrido
+from app.simulation.comparison import ComparacionDisenos
+from app.simulation.auralization import auralizar
+from app.plotting.mesh_export import exportar_modelo
+from app.project import guardar_proyecto, abrir_proyecto, EXTENSION, CLAVES_RENDER
+from app.cache import CacheArtefactos, grafica_cache, modelo_cache, planos_cache, reporte_cache
+from app.simulation.geometria import geometria
 
 OUTPUT_DIR = "outputs"
-PLOTS_DIR = os.path.join(OUTPUT_DIR, "plots")
 MODELS_DIR = os.path.join(OUTPUT_DIR, "models")
 PDF_DIR = os.path.join(OUTPUT_DIR, "pdf")
-TEMP_DIR = os.path.join(OUTPUT_DIR, "temp")
-os.makedirs(PLOTS_DIR, exist_ok=True)
 os.makedirs(MODELS_DIR, exist_ok=True)
 os.makedirs(PDF_DIR, exist_ok=True)
-os.makedirs(TEMP_DIR, exist_ok=True)
+CACHE_DIR = os.path.join(OUTPUT_DIR, "cache")
+
+# Tiempo máximo hasta que la ventana queda pintada [s]. pyvista/VTK, fpdf2 y
+# matplotlib se importan al usarse por primera vez, no al arrancar
+OBJETIVO_ARRANQUE_S = 1.0
 
 # --------------------------------------------
 # Clase principal de la aplicación GUI
@@ -41,10 +53,26 @@ class MainApp(QMainWindow):
             self.simular, 
             self.actualizar_modelo_3d, 
             self.exportar_txt,
-            self.exportar_math_pdf
+            self.exportar_math_pdf,
+            self.exportar_sensibilidad,
+            self.calcular_pareto,
+            self.cargar_diseno_pareto,
+            self.exportar_reporte_pareto,
+            self.exportar_modelo_3d,
+            self.actualizar_en_vivo,
+            self.fijar_diseno,
+            self.quitar_disenos,
+            self.guardar_proyecto,
+            self.abrir_proyecto,
+            self.auralizar_wav
         )
         self.setCentralWidget(self.interface)
         self.data = {}
+        self.barrido = None
+        self.indices_frente = None
+        self.comparacion = ComparacionDisenos()
+        self.proyecto = None  # Proyecto abierto (imágenes en caché que se leen bajo demanda)
+        self.cache = CacheArtefactos(CACHE_DIR)  # Artefactos por huella de sus entradas
         self.show_dims = True
 
     # --------------------------------------------
@@ -82,26 +110,46 @@ class MainApp(QMainWindow):
         delta_L = splitter.delta_L(params["freq"])
         TL_total = TL + delta_L
 
+        # Análisis de incertidumbre opcional
+        n_muestras = self.interface.input_mc.value()
+        incertidumbre = monte_carlo(params, n_muestras) if n_muestras > 0 else None
+
         # Guarda los datos para exportar/modelar
-        self.data = {
-            **params,
-            "TL": TL, "delta_L": delta_L, "TL_total": TL_total,
-            "img_path": os.path.join(MODELS_DIR, "modelo_3d.png"),
-            "graph_path": os.path.join(PLOTS_DIR, "TL_vs_freq.png"),
-            "pdf_path": os.path.join(PDF_DIR, "reporte_silenciador.pdf"),
-        }
+        self.data = ResultadoDiseno(
+            params,
+            TL=TL, delta_L=delta_L, TL_total=TL_total,
+            incertidumbre=incertidumbre,
+            # pdf_path y las imágenes del reporte quedan en None (se generan una sola vez)
+        )
 
-        # Generar planos técnicos
-        technical_drawings_path = generate_technical_drawings(
-            params["L"], params["width"], params["H"], params["n_baffles"], 
-            params["h"] + 0.02, 0.02, 0.005, MODELS_DIR
+        # Planos técnicos (solo se dibujan si la geometría no está en caché)
+        self.data["technical_drawings_png"] = planos_cache(
+            self.cache, params["L"], params["width"], params["H"], params["n_baffles"],
+            params["baffle_thickness"], params["wall_thickness"]
         )
-        
-        # Agregar a los datos
-        self.data["technical_drawings_path"] = technical_drawings_path
+
+        # Las imágenes guardadas en un proyecto abierto ya no corresponden
+        if self.proyecto is not None:
+            self.proyecto.cerrar()
+            self.proyecto = None
+        self._mostrar_resultados()
+
+    # --------------------------------------------
+    # Actualiza gráficas, resúmenes, 3D y planos a partir de self.data
+    # --------------------------------------------
+    def _mostrar_resultados(self):
+        """No recalcula nada: también se usa al abrir un proyecto guardado"""
+        Q_m3h = self.interface.input_Q.value()
+        V = self.interface.input_V.value()
+        H = self.interface.input_H.value()
+        L = self.interface.input_L.value()
+        material = self.interface.input_material.currentText()
+        params = self.data
+        TL, delta_L, TL_total = self.data["TL"], self.data["delta_L"], self.data["TL_total"]
+        incertidumbre = self.data["incertidumbre"]
 
         # Actualiza la gráfica en la GUI
-        self.interface.update_plot(params["freq"], TL, delta_L, TL_total)
+        self.interface.update_plot(params["freq"], TL, delta_L, TL_total, incertidumbre)
 
         # Actualiza el resumen textual
         resumen = (
@@ -114,7 +162,9 @@ class MainApp(QMainWindow):
             f"Separación entre baffles (2h): {2*params['h']:.4f} m\n"
             f"Número de rendijas: {params['n_espacios']}\n"
             f"Total de baffles: {params['n_baffles']}\n"
-            f"Ancho total estimado: {params['width']:.4f} m"
+            f"Ancho total estimado: {params['width']:.4f} m\n"
+            f"Velocidad en rendijas: {params['v_paso']:.2f} m/s\n"
+            f"Caída de presión: {params['dp_total']:.1f} Pa"
         )
         self.interface.update_summary(resumen)
 
@@ -153,6 +203,18 @@ class MainApp(QMainWindow):
             </table>
         </div>
 
+        <h2>💨 FLUJO Y CAÍDA DE PRESIÓN</h2>
+        <div class="section">
+            <table>
+                <tr><td class="label">Velocidad frontal:</td><td class="value">{params['v_frontal']:.2f} m/s</td></tr>
+                <tr><td class="label">Velocidad en rendijas:</td><td class="value">{params['v_paso']:.2f} m/s</td></tr>
+                <tr><td class="label">Pérdida de entrada:</td><td class="value">{params['dp_entrada']:.1f} Pa</td></tr>
+                <tr><td class="label">Pérdida por fricción:</td><td class="value">{params['dp_friccion']:.1f} Pa</td></tr>
+                <tr><td class="label">Pérdida de salida:</td><td class="value">{params['dp_salida']:.1f} Pa</td></tr>
+                <tr><td class="label">Caída de presión total:</td><td class="value highlight">{params['dp_total']:.1f} Pa</td></tr>
+            </table>
+        </div>
+
         <h2>🔊 ATENUACIÓN ACÚSTICA</h2>
         <div class="section">
             <table>
@@ -165,21 +227,22 @@ class MainApp(QMainWindow):
         # Actualizar el resumen de atenuación con HTML
         self.interface.update_summary(html_summary)
 
-        # Parámetros para el modelo 3D
-        baffle_thickness = 0.02
-        gap = params['h'] + 0.02
+        # Parámetros para el modelo 3D (la misma geometría del modelo y los planos)
+        geo = self._geometria_actual()
+        baffle_thickness = params['baffle_thickness']
         n_baffles = params['n_baffles']
         n_espacios = params['n_espacios']
-        rendija_ancho = params['h']
+        rendija_ancho = geo.ancho_rendija
+        paso = rendija_ancho + baffle_thickness
         summary_3d = (
             f"Dimensiones del silenciador:\n"
             f"- Largo total (L): {params['L']:.2f} m\n"
             f"- Altura total (a): {params['H']:.2f} m\n"
             f"- Ancho total (b): {params['width']:.2f} m\n"
             f"- Número de baffles: {n_baffles}\n"
-            f"- Espesor de cada baffle: {baffle_thickness:.2f} m\n"
-            f"- Separación entre baffles (gap): {gap:.2f} m\n"
-            f"- Ancho de cada rendija: {rendija_ancho:.2f} m\n"
+            f"- Espesor de cada baffle: {baffle_thickness:.3f} m\n"
+            f"- Separación entre baffles (entre ejes): {paso:.3f} m\n"
+            f"- Ancho de cada rendija: {rendija_ancho:.3f} m\n"
             f"- Número de rendijas: {n_espacios}\n"
         )
         self.interface.update_3d_summary(summary_3d)
@@ -188,14 +251,14 @@ class MainApp(QMainWindow):
         self.actualizar_modelo_3d('update')
         
         # Actualizar las gráficas
-        self.interface.update_plot(params["freq"], TL, delta_L, TL_total)
+        self.interface.update_plot(params["freq"], TL, delta_L, TL_total, incertidumbre)
         
         # Actualizar el resumen de atenuación
         self.interface.update_summary(resumen)
         
         # Actualizar los planos técnicos
-        if "technical_drawings_path" in self.data:
-            self.interface.update_technical_drawings(self.data["technical_drawings_path"])
+        if "technical_drawings_png" in self.data:
+            self.interface.update_technical_drawings(self.data["technical_drawings_png"])
         
         # ASEGURARSE de llamar a la actualización de fundamentos matemáticos
         # con todos los parámetros correctos
@@ -204,6 +267,121 @@ class MainApp(QMainWindow):
         # Mostrar la pestaña de modelo 3D como predeterminada al terminar
         self.interface.tabs.setCurrentIndex(0)  # Mostrar la pestaña del modelo 3D
 
+    # --------------------------------------------
+    # Recalcula solo la curva de atenuación mientras se mueven los sliders
+    # --------------------------------------------
+    def actualizar_en_vivo(self):
+        """Vista previa rápida: sin Monte Carlo, planos ni modelo 3D (se actualizan con Simular)"""
+        Q_m3h = self.interface.input_Q.value()
+        V = self.interface.input_V.value()
+        H = self.interface.input_H.value()
+        L = self.interface.input_L.value()
+        material = self.interface.input_material.currentText()
+
+        if "personal" in material:
+            custom_freqs = self.interface.custom_material['freqs']
+            custom_alphas = self.interface.custom_material['alphas']
+            params = calcular_parametros_custom(Q_m3h, V, H, L, min(custom_freqs), max(custom_freqs),
+                                                custom_freqs, custom_alphas)
+        else:
+            params = calcular_parametros(Q_m3h, V, H, L, 100, 500, material)
+        splitter = SplitterSilencer(params["L"], params["width"], params["n_baffles"], params["alpha_interp"])
+        TL = splitter.transmission_loss(params["freq"])
+        delta_L = splitter.delta_L(params["freq"])
+
+        self.interface.update_plot(params["freq"], TL, delta_L, TL + delta_L)
+        self.interface.live_info.setText(
+            f"Ancho {params['width']:.3f} m · {params['n_baffles']} baffles · "
+            f"v rendija {params['v_paso']:.2f} m/s · ΔP {params['dp_total']:.1f} Pa"
+        )
+
+    # --------------------------------------------
+    # Agrega el diseño simulado actual a la comparación
+    # --------------------------------------------
+    def fijar_diseno(self):
+        """Solo se guarda el diseño nuevo; los ya fijados no se recalculan"""
+        if not self.data:
+            QMessageBox.warning(self, "Advertencia", "Primero realiza una simulación.")
+            return
+        self.comparacion.fijar(self.data)
+        self.interface.update_comparison(self.comparacion)
+
+    def quitar_disenos(self, indices):
+        """Quita de la comparación los diseños de las filas indicadas"""
+        self.comparacion.quitar(indices)
+        self.interface.update_comparison(self.comparacion)
+
+    # --------------------------------------------
+    # Guarda entradas, resultados, comparación e imágenes en un archivo de proyecto
+    # --------------------------------------------
+    def guardar_proyecto(self):
+        ruta, _ = QFileDialog.getSaveFileName(self, "Guardar proyecto", os.path.join(OUTPUT_DIR, "proyecto" + EXTENSION),
+                                              f"Proyecto A-SiSS (*{EXTENSION})")
+        if not ruta:
+            return
+
+        # Trae a memoria las imágenes del proyecto abierto que aún no se leyeron,
+        # por si se sobrescribe el mismo archivo
+        if self.proyecto is not None:
+            for clave in CLAVES_RENDER:
+                if self.data.get(clave) is None:
+                    self.data[clave] = self.proyecto.render(clave)
+            self.proyecto.cerrar()
+            self.proyecto = None
+
+        entradas = {
+            'Q_m3h': self.interface.input_Q.value(),
+            'V': self.interface.input_V.value(),
+            'H': self.interface.input_H.value(),
+            'L': self.interface.input_L.value(),
+            'material': self.interface.input_material.currentText(),
+            'muestras_mc': self.interface.input_mc.value(),
+            'custom_material': self.interface.custom_material,
+            'baffle_color': self.interface.baffle_color,
+        }
+        guardar_proyecto(ruta, entradas, self.data, self.comparacion)
+        QMessageBox.information(self, "Éxito", f"Proyecto guardado en:\n{ruta}")
+
+    # --------------------------------------------
+    # Abre un proyecto y muestra sus resultados sin recalcular
+    # --------------------------------------------
+    def abrir_proyecto(self):
+        ruta, _ = QFileDialog.getOpenFileName(self, "Abrir proyecto", OUTPUT_DIR, f"Proyecto A-SiSS (*{EXTENSION})")
+        if not ruta:
+            return
+        if self.proyecto is not None:
+            self.proyecto.cerrar()
+        self.proyecto = abrir_proyecto(ruta)
+
+        entradas = self.proyecto.entradas
+        self.interface.custom_material = entradas['custom_material']
+        self.interface.baffle_color = entradas['baffle_color']
+        self.interface.input_Q.setValue(entradas['Q_m3h'])
+        self.interface.input_V.setValue(entradas['V'])
+        self.interface.input_H.setValue(entradas['H'])
+        self.interface.input_L.setValue(entradas['L'])
+        self.interface.input_mc.setValue(entradas['muestras_mc'])
+        # Sin señales: elegir el material personalizado abriría su diálogo
+        self.interface.input_material.blockSignals(True)
+        if self.interface.input_material.findText(entradas['material']) < 0:
+            # Material personalizado renombrado: es la última opción del combo
+            self.interface.input_material.setItemText(self.interface.input_material.count() - 1, entradas['material'])
+        self.interface.input_material.setCurrentText(entradas['material'])
+        self.interface.input_material.blockSignals(False)
+
+        self.comparacion = self.proyecto.comparacion()
+        self.interface.update_comparison(self.comparacion)
+
+        self.data = self.proyecto.datos()
+        if self.data:
+            self.data["technical_drawings_png"] = self.proyecto.render("technical_drawings_png")
+            if self.data["technical_drawings_png"] is None:
+                self.data["technical_drawings_png"] = planos_cache(
+                    self.cache, self.data["L"], self.data["width"], self.data["H"], self.data["n_baffles"],
+                    self.data["baffle_thickness"], self.data["wall_thickness"]
+                )
+            self._mostrar_resultados()
+
     # --------------------------------------------
     # Actualiza el modelo 3D interactivo según controles
     # --------------------------------------------
@@ -212,6 +390,16 @@ class MainApp(QMainWindow):
         if not self.data:
             return
         
+        # El visor VTK se crea y se redibuja solo con su pestaña a la vista
+        self.interface.cuando_visible(self.interface.model_3d, self._dibujar_modelo_3d)
+        
+        # Actualizar resumen de dimensiones
+        self.update_3d_summary()
+
+    def _dibujar_modelo_3d(self):
+        """Regenera la escena del visor con el diseño actual"""
+        from app.plotting.graphics import generate_3d_model
+        
         # Limpiar visualizador existente
         plotter = self.interface.plotter  # Usar plotter en lugar de viewer
         plotter.clear()
@@ -221,12 +409,11 @@ class MainApp(QMainWindow):
         width = self.data['width']
         H = self.data['H']
         n_baffles = self.data['n_baffles']
-        h = self.data['h']
         baffle_color = self.interface.baffle_color
         
         # Generar modelo 3D
         generate_3d_model(
-            L, width, H, n_baffles, h,
+            L, width, H, n_baffles, self.data['baffle_thickness'], self.data['wall_thickness'],
             plotter=plotter,  # Usar plotter en lugar de viewer
             baffle_color=baffle_color
         )
@@ -234,9 +421,23 @@ class MainApp(QMainWindow):
         # Actualizar la vista
         plotter.reset_camera()
         plotter.update()
-        
-        # Actualizar resumen de dimensiones
-        self.update_3d_summary()
+
+    # --------------------------------------------
+    # Exporta la malla del modelo 3D en el formato elegido
+    # --------------------------------------------
+    def exportar_modelo_3d(self):
+        """Exporta el modelo a GLB, STL u OBJ directamente desde los arreglos de la malla"""
+        if not self.data:
+            QMessageBox.warning(self, "Advertencia", "Primero realiza una simulación.")
+            return
+
+        extension = self.interface.input_mesh_format.currentText().lower()
+        detalle = 'bajo' if self.interface.input_mesh_low.isChecked() else 'completo'
+        mesh_path = os.path.join(MODELS_DIR, f"modelo_3d.{extension}")
+        exportar_modelo(mesh_path, self.data['L'], self.data['width'], self.data['H'], self.data['n_baffles'],
+                        detalle, baffle_color=self.interface.baffle_color,
+                        wall_thickness=self.data['wall_thickness'], baffle_thickness=self.data['baffle_thickness'])
+        QMessageBox.information(self, "Éxito", f"Modelo 3D exportado en:\n{mesh_path}")
 
     # --------------------------------------------
     # Exporta el reporte PDF (puedes agregar un botón para esto)
@@ -245,17 +446,24 @@ class MainApp(QMainWindow):
         if not self.data:
             QMessageBox.warning(self, "Advertencia", "Primero realiza una simulación.")
             return
-        plot_attenuation_curves(
-            self.data["freq"], self.data["TL"], self.data["delta_L"], self.data["TL_total"], self.data["graph_path"]
-        )
-        generate_3d_model(
-            self.data["L"], self.data["width"], self.data["H"], self.data["n_baffles"],
-            gap=self.data["h"] + 0.02, show_dims=True, img_path=self.data["img_path"]
-        )
-        export_pdf(
-            self.data["S"], self.data["h"], self.data["n_espacios"], self.data["n_baffles"], self.data["width"],
-            self.data["img_path"], self.data["graph_path"], self.data["pdf_path"]
-        )
+        # Gráfica y captura 3D en memoria, reutilizadas entre exportaciones
+        for clave in ("graph_png", "model_image"):
+            if self.data[clave] is None and self.proyecto is not None:
+                self.data[clave] = self.proyecto.render(clave)
+        # Gráfica, captura 3D y PDF pasan por la caché: si el diseño no cambió
+        # se reutilizan los archivos ya generados
+        if self.data["graph_png"] is None:
+            self.data["graph_png"] = grafica_cache(
+                self.cache, self.data["freq"], self.data["TL"], self.data["delta_L"], self.data["TL_total"],
+                bandas=self.data["incertidumbre"]
+            )
+        if self.data["model_image"] is None:
+            modelo = modelo_cache(self.cache, self.data["L"], self.data["width"], self.data["H"],
+                                  self.data["n_baffles"], self.data["baffle_thickness"], self.data["wall_thickness"],
+                                  baffle_color=self.interface.baffle_color)
+            with open(modelo["modelo_3d.png"], 'rb') as f:
+                self.data["model_image"] = f.read()
+        self.data["pdf_path"] = reporte_cache(self.cache, self.data)
         QMessageBox.information(self, "Éxito", f"PDF exportado en:\n{self.data['pdf_path']}")
 
     def exportar_txt(self):
@@ -286,226 +494,150 @@ class MainApp(QMainWindow):
             f.write(f"- Largo total (L1): {self.data['L']:.3f} m\n")
             f.write(f"- Ancho total (L2): {self.data['width']:.3f} m\n")
             f.write(f"- Altura (H): {self.data['H']:.3f} m\n")
-            f.write(f"- Espesor de cada baffle: {0.02:.3f} m\n")
-            f.write(f"- Separación entre baffles: {self.data['h'] + 0.02:.3f} m\n\n")
+            geo = self._geometria_actual()
+            f.write(f"- Espesor de cada baffle: {self.data['baffle_thickness']:.3f} m\n")
+            f.write(f"- Separación entre baffles (entre ejes): {geo.ancho_rendija + self.data['baffle_thickness']:.3f} m\n\n")
+            f.write("FLUJO Y CAÍDA DE PRESIÓN:\n")
+            f.write(f"- Velocidad frontal: {self.data['v_frontal']:.2f} m/s\n")
+            f.write(f"- Velocidad en rendijas: {self.data['v_paso']:.2f} m/s\n")
+            f.write(f"- Pérdida de entrada: {self.data['dp_entrada']:.1f} Pa\n")
+            f.write(f"- Pérdida por fricción: {self.data['dp_friccion']:.1f} Pa\n")
+            f.write(f"- Pérdida de salida: {self.data['dp_salida']:.1f} Pa\n")
+            f.write(f"- Caída de presión total: {self.data['dp_total']:.1f} Pa\n\n")
             f.write("ATENUACIÓN ACÚSTICA:\n")
             f.write(f"- Rango de frecuencias: {min(self.data['freq']):.0f} - {max(self.data['freq']):.0f} Hz\n")
             f.write(f"- Atenuación máxima: {max(self.data['TL_total']):.2f} dB\n")
             
         QMessageBox.information(self, "Éxito", f"Parámetros exportados en:\n{txt_path}")
 
+    def exportar_sensibilidad(self):
+        """Exporta el reporte de sensibilidad del diseño actual a un archivo de texto"""
+        if not self.data:
+            QMessageBox.warning(self, "Advertencia", "Primero realiza una simulación.")
+            return
+
+        txt_path = os.path.join(OUTPUT_DIR, "sensibilidad_silenciador.txt")
+        exportar_reporte_sensibilidad(self.data, txt_path)
+        QMessageBox.information(self, "Éxito", f"Reporte de sensibilidad exportado en:\n{txt_path}")
+
+    # --------------------------------------------
+    # Filtra una grabación WAV con la atenuación del diseño actual
+    # --------------------------------------------
+    def auralizar_wav(self):
+        if not self.data:
+            QMessageBox.warning(self, "Advertencia", "Primero realiza una simulación.")
+            return
+        entrada, _ = QFileDialog.getOpenFileName(self, "Grabación de ruido", OUTPUT_DIR, "Audio WAV (*.wav)")
+        if not entrada:
+            return
+        base = os.path.splitext(os.path.basename(entrada))[0]
+        salida, _ = QFileDialog.getSaveFileName(self, "Audio con silenciador",
+                                                os.path.join(OUTPUT_DIR, f"{base}_silenciador.wav"), "Audio WAV (*.wav)")
+        if not salida:
+            return
+        try:
+            info = auralizar(entrada, salida, self.data["freq"], self.data["TL_total"])
+        except ValueError as e:
+            QMessageBox.warning(self, "Advertencia", str(e))
+            return
+        QMessageBox.information(self, "Éxito", f"Audio auralizado ({info['duracion']:.1f} s, {info['canales']} canales) en:\n{salida}")
+
+    # --------------------------------------------
+    # Barrido de diseños y frente de Pareto para el caudal y material actuales
+    # --------------------------------------------
+    def calcular_pareto(self):
+        """Evalúa una malla de V, H y L y muestra el frente de Pareto"""
+        Q_m3h = self.interface.input_Q.value()
+        material = self.interface.input_material.currentText()
+
+        # Valores redondeados a la precisión de los controles de entrada
+        V_vals = np.round(np.linspace(4, 16, 25), 2)
+        H_vals = np.round(np.linspace(0.2, 1.5, 27), 2)
+        L_vals = np.round(np.linspace(0.5, 3.0, 26), 2)
+
+        if "personal" in material:
+            custom_freqs = self.interface.custom_material['freqs']
+            custom_alphas = self.interface.custom_material['alphas']
+            fmin, fmax = min(custom_freqs), max(custom_freqs)
+            alpha_interp = np.interp(np.linspace(fmin, fmax, 300), custom_freqs, custom_alphas)
+            self.barrido = barrido_disenos(Q_m3h, V_vals, H_vals, L_vals, fmin, fmax, alpha_interp=alpha_interp)
+        else:
+            self.barrido = barrido_disenos(Q_m3h, V_vals, H_vals, L_vals, material=material)
+
+        self.indices_frente = frente_barrido(self.barrido)
+        self.interface.update_pareto(self.barrido, self.indices_frente)
+
+    # --------------------------------------------
+    # Carga un diseño del frente en las entradas y lo simula
+    # --------------------------------------------
+    def cargar_diseno_pareto(self, indice):
+        """Carga el diseño seleccionado en las pestañas de gráfica, 3D y planos"""
+        if self.barrido is None:
+            return
+        self.interface.input_V.setValue(float(self.barrido['V'][indice]))
+        self.interface.input_H.setValue(float(self.barrido['H'][indice]))
+        self.interface.input_L.setValue(float(self.barrido['L'][indice]))
+        self.simular()
+        self.interface.tabs.setCurrentWidget(self.interface.graph_tab)
+
     def exportar_math_pdf(self):
         """Exporta los fundamentos matemáticos a un archivo PDF con ecuaciones LaTeX"""
         if not self.data:
             QMessageBox.warning(self, "Advertencia", "Primero realiza una simulación.")
             return
+
+        pdf_path = reporte_cache(self.cache, self.data, secciones=('fundamentos',), nombre="fundamentos_matematicos.pdf")
+        QMessageBox.information(self, "Éxito", f"Fundamentos matemáticos exportados en:\n{pdf_path}")
+
+    # --------------------------------------------
+    # Reporte comparativo de los diseños del frente de Pareto
+    # --------------------------------------------
+    def exportar_reporte_pareto(self):
+        """Exporta un único PDF con una sección por diseño del frente y la tabla comparativa"""
+        from app.plotting.report import reporte_comparativo
         
-        # Verificar si las bibliotecas necesarias están instaladas
-        try:
-            import reportlab
-            import matplotlib
-            from PIL import Image
-        except ImportError:
-            QMessageBox.warning(
-                self, 
-                "Error - Bibliotecas faltantes", 
-                "Para generar el PDF con fundamentos matemáticos, necesitas instalar:\n\n"
-                "pip install reportlab matplotlib pillow\n\n"
-                "Ejecuta este comando en tu terminal y vuelve a intentarlo."
-            )
+        if self.barrido is None:
+            QMessageBox.warning(self, "Advertencia", "Primero calcula el frente de Pareto.")
             return
-            
-        try:
-            # Usar ReportLab para un PDF avanzado con ecuaciones
-            from reportlab.lib.pagesizes import A4
-            from reportlab.lib import colors
-            from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image
-            from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-            from reportlab.lib.units import inch
-            
-            # Generar imágenes de ecuaciones con matplotlib
-            import matplotlib.pyplot as plt
-            from matplotlib import rcParams
-            import io
-            from PIL import Image as PILImage
-            
-            # Configurar matplotlib para LaTeX bonito
-            rcParams['mathtext.fontset'] = 'cm'
-            rcParams['font.family'] = 'serif'
-            
-            pdf_path = os.path.join(PDF_DIR, "fundamentos_matematicos.pdf")
-            
-            # Crear documento y estilos
-            doc = SimpleDocTemplate(pdf_path, pagesize=A4)
-            styles = getSampleStyleSheet()
-            
-            # Crear estilos personalizados
-            title_style = ParagraphStyle(
-                'TitleStyle', 
-                parent=styles['Heading1'],
-                fontSize=16,
-                alignment=1,  # Centrado
-                spaceAfter=20
-            )
-            
-            heading1_style = ParagraphStyle(
-                'Heading1Style',
-                parent=styles['Heading1'],
-                fontSize=14,
-                spaceAfter=10
-            )
-            
-            heading2_style = ParagraphStyle(
-                'Heading2Style',
-                parent=styles['Heading2'],
-                fontSize=12,
-                textColor=colors.blue,
-                spaceAfter=5
-            )
-            
-            normal_style = ParagraphStyle(
-                'NormalStyle',
-                parent=styles['Normal'],
-                fontSize=10,
-                spaceAfter=8
-            )
-            
-            formula_style = ParagraphStyle(
-                'FormulaStyle',
-                parent=styles['Normal'],
-                alignment=1,  # Centrado
-                spaceAfter=10
-            )
-            
-            # Función para generar imagen de fórmula LaTeX
-            def latex_to_image(formula, filename, fontsize=14):
-                fig = plt.figure(figsize=(8, 1))
-                fig.text(0.5, 0.5, f"${formula}$", fontsize=fontsize, ha='center', va='center')
-                
-                buffer = io.BytesIO()
-                plt.savefig(buffer, format='png', dpi=150, bbox_inches='tight', transparent=True)
-                buffer.seek(0)
-                
-                img_path = os.path.join(TEMP_DIR, filename)
-                if not os.path.exists(TEMP_DIR):
-                    os.makedirs(TEMP_DIR)
-                    
-                img = PILImage.open(buffer)
-                img.save(img_path)
-                plt.close(fig)
-                
-                return img_path
-            
-            # Crear contenido
-            story = []
-            
-            # Título principal
-            story.append(Paragraph("FUNDAMENTOS MATEMÁTICOS Y METODOLOGÍA DE CÁLCULO", title_style))
-            story.append(Spacer(1, 0.2*inch))
-            
-            # 1. Parámetros Fundamentales
-            story.append(Paragraph("1. Parámetros Fundamentales del Diseño", heading1_style))
-            
-            # 1.1 Velocidad del sonido
-            story.append(Paragraph("1.1 Velocidad del sonido en el aire", heading2_style))
-            formula_img = latex_to_image("c = 343 \\ \\text{m/s}", "formula_c.png")
-            story.append(Image(formula_img, width=3*inch, height=0.7*inch))
-            story.append(Paragraph("La velocidad del sonido en aire a temperatura ambiente (20°C) y presión atmosférica estándar.", normal_style))
-            
-            # 1.2 Conversión de caudal
-            story.append(Paragraph("1.2 Conversión de caudal", heading2_style))
-            formula_img = latex_to_image("Q \\ [\\text{m}^3/\\text{s}] = \\frac{Q \\ [\\text{m}^3/\\text{h}]}{3600}", "formula_q.png")
-            story.append(Image(formula_img, width=4*inch, height=inch))
-            story.append(Paragraph(f"Valor actual: Q = {self.data['Q']:.4f} m³/s (equivalente a {self.data['Q']*3600:.1f} m³/h)", normal_style))
-            
-            # 1.3 Área de paso
-            story.append(Paragraph("1.3 Área de paso requerida", heading2_style))
-            formula_img = latex_to_image("S = \\frac{Q}{V}", "formula_s.png")
-            story.append(Image(formula_img, width=2*inch, height=0.7*inch))
-            story.append(Paragraph(f"Valor calculado: S = {self.data['S']:.4f} m²", normal_style))
-            
-            # 2. Dimensionamiento de Baffles
-            story.append(Paragraph("2. Dimensionamiento de Baffles", heading1_style))
-            
-            # 2.1 Separación entre baffles
-            story.append(Paragraph("2.1 Separación entre baffles", heading2_style))
-            formula_img = latex_to_image("h = \\frac{\\lambda_{max}}{8} = \\frac{c}{8·f_{max}}", "formula_h.png")
-            story.append(Image(formula_img, width=3*inch, height=0.7*inch))
-            story.append(Paragraph(f"Valor calculado: h = {self.data['h']:.4f} m", normal_style))
-            story.append(Paragraph(f"Separación total (2h): 2h = {2*self.data['h']:.4f} m", normal_style))
-            story.append(Paragraph("Donde λ es la longitud de onda máxima en el silenciador.", normal_style))
-            
-            # 2.2 Número de espacios/rendijas necesarios
-            story.append(Paragraph("2.2 Número de espacios/rendijas necesarios", heading2_style))
-            formula_img = latex_to_image("n_espacios = \\lceil \\frac{S}{H · 2h} \\rceil", "formula_n_espacios.png")
-            story.append(Image(formula_img, width=3*inch, height=0.7*inch))
-            story.append(Paragraph(f"Valor calculado: n_espacios = {self.data['n_espacios']}", normal_style))
-            story.append(Paragraph("Donde ceil() es la función techo que redondea al entero superior.", normal_style))
-            
-            # 2.3 Número de baffles
-            story.append(Paragraph("2.3 Número de baffles", heading2_style))
-            formula_img = latex_to_image("n_baffles = n_espacios - 1", "formula_n_baffles.png")
-            story.append(Image(formula_img, width=3*inch, height=0.7*inch))
-            story.append(Paragraph(f"Valor calculado: n_baffles = {self.data['n_baffles']}", normal_style))
-            
-            # 3. Dimensiones del Silenciador
-            story.append(Paragraph("3. Dimensiones del Silenciador", heading1_style))
-            
-            # 3.1 Ancho interior necesario
-            story.append(Paragraph("3.1 Ancho interior necesario", heading2_style))
-            formula_img = latex_to_image("interior_width = n_baffles · t_baffle + n_espacios · 2h", "formula_interior_width.png")
-            story.append(Image(formula_img, width=4*inch, height=0.7*inch))
-            story.append(Paragraph(f"Valor calculado: interior_width = {self.data['interior_width']:.4f} m", normal_style))
-            
-            # 3.2 Ancho total del silenciador
-            story.append(Paragraph("3.2 Ancho total del silenciador", heading2_style))
-            formula_img = latex_to_image("width = interior_width + 2 · t_pared", "formula_width.png")
-            story.append(Image(formula_img, width=3*inch, height=0.7*inch))
-            story.append(Paragraph(f"Valor calculado: width = {self.data['width']:.4f} m", normal_style))
-            
-            # 4. Cálculos de Atenuación Acústica
-            story.append(Paragraph("4. Cálculos de Atenuación Acústica", heading1_style))
-            
-            # 4.1 Pérdida por Transmisión (TL)
-            story.append(Paragraph("4.1 Pérdida por Transmisión (TL)", heading2_style))
-            formula_img = latex_to_image("TL = 10·log(e^(2·α·L))", "formula_tl.png")
-            story.append(Image(formula_img, width=3*inch, height=0.7*inch))
-            story.append(Paragraph("Donde α es el coeficiente de absorción del material.", normal_style))
-            
-            # 4.2 Atenuación adicional por efectos de borde
-            story.append(Paragraph("4.2 Atenuación adicional por efectos de borde", heading2_style))
-            formula_img = latex_to_image("ΔL = 1.05·(α^1.4)·(a/h)", "formula_delta_L.png")
-            story.append(Image(formula_img, width=3*inch, height=0.7*inch))
-            story.append(Paragraph("Donde a es la altura del silenciador.", normal_style))
-            
-            # 4.3 Atenuación total
-            story.append(Paragraph("4.3 Atenuación total", heading2_style))
-            formula_img = latex_to_image("Atenuación total = TL + ΔL", "formula_atenuacion_total.png")
-            story.append(Image(formula_img, width=3*inch, height=0.7*inch))
-            story.append(Paragraph(f"Atenuación máxima calculada: {max(self.data['TL_total']):.2f} dB", normal_style))
-            
-            # 5. Referencias Bibliográficas
-            story.append(Paragraph("5. Referencias Bibliográficas", heading1_style))
-            
-            story.append(Paragraph("• Bies, D.A. y Hansen, C.H. (2009). Engineering Noise Control: Theory and Practice.", normal_style))
-            story.append(Paragraph("• Ingard, U. (2009). Noise Reduction Analysis.", normal_style))
-            story.append(Paragraph("• Munjal, M.L. (2014). Acoustics of Ducts and Mufflers.", normal_style))
-            story.append(Paragraph("• Ver, I.L. y Beranek, L.L. (2005). Noise and Vibration Control Engineering.", normal_style))
-            
-            # Construir documento PDF
-            doc.build(story)
-            QMessageBox.information(self, "Éxito", f"Fundamentos matemáticos exportados en:\n{pdf_path}")
-        
-        except ImportError:
-            QMessageBox.warning(self, "Error", "Necesitas instalar las librerías reportlab, matplotlib y Pillow:\npip install reportlab matplotlib Pillow")
+
+        pdf_path = os.path.join(PDF_DIR, "comparacion_frente_pareto.pdf")
+        reporte_comparativo(self._disenos_frente(), pdf_path, "Comparación de diseños del frente de Pareto")
+        QMessageBox.information(self, "Éxito", f"Reporte comparativo exportado en:\n{pdf_path}")
+
+    def _disenos_frente(self):
+        """Generador perezoso: simula cada diseño del frente solo cuando el reporte lo necesita"""
+        b = self.barrido
+        material = self.interface.input_material.currentText()
+        for indice in self.indices_frente:
+            if "personal" in material:
+                custom = self.interface.custom_material
+                params = calcular_parametros_custom(b['Q_m3h'][indice], b['V'][indice], b['H'][indice], b['L'][indice],
+                                                    min(custom['freqs']), max(custom['freqs']),
+                                                    custom['freqs'], custom['alphas'])
+            else:
+                params = calcular_parametros(b['Q_m3h'][indice], b['V'][indice], b['H'][indice], b['L'][indice],
+                                             material=material)
+            splitter = SplitterSilencer(params['L'], params['width'], params['n_baffles'], params['alpha_interp'])
+            TL = splitter.transmission_loss(params['freq'])
+            delta_L = splitter.delta_L(params['freq'])
+            yield {**params, 'TL': TL, 'delta_L': delta_L, 'TL_total': TL + delta_L,
+                   'nombre': f"V={b['V'][indice]:.2f} H={b['H'][indice]:.2f} L={b['L'][indice]:.2f}"}
+
+    # --------------------------------------------
+    # Geometría del diseño actual (la misma del modelo 3D y los planos)
+    # --------------------------------------------
+    def _geometria_actual(self):
+        return geometria(self.data['L'], self.data['width'], self.data['H'], self.data['n_baffles'],
+                         self.data['baffle_thickness'], self.data['wall_thickness'])
 
     def update_3d_summary(self):
         """Actualiza el resumen de dimensiones 3D"""
         if not self.data:
             return
             
-        baffle_thickness = 0.02  # m
-        wall_thickness = 0.02  # m
+        geo = self._geometria_actual()
+        baffle_thickness = self.data['baffle_thickness']  # m
+        wall_thickness = self.data['wall_thickness']  # m
         
         # Generar contenido HTML con mejor formato y estilos
         html_content = f"""
@@ -534,7 +666,7 @@ class MainApp(QMainWindow):
             <table>
                 <tr><td class="label">Número de baffles:</td><td class="value">{self.data['n_baffles']}</td></tr>
                 <tr><td class="label">Espesor de cada baffle:</td><td class="value">{baffle_thickness:.2f} m</td></tr>
-                <tr><td class="label">Separación entre baffles:</td><td class="value">{self.data['h']*2:.3f} m</td></tr>
+                <tr><td class="label">Separación entre baffles:</td><td class="value">{geo.ancho_rendija:.3f} m</td></tr>
                 <tr><td class="label">Material absorbente:</td><td class="value">{self.data['material']}</td></tr>
             </table>
         </div>
@@ -543,14 +675,14 @@ class MainApp(QMainWindow):
         <div class="section">
             <table>
                 <tr><td class="label">Número de rendijas:</td><td class="value">{self.data['n_espacios']}</td></tr>
-                <tr><td class="label">Ancho de cada rendija:</td><td class="value">{self.data['h']*2:.3f} m</td></tr>
+                <tr><td class="label">Ancho de cada rendija:</td><td class="value">{geo.ancho_rendija:.3f} m</td></tr>
             </table>
         </div>
         
         <h2>⚙️ CARACTERÍSTICAS CONSTRUCTIVAS</h2>
         <div class="section">
             <table>
-                <tr><td class="label">Espesor de las paredes:</td><td class="value">{wall_thickness:.2f} m</td></tr>
+                <tr><td class="label">Espesor de las paredes:</td><td class="value">{wall_thickness:.3f} m</td></tr>
                 <tr><td class="label">Área de paso:</td><td class="value class="highlight">{self.data['S']:.3f} m²</td></tr>
             </table>
         </div>
@@ -559,8 +691,22 @@ class MainApp(QMainWindow):
         # Actualizar el cuadro de resumen en la interfaz
         self.interface.update_3d_summary(html_content)
 
+# --------------------------------------------
+# Informa el tiempo de arranque en frío y cierra la aplicación
+# --------------------------------------------
+def _medir_arranque(app):
+    """Tiempo desde la carga de este módulo hasta la ventana pintada"""
+    app.processEvents()  # Primer pintado de la ventana
+    transcurrido = time.perf_counter() - _INICIO
+    pesados = [m for m in ("pyvista", "pyvistaqt", "matplotlib.pyplot", "fpdf") if m in sys.modules]
+    print(f"Ventana visible en {transcurrido:.3f} s (objetivo {OBJETIVO_ARRANQUE_S:g} s); "
+          f"módulos pesados cargados: {', '.join(pesados) or 'ninguno'}")
+    app.exit(0 if transcurrido <= OBJETIVO_ARRANQUE_S else 1)
+
 if __name__ == '__main__':
     app = QApplication(sys.argv)
     window = MainApp()
     window.show()
+    if "--medir-arranque" in sys.argv:
+        QTimer.singleShot(0, lambda: _medir_arranque(app))
     sys.exit(app.exec_())
@@ -3,26 +3,23 @@
 # Generación de reporte PDF automático
 # --------------------------------------------
 
-from fpdf import FPDF
+from app.plotting.report import reporte_diseno
 
 # --------------------------------------------
 # Exporta un reporte PDF con los resultados y gráficos
 # --------------------------------------------
-def export_pdf(S, h, n_espacios, n_baffles, width, img_path, graph_path, pdf_path):
-    pdf = FPDF()
-    pdf.add_page()
-    pdf.set_font("Arial", size=12)
-    pdf.cell(0, 10, "Reporte de Simulación - Silenciador tipo Splitter", ln=True)
-
-    pdf.ln(5)
-    pdf.cell(0, 10, f"Área requerida: {S:.4f} m²", ln=True)
-    pdf.cell(0, 10, f"Separación entre baffles (2h): {2*h:.4f} m", ln=True)
-    pdf.cell(0, 10, f"Número de rendijas: {n_espacios}", ln=True)
-    pdf.cell(0, 10, f"Total de baffles: {n_baffles}", ln=True)
-    pdf.cell(0, 10, f"Ancho total estimado: {width:.4f} m", ln=True)
-
-    pdf.ln(5)
-    pdf.image(graph_path, w=180)
-    pdf.ln(5)
-    pdf.image(img_path, w=120)
-    pdf.output(pdf_path)
+def export_pdf(S, h, n_espacios, n_baffles, width, img_path, graph_path, pdf_path, incertidumbre=None, presion=None, drawings=None):
+    """
+    img_path, graph_path y drawings pueden ser rutas o imágenes en memoria
+    (ver report._imagen_pdf); pdf_path puede ser una ruta o un objeto tipo archivo.
+    Se conserva por compatibilidad; el reporte lo arma report.reporte_diseno
+    """
+    data = {
+        **(presion or {}),
+        'S': S, 'h': h, 'n_espacios': n_espacios, 'n_baffles': n_baffles, 'width': width,
+        'incertidumbre': incertidumbre,
+        'graph_png': graph_path,
+        'model_image': img_path,
+        'technical_drawings_png': drawings,
+    }
+    return reporte_diseno(data, pdf_path)
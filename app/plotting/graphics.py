@@ -5,95 +5,52 @@
 
 import pyvista as pv
 import numpy as np
+from app.plotting.mesh_export import partes_silenciador, exportar_modelo
 
 # --------------------------------------------
 # Genera y muestra el modelo 3D del silenciador tipo splitter
 # --------------------------------------------
-def generate_3d_model(length, width, height, n_baffles, gap, show_dims=True, plotter=None, img_path=None, html_path=None, baffle_color="#C0C0C0"):
+def generate_3d_model(length, width, height, n_baffles, baffle_thickness=0.02, wall_thickness=0.005, show_dims=True,
+                      plotter=None, img_path=None, html_path=None, baffle_color="#C0C0C0", return_image=False,
+                      mesh_path=None, mesh_detail='completo', disposicion=None):
+    """
+    La separación entre baffles sale de geometria.Geometria con los espesores
+    dados. mesh_path exporta además la malla a GLB, STL u OBJ (según la
+    extensión) con el nivel de detalle mesh_detail ('completo' o 'bajo').
+    disposicion es una geometria.Disposicion no uniforme (opcional)
+    """
     # Si no se pasa un plotter, crear uno nuevo
-    if plotter is None:
-        use_offscreen = img_path is not None
+    own_plotter = plotter is None
+    if own_plotter:
+        use_offscreen = img_path is not None or return_image
         plotter = pv.Plotter(window_size=[1200, 700], off_screen=use_offscreen)
         plotter.set_background("white")
 
-    # Dimensiones del enclosure y baffles
-    wall_thickness = 0.005  # 5mm de grosor de paredes
-    baffle_thickness = 0.02
-    
-    # El width ya incluye el espacio necesario para todos los baffles
-    interior_width = width - 2 * wall_thickness
-    
-    # Calcular posiciones de baffles distribuidas uniformemente
-    if n_baffles > 1:
-        # Distribución uniforme de baffles en el espacio interior
-        start_y = wall_thickness + baffle_thickness/2
-        end_y = width - wall_thickness - baffle_thickness/2
-        baffle_positions = np.linspace(start_y, end_y, n_baffles)
-    else:
-        # Un solo baffle centrado
-        baffle_positions = [width/2]
-
-    # Carcasa externa (caja metálica)
-    # Pared frontal
-    front_wall = pv.Cube(
-        center=(wall_thickness/2, width/2, height/2),
-        x_length=wall_thickness, y_length=width, z_length=height
-    )
-    plotter.add_mesh(front_wall, color="#8C8C8C", opacity=0.8, show_edges=True)
-    
-    # Pared trasera
-    back_wall = pv.Cube(
-        center=(length - wall_thickness/2, width/2, height/2),
-        x_length=wall_thickness, y_length=width, z_length=height
-    )
-    plotter.add_mesh(back_wall, color="#8C8C8C", opacity=0.8, show_edges=True)
-    
-    # Paredes laterales
-    left_wall = pv.Cube(
-        center=(length/2, wall_thickness/2, height/2),
-        x_length=length, y_length=wall_thickness, z_length=height
-    )
-    plotter.add_mesh(left_wall, color="#8C8C8C", opacity=0.8, show_edges=True)
-    
-    right_wall = pv.Cube(
-        center=(length/2, width - wall_thickness/2, height/2),
-        x_length=length, y_length=wall_thickness, z_length=height
-    )
-    plotter.add_mesh(right_wall, color="#8C8C8C", opacity=0.8, show_edges=True)
-    
-    # Pared superior
-    top_wall = pv.Cube(
-        center=(length/2, width/2, height - wall_thickness/2),
-        x_length=length, y_length=width, z_length=wall_thickness
-    )
-    plotter.add_mesh(top_wall, color="#8C8C8C", opacity=0.8, show_edges=True)
-    
-    # Pared inferior
-    bottom_wall = pv.Cube(
-        center=(length/2, width/2, wall_thickness/2),
-        x_length=length, y_length=width, z_length=wall_thickness
-    )
-    plotter.add_mesh(bottom_wall, color="#8C8C8C", opacity=0.8, show_edges=True)
-
-    # Baffles internos (usando las posiciones calculadas)
-    for i, y_pos in enumerate(baffle_positions):
-        baffle = pv.Cube(
-            center=(length/2, y_pos, height/2),
-            x_length=length - 2*wall_thickness,  # Ajustar al interior
-            y_length=baffle_thickness,
-            z_length=height - 2*wall_thickness   # Ajustar al interior
-        )
-        plotter.add_mesh(baffle, color=baffle_color, opacity=0.9, show_edges=True)
+    # Carcasa (seis paredes) y baffles como dos mallas de cuadriláteros, una
+    # por material: la escena tiene dos actores sin importar el número de
+    # baffles, lo que aligera el render y el HTML exportado
+    for parte in partes_silenciador(length, width, height, n_baffles, wall_thickness=wall_thickness,
+                                     baffle_thickness=baffle_thickness, baffle_color=baffle_color,
+                                     disposicion=disposicion):
+        caras = np.hstack([np.full((len(parte['quads']), 1), 4), parte['quads']]).ravel()
+        malla = pv.PolyData(parte['vertices'], caras)
+        plotter.add_mesh(malla, color=parte['color'], opacity=parte['opacidad'], show_edges=True)
 
     # ========== ELIMINAR TODAS LAS MEDIDAS DEL MODELO 3D ==========
     # No mostrar dimensiones para mantener el modelo limpio y profesional
     show_dims = False  # Forzar a False independientemente del parámetro de entrada
     
-    # Guardar imagen si se solicita
-    if img_path:
+    # Guardar imagen si se solicita (en disco y/o como arreglo en memoria)
+    image = None
+    if img_path or return_image:
         plotter.view_isometric()
-        plotter.screenshot(img_path)
+        image = plotter.screenshot(img_path or None, return_img=True)
     
+    # Exportar la malla compacta si se solicita
+    if mesh_path:
+        exportar_modelo(mesh_path, length, width, height, n_baffles, mesh_detail, baffle_color=baffle_color,
+                        wall_thickness=wall_thickness, baffle_thickness=baffle_thickness, disposicion=disposicion)
+
     # Exportar HTML si se solicita
     if html_path:
         plotter.export_html(html_path)
@@ -101,3 +58,7 @@ def generate_3d_model(length, width, height, n_baffles, gap, show_dims=True, plo
     # Mostrar el modelo si no se está usando en modo embebido y no es off_screen
     if plotter is not None and not hasattr(plotter, 'parent') and not plotter.off_screen:
         plotter.show()
+    elif own_plotter and plotter.off_screen:
+        plotter.close()
+
+    return image
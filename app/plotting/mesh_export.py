@@ -0,0 +1,229 @@
+# --------------------------------------------
+# mesh_export.py
+# Mallas del silenciador como arreglos numpy y exportación a GLB, STL y OBJ
+# --------------------------------------------
+
+import os
+import json
+import struct
+import numpy as np
+from app.simulation.geometria import geometria
+
+COLOR_CARCASA = "#8C8C8C"
+
+# Esquinas de un cubo unitario centrado (la esquina k tiene x=bit0, y=bit1, z=bit2)
+_ESQUINAS = np.array([[(k >> 0) & 1, (k >> 1) & 1, (k >> 2) & 1] for k in range(8)], dtype=float) - 0.5
+
+# Caras del cubo como cuadriláteros en sentido antihorario visto desde fuera
+_QUADS_CUBO = np.array([
+    [0, 4, 6, 2],  # -x
+    [1, 3, 7, 5],  # +x
+    [0, 1, 5, 4],  # -y
+    [2, 6, 7, 3],  # +y
+    [0, 2, 3, 1],  # -z
+    [4, 5, 7, 6],  # +z
+])
+
+# --------------------------------------------
+# Vértices y cuadriláteros de N cajas alineadas con los ejes
+# --------------------------------------------
+def malla_cajas(centros, tamanos):
+    """
+    centros y tamanos son arreglos (N, 3). Devuelve vértices (8N, 3) y
+    cuadriláteros (6N, 4), construidos en una sola operación vectorizada
+    """
+    centros = np.atleast_2d(np.asarray(centros, dtype=float))
+    tamanos = np.atleast_2d(np.asarray(tamanos, dtype=float))
+    vertices = centros[:, None, :] + _ESQUINAS[None, :, :] * tamanos[:, None, :]
+    quads = _QUADS_CUBO[None, :, :] + 8 * np.arange(len(centros))[:, None, None]
+    return vertices.reshape(-1, 3), quads.reshape(-1, 4)
+
+# --------------------------------------------
+# Une vértices repetidos y elimina caras coincidentes
+# --------------------------------------------
+def fusionar_malla(vertices, quads, decimales=9):
+    """
+    Los vértices que coinciden (redondeados a 'decimales') se unen en uno
+    solo. Las caras que aparecen dos veces sobre los mismos vértices (caras
+    interiores entre piezas en contacto) se eliminan, igual que las caras
+    degeneradas que quedan con vértices repetidos
+    """
+    unicos, inversa = np.unique(np.round(vertices, decimales), axis=0, return_inverse=True)
+    quads = inversa.reshape(-1)[quads]
+
+    ordenados = np.sort(quads, axis=1)
+    no_degeneradas = np.all(np.diff(ordenados, axis=1) > 0, axis=1)
+    _, indice, conteo = np.unique(ordenados, axis=0, return_inverse=True, return_counts=True)
+    quads = quads[no_degeneradas & (conteo[indice.reshape(-1)] == 1)]
+
+    # Descarta los vértices que ya no usa ninguna cara
+    usados, quads = np.unique(quads, return_inverse=True)
+    return unicos[usados], quads.reshape(-1, 4)
+
+# --------------------------------------------
+# Divide cada cuadrilátero en dos triángulos
+# --------------------------------------------
+def triangular(quads):
+    return np.stack([quads[:, [0, 1, 2]], quads[:, [0, 2, 3]]], axis=1).reshape(-1, 3)
+
+# --------------------------------------------
+# Piezas del silenciador (carcasa y baffles) como mallas de cuadriláteros
+# --------------------------------------------
+def partes_silenciador(length, width, height, n_baffles, detalle='completo', fusionar=True,
+                       wall_thickness=0.005, baffle_thickness=0.02, baffle_color="#C0C0C0", disposicion=None):
+    """
+    detalle='completo' usa las cajas de geometria.Geometria (seis paredes
+    con espesor y baffles macizos, las mismas de los planos). detalle='bajo' da una vista
+    previa ligera: la carcasa como un conducto abierto de cuatro caras y
+    cada baffle como un solo cuadrilátero en su plano medio.
+    Con una geometria.Disposicion (rendijas desiguales, baffles escalonados
+    o medios baffles) el ancho y el número de baffles salen de ella.
+    Devuelve una lista de diccionarios con 'nombre', 'vertices', 'quads',
+    'color' y 'opacidad'
+    """
+    geo = geometria(length, width, height, n_baffles, baffle_thickness, wall_thickness, disposicion)
+    width = geo.width
+
+    if detalle == 'bajo':
+        vertices_carcasa, quads_carcasa = malla_cajas([[length / 2, width / 2, height / 2]], [[length, width, height]])
+        quads_carcasa = quads_carcasa[2:]  # Sin caras de entrada y salida (-x, +x)
+
+        # Un cuadrilátero por baffle (y medio baffle) en su plano medio, con su tramo a lo largo
+        centros, tamanos = geo.cajas_baffles()
+        x0, x1 = centros[:, 0] - tamanos[:, 0] / 2, centros[:, 0] + tamanos[:, 0] / 2
+        z0, z1 = wall_thickness, height - wall_thickness
+        n = len(centros)
+        vertices_baffles = np.empty((n, 4, 3))
+        vertices_baffles[:, :, 0] = np.column_stack([x0, x1, x1, x0])
+        vertices_baffles[:, :, 1] = centros[:, 1:2]
+        vertices_baffles[:, :, 2] = [z0, z0, z1, z1]
+        vertices_baffles = vertices_baffles.reshape(-1, 3)
+        quads_baffles = np.arange(4 * n).reshape(n, 4)
+    elif detalle == 'completo':
+        vertices_carcasa, quads_carcasa = malla_cajas(*geo.cajas_carcasa())
+        vertices_baffles, quads_baffles = malla_cajas(*geo.cajas_baffles())
+    else:
+        raise ValueError(f"Nivel de detalle desconocido: {detalle}")
+
+    partes = [
+        {'nombre': 'carcasa', 'vertices': vertices_carcasa, 'quads': quads_carcasa,
+         'color': COLOR_CARCASA, 'opacidad': 0.8},
+        {'nombre': 'baffles', 'vertices': vertices_baffles, 'quads': quads_baffles,
+         'color': baffle_color, 'opacidad': 0.9},
+    ]
+    if fusionar:
+        for parte in partes:
+            parte['vertices'], parte['quads'] = fusionar_malla(parte['vertices'], parte['quads'])
+    return partes
+
+# --------------------------------------------
+# Convierte un color hexadecimal (#RRGGBB) a RGB en [0, 1]
+# --------------------------------------------
+def _rgb(color):
+    color = color.lstrip('#')
+    return [int(color[i:i + 2], 16) / 255 for i in (0, 2, 4)]
+
+# --------------------------------------------
+# Exporta a glTF binario (GLB): un nodo, malla y material por pieza
+# --------------------------------------------
+def exportar_glb(ruta, partes):
+    gltf = {
+        'asset': {'version': '2.0', 'generator': 'Simulador de Silenciadores Tipo Splitter'},
+        'scene': 0,
+        # El modelo usa Z hacia arriba; glTF usa Y: rotación de -90° alrededor de X
+        'scenes': [{'nodes': [0]}],
+        'nodes': [{'rotation': [-0.7071068, 0, 0, 0.7071068], 'children': list(range(1, len(partes) + 1))}],
+        'meshes': [], 'materials': [], 'accessors': [], 'bufferViews': [], 'buffers': [],
+    }
+    binario = bytearray()
+
+    def agregar_vista(datos, destino):
+        binario.extend(b'\x00' * (-len(binario) % 4))
+        gltf['bufferViews'].append({'buffer': 0, 'byteOffset': len(binario),
+                                    'byteLength': len(datos), 'target': destino})
+        binario.extend(datos)
+        return len(gltf['bufferViews']) - 1
+
+    for i, parte in enumerate(partes):
+        posiciones = np.ascontiguousarray(parte['vertices'], dtype='<f4')
+        indices = np.ascontiguousarray(triangular(parte['quads']), dtype='<u4')
+
+        gltf['accessors'].append({
+            'bufferView': agregar_vista(posiciones.tobytes(), 34962), 'componentType': 5126,
+            'count': len(posiciones), 'type': 'VEC3',
+            'min': posiciones.min(axis=0).tolist(), 'max': posiciones.max(axis=0).tolist(),
+        })
+        gltf['accessors'].append({
+            'bufferView': agregar_vista(indices.tobytes(), 34963), 'componentType': 5125,
+            'count': indices.size, 'type': 'SCALAR',
+        })
+        gltf['materials'].append({
+            'name': parte['nombre'], 'doubleSided': True,
+            'alphaMode': 'BLEND' if parte['opacidad'] < 1 else 'OPAQUE',
+            'pbrMetallicRoughness': {'baseColorFactor': _rgb(parte['color']) + [parte['opacidad']],
+                                     'metallicFactor': 0.3, 'roughnessFactor': 0.6},
+        })
+        gltf['meshes'].append({'name': parte['nombre'], 'primitives': [
+            {'attributes': {'POSITION': 2 * i}, 'indices': 2 * i + 1, 'material': i}]})
+        gltf['nodes'].append({'name': parte['nombre'], 'mesh': i})
+
+    binario.extend(b'\x00' * (-len(binario) % 4))
+    gltf['buffers'].append({'byteLength': len(binario)})
+
+    encabezado_json = json.dumps(gltf, separators=(',', ':')).encode('utf-8')
+    encabezado_json += b' ' * (-len(encabezado_json) % 4)
+    total = 12 + 8 + len(encabezado_json) + 8 + len(binario)
+
+    with open(ruta, 'wb') as f:
+        f.write(struct.pack('<III', 0x46546C67, 2, total))
+        f.write(struct.pack('<II', len(encabezado_json), 0x4E4F534A))
+        f.write(encabezado_json)
+        f.write(struct.pack('<II', len(binario), 0x004E4942))
+        f.write(binario)
+    return ruta
+
+# --------------------------------------------
+# Exporta a STL binario (todas las piezas en un solo sólido)
+# --------------------------------------------
+def exportar_stl(ruta, partes):
+    triangulos = np.concatenate([parte['vertices'][triangular(parte['quads'])] for parte in partes])
+    normales = np.cross(triangulos[:, 1] - triangulos[:, 0], triangulos[:, 2] - triangulos[:, 0])
+    normales /= np.maximum(np.linalg.norm(normales, axis=1, keepdims=True), 1e-30)
+
+    registros = np.zeros(len(triangulos), dtype=[('normal', '<f4', 3), ('vertices', '<f4', (3, 3)), ('atributo', '<u2')])
+    registros['normal'] = normales
+    registros['vertices'] = triangulos
+
+    with open(ruta, 'wb') as f:
+        f.write(b'Silenciador tipo splitter'.ljust(80, b' '))
+        f.write(struct.pack('<I', len(registros)))
+        f.write(registros.tobytes())
+    return ruta
+
+# --------------------------------------------
+# Exporta a OBJ de texto (un objeto por pieza, caras cuadriláteras)
+# --------------------------------------------
+def exportar_obj(ruta, partes):
+    desplazamiento = 1  # OBJ indexa desde 1
+    with open(ruta, 'w') as f:
+        f.write("# Silenciador tipo splitter\n")
+        for parte in partes:
+            f.write(f"o {parte['nombre']}\n")
+            np.savetxt(f, parte['vertices'], fmt='v %.6f %.6f %.6f')
+            np.savetxt(f, parte['quads'] + desplazamiento, fmt='f %d %d %d %d')
+            desplazamiento += len(parte['vertices'])
+    return ruta
+
+EXPORTADORES = {'.glb': exportar_glb, '.stl': exportar_stl, '.obj': exportar_obj}
+
+# --------------------------------------------
+# Exporta el modelo del silenciador según la extensión de la ruta
+# --------------------------------------------
+def exportar_modelo(ruta, length, width, height, n_baffles, detalle='completo', fusionar=True,
+                    baffle_color="#C0C0C0", wall_thickness=0.005, baffle_thickness=0.02, disposicion=None):
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension not in EXPORTADORES:
+        raise ValueError(f"Formato no soportado: {extension} (use {', '.join(EXPORTADORES)})")
+    partes = partes_silenciador(length, width, height, n_baffles, detalle, fusionar, wall_thickness, baffle_thickness,
+                                baffle_color, disposicion)
+    return EXPORTADORES[extension](ruta, partes)
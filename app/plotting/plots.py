@@ -3,27 +3,138 @@
 # Gráficas 2D de la simulación acústica
 # --------------------------------------------
 
-import matplotlib.pyplot as plt
+import io
+import threading
+from matplotlib.figure import Figure
+from PIL import Image
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 
 # --------------------------------------------
-# Genera y guarda la curva de atenuación del silenciador
+# Renderizador de curvas de atenuación que reutiliza figura y líneas
 # --------------------------------------------
-def plot_attenuation_curves(freq, TL, delta_L, TL_total, output_path="TL_vs_freq.png"):
-    fig, ax1 = plt.subplots(figsize=(10, 6))
-    ax2 = ax1.twinx()
+class AttenuationRenderer:
+    """
+    Construye una sola vez la figura (backend Agg, API orientada a objetos),
+    los ejes gemelos y las líneas; cada render solo actualiza los datos con
+    set_data. No usa el estado global de pyplot, así que cada hilo o proceso
+    puede tener su propia instancia (ver renderizador_hilo)
+    """
+
+    def __init__(self, figsize=(10, 6), dpi=100):
+        self.fig = Figure(figsize=figsize, dpi=dpi)
+        self.canvas = FigureCanvasAgg(self.fig)
+        self._lock = threading.Lock()
+
+        self.ax1 = self.fig.add_subplot(111)
+        self.ax2 = self.ax1.twinx()
+
+        self.line_TL, = self.ax1.plot([], [], label='TL(f)', color='tab:blue')
+        self.line_delta_L, = self.ax2.plot([], [], label='ΔL(f)', color='tab:red', linestyle='--')
+        self.line_total, = self.ax1.plot([], [], label='Atenuación total', color='tab:green', linewidth=2)
+
+        # Banda de confianza Monte Carlo: un único polígono que se reutiliza
+        self.band = self.ax1.fill_between([0, 1], [0, 0], [0, 0], color='tab:green', alpha=0.2)
+        self.band.set_visible(False)
+        self._band_label = None
+
+        self.ax1.set_xlabel("Frecuencia [Hz]")
+        self.ax1.set_ylabel("Transmission Loss TL [dB]", color='tab:blue')
+        self.ax2.set_ylabel("Atenuación adicional ΔL [dB]", color='tab:red')
+
+        self.ax1.tick_params(axis='y', labelcolor='tab:blue')
+        self.ax2.tick_params(axis='y', labelcolor='tab:red')
+
+        self.legend = None
+        self._update_legend(None)
+        self.fig.tight_layout()
+
+    # --------------------------------------------
+    # Rehace la leyenda solo cuando cambia la banda mostrada
+    # --------------------------------------------
+    def _update_legend(self, band_label):
+        if self.legend is not None and band_label == self._band_label:
+            return
+        if self.legend is not None:
+            self.legend.remove()
+        handles = [self.line_TL, self.line_delta_L, self.line_total]
+        if band_label is not None:
+            self.band.set_label(band_label)
+            handles.append(self.band)
+        self.legend = self.fig.legend(handles=handles, loc='upper right')
+        self._band_label = band_label
+
+    # --------------------------------------------
+    # Actualiza las curvas y guarda la figura en un archivo o buffer
+    # --------------------------------------------
+    def render(self, freq, TL, delta_L, TL_total, output_path=None, bandas=None, fmt='png'):
+        """
+        Si output_path es None devuelve los bytes de la imagen; también admite
+        rutas y objetos tipo archivo (BytesIO)
+        """
+        with self._lock:
+            self.line_TL.set_data(freq, TL)
+            self.line_delta_L.set_data(freq, delta_L)
+            self.line_total.set_data(freq, TL_total)
+
+            band_label = None
+            if bandas is not None:
+                q_bajo, q_alto = min(bandas['percentiles']), max(bandas['percentiles'])
+                bajo, alto = bandas['percentiles'][q_bajo], bandas['percentiles'][q_alto]
+                self.band.set_data(freq, bajo, alto)
+                band_label = f'Banda P{q_bajo}–P{q_alto}'
+            self.band.set_visible(bandas is not None)
+            self._update_legend(band_label)
 
-    ax1.plot(freq, TL, label='TL(f)', color='tab:blue')
-    ax2.plot(freq, delta_L, label='ΔL(f)', color='tab:red', linestyle='--')
-    ax1.plot(freq, TL_total, label='Atenuación total', color='tab:green', linewidth=2)
+            for ax in (self.ax1, self.ax2):
+                ax.relim(visible_only=True)
+                ax.autoscale_view()
 
-    ax1.set_xlabel("Frecuencia [Hz]")
-    ax1.set_ylabel("Transmission Loss TL [dB]", color='tab:blue')
-    ax2.set_ylabel("Atenuación adicional ΔL [dB]", color='tab:red')
+            if fmt != 'png':
+                buffer = io.BytesIO() if output_path is None else output_path
+                self.fig.savefig(buffer, format=fmt)
+                return buffer.getvalue() if output_path is None else output_path
 
-    ax1.tick_params(axis='y', labelcolor='tab:blue')
-    ax2.tick_params(axis='y', labelcolor='tab:red')
+            # Un solo draw y codificación PNG rápida del buffer RGBA (savefig
+            # redibuja la figura dos veces). El fondo es opaco, así que se
+            # guarda en RGB: el PNG es más pequeño y FPDF no revisa el canal alfa
+            self.canvas.draw()
+            imagen = Image.frombuffer('RGBA', self.canvas.get_width_height(), self.canvas.buffer_rgba()).convert('RGB')
+            buffer = io.BytesIO() if output_path is None else output_path
+            imagen.save(buffer, format='png', compress_level=1)
+            return buffer.getvalue() if output_path is None else output_path
+
+# Un renderizador por hilo (y por lo tanto por proceso)
+_local = threading.local()
+
+# --------------------------------------------
+# Devuelve el renderizador del hilo actual, creándolo la primera vez
+# --------------------------------------------
+def renderizador_hilo():
+    if not hasattr(_local, 'renderer'):
+        _local.renderer = AttenuationRenderer()
+    return _local.renderer
+
+# --------------------------------------------
+# Genera y guarda la curva de atenuación del silenciador
+# --------------------------------------------
+def plot_attenuation_curves(freq, TL, delta_L, TL_total, output_path="TL_vs_freq.png", bandas=None):
+    return renderizador_hilo().render(freq, TL, delta_L, TL_total, output_path, bandas=bandas)
+
+# --------------------------------------------
+# Renderiza una lista de curvas (freq, TL, delta_L, TL_total) a sus rutas
+# --------------------------------------------
+def _render_trabajo(trabajo):
+    curvas, ruta = trabajo
+    return plot_attenuation_curves(*curvas, output_path=ruta)
 
-    fig.legend(loc='upper right')
-    fig.tight_layout()
-    plt.savefig(output_path)
-    plt.close(fig)
+def render_batch(curvas, rutas, n_procesos=None, chunksize=16):
+    """
+    Renderiza muchas gráficas reutilizando una figura por proceso trabajador.
+    Con n_procesos=1 se renderiza en el proceso actual
+    """
+    trabajos = list(zip(curvas, rutas))
+    if n_procesos == 1:
+        return [_render_trabajo(t) for t in trabajos]
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=n_procesos) as ejecutor:
+        return list(ejecutor.map(_render_trabajo, trabajos, chunksize=chunksize))
@@ -0,0 +1,394 @@
+# --------------------------------------------
+# report.py
+# Motor único de reportes PDF: diseño individual, fundamentos matemáticos
+# y comparación de varios diseños
+# --------------------------------------------
+
+import io
+import os
+import copy
+import functools
+import numpy as np
+import matplotlib
+import fpdf
+from fpdf import FPDF, XPos, YPos
+from PIL import Image
+
+# Estilos de texto: (variante de fuente, tamaño [pt], color RGB)
+FUENTE = 'DejaVu'
+ESTILOS = {
+    'titulo': ('B', 16, (0, 0, 0)),
+    'h1': ('B', 14, (0, 0, 0)),
+    'h2': ('B', 12, (0, 0, 255)),
+    'normal': ('', 10, (0, 0, 0)),
+    'tabla': ('', 8, (0, 0, 0)),
+}
+
+# Versión de fpdf2 cuyas estructuras internas de fuentes se copian (ver _registrar_fuentes)
+VERSION_COPIA_FUENTES = '2.8.'
+
+TITULO_DISENO = "Reporte de Simulación - Silenciador tipo Splitter"
+TITULO_FUNDAMENTOS = "FUNDAMENTOS MATEMÁTICOS Y METODOLOGÍA DE CÁLCULO"
+
+# Contenido estático de los fundamentos: (sección, [(subsección, fórmula LaTeX,
+# ancho de la fórmula [mm], párrafos)]). Los párrafos son plantillas que se
+# completan con los valores del diseño (ver _valores_fundamentos)
+FUNDAMENTOS = (
+    ("1. Parámetros Fundamentales del Diseño", (
+        ("1.1 Velocidad del sonido en el aire", r"c = 343 \ \text{m/s}", 76,
+         ("La velocidad del sonido en aire a temperatura ambiente (20°C) y presión atmosférica estándar.",)),
+        ("1.2 Conversión de caudal", r"Q \ [\text{m}^3/\text{s}] = \frac{Q \ [\text{m}^3/\text{h}]}{3600}", 102,
+         ("Valor actual: Q = {Q:.4f} m³/s (equivalente a {Q_m3h:.1f} m³/h)",)),
+        ("1.3 Área de paso requerida", r"S = \frac{Q}{V}", 51,
+         ("Valor calculado: S = {S:.4f} m²",)),
+    )),
+    ("2. Dimensionamiento de Baffles", (
+        ("2.1 Separación entre baffles", r"h = \frac{\lambda_{max}}{8} = \frac{c}{8 \cdot f_{max}}", 76,
+         ("Valor calculado: h = {h:.4f} m",
+          "Separación total (2h): 2h = {dos_h:.4f} m",
+          "Donde λ es la longitud de onda máxima en el silenciador.")),
+        ("2.2 Número de espacios/rendijas necesarios", r"n_{espacios} = \lceil \frac{S}{H \cdot 2h} \rceil", 76,
+         ("Valor calculado: n_espacios = {n_espacios}",
+          "Donde ceil() es la función techo que redondea al entero superior.")),
+        ("2.3 Número de baffles", r"n_{baffles} = n_{espacios} - 1", 76,
+         ("Valor calculado: n_baffles = {n_baffles}",)),
+    )),
+    ("3. Dimensiones del Silenciador", (
+        ("3.1 Ancho interior necesario",
+         r"interior\_width = n_{baffles} \cdot t_{baffle} + n_{espacios} \cdot 2h", 102,
+         ("Valor calculado: interior_width = {interior_width:.4f} m",)),
+        ("3.2 Ancho total del silenciador", r"width = interior\_width + 2 \cdot t_{pared}", 76,
+         ("Valor calculado: width = {width:.4f} m",)),
+    )),
+    ("4. Cálculos de Atenuación Acústica", (
+        ("4.1 Pérdida por Transmisión (TL)", r"TL = 10 \cdot \log_{10}\left(e^{2 \alpha L}\right)", 76,
+         ("Donde α es el coeficiente de absorción del material.",)),
+        ("4.2 Atenuación adicional por efectos de borde", r"\Delta L = 1.05 \cdot \alpha^{1.4} \cdot \frac{a}{h}", 76,
+         ("Donde a es la altura del silenciador.",)),
+        ("4.3 Atenuación total", r"\text{Atenuación total} = TL + \Delta L", 76,
+         ("Atenuación máxima calculada: {TL_max:.2f} dB",)),
+    )),
+)
+
+REFERENCIAS = (
+    "• Bies, D.A. y Hansen, C.H. (2009). Engineering Noise Control: Theory and Practice.",
+    "• Ingard, U. (2009). Noise Reduction Analysis.",
+    "• Munjal, M.L. (2014). Acoustics of Ducts and Mufflers.",
+    "• Ver, I.L. y Beranek, L.L. (2005). Noise and Vibration Control Engineering.",
+)
+
+# Columnas de la tabla comparativa: (encabezado, clave, formato)
+COLUMNAS_COMPARACION = (
+    ("Diseño", 'nombre', '{}'),
+    ("Q [m³/h]", 'Q_m3h', '{:.0f}'),
+    ("H [m]", 'H', '{:.2f}'),
+    ("L [m]", 'L', '{:.2f}'),
+    ("Ancho [m]", 'width', '{:.3f}'),
+    ("Baffles", 'n_baffles', '{:.0f}'),
+    ("v rendija [m/s]", 'v_paso', '{:.2f}'),
+    ("Δp [Pa]", 'dp_total', '{:.1f}'),
+    ("Atenuación máx. [dB]", 'TL_max', '{:.2f}'),
+)
+
+# --------------------------------------------
+# Rutas de las fuentes Unicode (DejaVu, incluida con matplotlib)
+# --------------------------------------------
+@functools.lru_cache(maxsize=None)
+def _rutas_fuentes():
+    carpeta = os.path.join(matplotlib.get_data_path(), 'fonts', 'ttf')
+    return {'': os.path.join(carpeta, 'DejaVuSans.ttf'),
+            'B': os.path.join(carpeta, 'DejaVuSans-Bold.ttf')}
+
+# --------------------------------------------
+# Fuente TTF ya analizada, una vez por proceso y variante
+# --------------------------------------------
+@functools.lru_cache(maxsize=None)
+def _plantilla_fuente(variante):
+    from fpdf.fonts import TTFFont
+    return TTFFont(FPDF(), _rutas_fuentes()[variante], f"{FUENTE.lower()}{variante}", variante)
+
+# --------------------------------------------
+# Copia las fuentes de la plantilla (estructuras internas de fpdf2 2.8)
+# --------------------------------------------
+def _copiar_fuentes(pdf):
+    """
+    Copia las métricas ya analizadas y solo crea de nuevo, por documento, el
+    TTFont perezoso y el mapa de subconjunto, que fpdf2 modifica al
+    incrustar la fuente. Las fuentes se agregan al final, todas juntas
+    """
+    from fontTools import ttLib
+    from fpdf.fonts import SubsetMap
+    fuentes = []
+    for variante, ruta in _rutas_fuentes().items():
+        fuente = copy.copy(_plantilla_fuente(variante))
+        fuente.i = len(pdf.fonts) + len(fuentes) + 1
+        fuente.ttfont = ttLib.TTFont(ruta, recalcTimestamp=False, fontNumber=0, lazy=True)
+        fuente.missing_glyphs = []
+        fuente.subset = SubsetMap(fuente)
+        fuentes.append(fuente)
+    for fuente in fuentes:
+        pdf.fonts[fuente.fontkey] = fuente
+
+# --------------------------------------------
+# Registra las fuentes DejaVu en un documento
+# --------------------------------------------
+def _registrar_fuentes(pdf):
+    """
+    add_font analiza el TTF (~30 ms por variante y documento). Con fpdf2 2.8,
+    la versión de requirements.txt, se copian las métricas de una plantilla
+    (_copiar_fuentes, ~0.3 ms); con otra versión, o si la copia falla, se
+    usa la API pública FPDF.add_font
+    """
+    if fpdf.__version__.startswith(VERSION_COPIA_FUENTES):
+        try:
+            _copiar_fuentes(pdf)
+            return
+        except (ImportError, AttributeError, TypeError):
+            pass
+    for variante, ruta in _rutas_fuentes().items():
+        pdf.add_font(FUENTE, variante, ruta)
+
+# --------------------------------------------
+# Renderiza una fórmula LaTeX (mathtext) a PNG, una sola vez por proceso
+# --------------------------------------------
+@functools.lru_cache(maxsize=256)
+def imagen_formula(latex, fontsize=14):
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    with matplotlib.rc_context({'mathtext.fontset': 'cm'}):
+        fig = Figure(figsize=(8, 1))
+        FigureCanvasAgg(fig)
+        fig.text(0.5, 0.5, f"${latex}$", fontsize=fontsize, ha='center', va='center')
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format='png', dpi=150, bbox_inches='tight', transparent=True)
+    return buffer.getvalue()
+
+# --------------------------------------------
+# Adapta una imagen en memoria o en disco al formato que acepta FPDF
+# --------------------------------------------
+def _imagen_pdf(imagen):
+    """
+    Acepta rutas, bytes PNG (p. ej. de plot_attenuation_curves con
+    output_path=None), buffers BytesIO, imágenes PIL o arreglos numpy
+    (capturas de pyvista con return_img=True)
+    """
+    if isinstance(imagen, (bytes, bytearray, memoryview)):
+        return io.BytesIO(imagen)
+    if isinstance(imagen, np.ndarray):
+        return Image.fromarray(imagen)
+    return imagen
+
+# --------------------------------------------
+# Documento FPDF con fuentes, estilos y pie de página comunes
+# --------------------------------------------
+class _Documento(FPDF):
+    def __init__(self):
+        super().__init__(format='A4')
+        _registrar_fuentes(self)
+        self.set_auto_page_break(True, margin=15)
+
+    def estilo(self, nombre):
+        variante, tamano, color = ESTILOS[nombre]
+        self.set_font(FUENTE, variante, tamano)
+        self.set_text_color(*color)
+
+    def linea(self, texto, nombre='normal', alto=7, align='L'):
+        self.estilo(nombre)
+        self.multi_cell(0, alto, texto, align=align, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+
+    def footer(self):
+        self.set_y(-12)
+        self.estilo('tabla')
+        self.cell(0, 8, f"Página {self.page_no()}", align='C')
+
+# --------------------------------------------
+# Guarda el documento en una ruta o en un objeto tipo archivo
+# --------------------------------------------
+def _guardar(pdf, salida):
+    if hasattr(salida, 'write'):
+        salida.write(pdf.output())
+    else:
+        pdf.output(salida)
+    return salida
+
+# --------------------------------------------
+# Valor escalar de una clave del diseño (acepta arreglos de un elemento)
+# --------------------------------------------
+def _escalar(data, clave):
+    return float(np.asarray(data[clave]).ravel()[0])
+
+# --------------------------------------------
+# Agrega la sección de resultados de un diseño (nueva página)
+# --------------------------------------------
+def seccion_diseno(pdf, data, titulo=TITULO_DISENO):
+    """
+    data sigue las claves de calcular_parametros (más TL, delta_L, TL_total e
+    incertidumbre si existen). Las imágenes se toman de graph_png,
+    model_image y technical_drawings_png; si falta la gráfica pero están las
+    curvas se renderiza con el renderizador del hilo y no se conserva
+    """
+    pdf.add_page()
+    pdf.linea(titulo, 'titulo', alto=10)
+    pdf.ln(5)
+
+    pdf.linea(f"Área requerida: {data['S']:.4f} m²")
+    pdf.linea(f"Separación entre baffles (2h): {2*data['h']:.4f} m")
+    pdf.linea(f"Número de rendijas: {data['n_espacios']}")
+    pdf.linea(f"Total de baffles: {data['n_baffles']}")
+    pdf.linea(f"Ancho total estimado: {data['width']:.4f} m")
+    if 'L' in data and 'H' in data:
+        pdf.linea(f"Largo: {data['L']:.3f} m, altura: {data['H']:.3f} m, material: {data.get('material', '-')}")
+
+    # Velocidad de paso y caída de presión (claves de pressure.caida_presion)
+    if 'dp_total' in data:
+        pdf.linea(f"Velocidad en rendijas: {data['v_paso']:.2f} m/s")
+        pdf.linea(f"Caída de presión: {data['dp_total']:.1f} Pa (entrada {data['dp_entrada']:.1f}, "
+                  f"fricción {data['dp_friccion']:.1f}, salida {data['dp_salida']:.1f})")
+    if 'TL_total' in data:
+        pdf.linea(f"Atenuación máxima: {np.max(data['TL_total']):.2f} dB")
+
+    # Resumen de la banda de confianza Monte Carlo en las frecuencias ancla
+    incertidumbre = data.get('incertidumbre')
+    if incertidumbre is not None:
+        pdf.ln(3)
+        percentiles = incertidumbre['percentiles']
+        q_bajo, q_alto = min(percentiles), max(percentiles)
+        pdf.linea(f"Incertidumbre Monte Carlo ({incertidumbre['n_muestras']} muestras):")
+        for f_ancla in (125, 250, 500):
+            i = int(np.argmin(np.abs(incertidumbre['freq'] - f_ancla)))
+            pdf.linea(f"  {incertidumbre['freq'][i]:.0f} Hz: media {incertidumbre['media'][i]:.2f} dB, "
+                      f"P{q_bajo}-P{q_alto} = {percentiles[q_bajo][i]:.2f} - {percentiles[q_alto][i]:.2f} dB")
+
+    grafica = data.get('graph_png')
+    if grafica is None and 'TL_total' in data:
+        from app.plotting.plots import plot_attenuation_curves
+        grafica = plot_attenuation_curves(data['freq'], data['TL'], data['delta_L'], data['TL_total'],
+                                          None, bandas=incertidumbre)
+    if grafica is not None:
+        pdf.ln(5)
+        pdf.image(_imagen_pdf(grafica), w=180)
+    if data.get('model_image') is not None:
+        pdf.ln(5)
+        pdf.image(_imagen_pdf(data['model_image']), w=120)
+
+    # Planos técnicos en una página aparte
+    if data.get('technical_drawings_png') is not None:
+        pdf.add_page()
+        pdf.linea("Planos técnicos", 'h1', alto=10)
+        pdf.image(_imagen_pdf(data['technical_drawings_png']), w=190)
+
+# --------------------------------------------
+# Valores con los que se completan las plantillas de los fundamentos
+# --------------------------------------------
+def _valores_fundamentos(data):
+    return {**data, 'Q_m3h': data['Q'] * 3600, 'dos_h': 2 * data['h'],
+            'TL_max': float(np.max(data['TL_total']))}
+
+# --------------------------------------------
+# Agrega la sección de fundamentos matemáticos (nueva página)
+# --------------------------------------------
+def seccion_fundamentos(pdf, data):
+    valores = _valores_fundamentos(data)
+    pdf.add_page()
+    pdf.linea(TITULO_FUNDAMENTOS, 'titulo', alto=10, align='C')
+    pdf.ln(5)
+
+    for titulo, subsecciones in FUNDAMENTOS:
+        pdf.linea(titulo, 'h1', alto=9)
+        for subtitulo, formula, ancho, parrafos in subsecciones:
+            pdf.linea(subtitulo, 'h2')
+            pdf.image(io.BytesIO(imagen_formula(formula)), x=(pdf.w - ancho) / 2, w=ancho)
+            for parrafo in parrafos:
+                pdf.linea(parrafo.format(**valores))
+            pdf.ln(2)
+
+    pdf.linea("5. Referencias Bibliográficas", 'h1', alto=9)
+    for referencia in REFERENCIAS:
+        pdf.linea(referencia)
+
+# --------------------------------------------
+# Agrega la tabla comparativa de varios diseños
+# --------------------------------------------
+def seccion_comparacion(pdf, filas, titulo="Comparación de diseños"):
+    pdf.add_page()
+    pdf.linea(titulo, 'titulo', alto=10)
+    pdf.ln(3)
+    pdf.estilo('tabla')
+    with pdf.table(text_align='CENTER', line_height=5) as tabla:
+        encabezado = tabla.row()
+        for nombre, _, _ in COLUMNAS_COMPARACION:
+            encabezado.cell(nombre)
+        for fila in filas:
+            renglon = tabla.row()
+            for _, clave, formato in COLUMNAS_COMPARACION:
+                renglon.cell(formato.format(fila[clave]) if fila.get(clave) is not None else '-')
+
+# --------------------------------------------
+# Fila resumen (solo escalares) de un diseño para la tabla comparativa
+# --------------------------------------------
+def _fila_resumen(data, nombre):
+    fila = {'nombre': nombre, 'TL_max': float(np.max(data['TL_total'])) if 'TL_total' in data else None}
+    if 'Q' in data:
+        fila['Q_m3h'] = _escalar(data, 'Q') * 3600
+    for clave in ('H', 'L', 'width', 'n_baffles', 'v_paso', 'dp_total'):
+        if clave in data:
+            fila[clave] = _escalar(data, clave)
+    return fila
+
+# --------------------------------------------
+# Reporte de un solo diseño
+# --------------------------------------------
+def reporte_diseno(data, salida, secciones=('diseno',)):
+    """
+    secciones puede incluir 'diseno' y 'fundamentos'; salida puede ser una
+    ruta o un objeto tipo archivo
+    """
+    pdf = _Documento()
+    if 'diseno' in secciones:
+        seccion_diseno(pdf, data)
+    if 'fundamentos' in secciones:
+        seccion_fundamentos(pdf, data)
+    return _guardar(pdf, salida)
+
+# --------------------------------------------
+# Reporte comparativo de muchos diseños en un solo PDF
+# --------------------------------------------
+def reporte_comparativo(disenos, salida, titulo="Comparación de diseños"):
+    """
+    disenos es cualquier iterable (puede ser un generador perezoso) de
+    diccionarios como los de reporte_diseno, con una clave opcional 'nombre'.
+    Cada diseño se consume, se escribe en sus páginas y se libera; del diseño
+    solo se conserva su fila resumen, con la que se cierra el documento con
+    la tabla comparativa. Las páginas y las imágenes ya escritas se guardan
+    comprimidas hasta la salida
+    """
+    pdf = _Documento()
+    pdf.set_compression(True)
+    filas = []
+    for i, data in enumerate(disenos, start=1):
+        nombre = data.get('nombre', f"Diseño {i}")
+        seccion_diseno(pdf, data, titulo=f"{nombre} - {TITULO_DISENO}")
+        filas.append(_fila_resumen(data, nombre))
+    seccion_comparacion(pdf, filas, titulo)
+    return _guardar(pdf, salida)
+
+# --------------------------------------------
+# Un PDF por diseño, escritos uno a uno (memoria constante)
+# --------------------------------------------
+def reportes_individuales(disenos, carpeta, patron="reporte_{indice:03d}.pdf", secciones=('diseno',), cache=None):
+    """
+    Generador: consume los diseños de forma perezosa, escribe cada reporte en
+    'carpeta' y devuelve su ruta en cuanto está en disco, de modo que un
+    paquete de licitación con cientos de silenciadores nunca tiene más de un
+    documento en memoria. Con una CacheArtefactos (app.cache) solo se
+    generan los reportes cuyos datos cambiaron; el resto se enlaza desde la caché
+    """
+    os.makedirs(carpeta, exist_ok=True)
+    for indice, data in enumerate(disenos, start=1):
+        ruta = os.path.join(carpeta, patron.format(indice=indice, nombre=data.get('nombre', indice)))
+        if cache is None:
+            yield reporte_diseno(data, ruta, secciones)
+        else:
+            from app.cache import reporte_cache, publicar
+            yield publicar(reporte_cache(cache, data, secciones), ruta)
@@ -3,155 +3,142 @@
 # Generación de planos técnicos con medidas tipo publicación científica
 # --------------------------------------------
 
-import matplotlib.pyplot as plt
+import io
+import os
+import atexit
+from functools import lru_cache
 import matplotlib.patches as patches
-import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from PIL import Image
+from app.simulation.geometria import geometria
+
+DPI = 300
+TAMANO_VISTA = (8, 6)                       # Pulgadas de cada cuadrante de la lámina
+TITULO = 'SILENCIADOR TIPO SPLITTER - PLANOS TÉCNICOS'
+
+# Parámetros de los que depende cada vista (definen su clave en la caché):
+# un cambio de longitud solo redibuja las vistas lateral y superior y la tabla.
+# Todas las vistas dibujan la misma geometria.Geometria del diseño; con una
+# 'disposicion' no uniforme (None si es uniforme) salen de ella espesores y tramos
+VISTAS = {
+    'frontal': ('width', 'height', 'n_baffles', 'baffle_thickness', 'wall_thickness', 'disposicion'),
+    'lateral': ('length', 'height', 'wall_thickness'),
+    'superior': ('length', 'width', 'n_baffles', 'baffle_thickness', 'wall_thickness', 'disposicion'),
+    'tabla': ('length', 'width', 'height', 'n_baffles', 'baffle_thickness', 'wall_thickness', 'disposicion'),
+}
+ORDEN_LAMINA = ('frontal', 'lateral', 'superior', 'tabla')   # Cuadrantes por filas
+
+# --------------------------------------------
+# Cota con flecha doble y texto en rojo
+# --------------------------------------------
+def _cota(ax, inicio, fin, texto_xy, texto, vertical=False, color='red', lw=2, fontsize=10, va='top'):
+    ax.annotate('', xy=inicio, xytext=fin, arrowprops=dict(arrowstyle='<->', color=color, lw=lw))
+    if vertical:
+        ax.text(*texto_xy, texto, ha='right', va='center', fontsize=fontsize, color=color, fontweight='bold', rotation=90)
+    else:
+        ax.text(*texto_xy, texto, ha='center', va=va, fontsize=fontsize, color=color, fontweight='bold')
+
+# ========== VISTA FRONTAL (A) ==========
+def _vista_frontal(ax, geo):
+    ax.set_title('VISTA FRONTAL', fontweight='bold')
+    ax.set_aspect('equal')
+    width, height, wall_thickness = geo.width, geo.height, geo.wall_thickness
+    posiciones = geo.y_baffles
+
+    # Carcasa externa y paredes laterales
+    ax.add_patch(patches.Rectangle((0, 0), width, height, linewidth=2, edgecolor='black', facecolor='lightgray', alpha=0.3))
+    ax.add_patch(patches.Rectangle((0, 0), wall_thickness, height, linewidth=1, edgecolor='black', facecolor='gray'))
+    ax.add_patch(patches.Rectangle((width-wall_thickness, 0), wall_thickness, height, linewidth=1, edgecolor='black', facecolor='gray'))
+
+    # Baffles y medios baffles adosados a las paredes
+    for y1, y2 in (*geo.bordes_baffles(), *geo.bordes_medios()):
+        ax.add_patch(patches.Rectangle((y1, wall_thickness), y2 - y1, height - 2*wall_thickness,
+                                       linewidth=1, edgecolor='blue', facecolor='lightblue', alpha=0.7))
+
+    # Medidas frontales: ancho, altura y ancho de una rendija
+    _cota(ax, (0, -0.05), (width, -0.05), (width/2, -0.08), f'L2 = {width:.3f} m')
+    _cota(ax, (-0.05, 0), (-0.05, height), (-0.08, height/2), f'H = {height:.3f} m', vertical=True)
+    if len(posiciones) > 0:
+        y1, y2 = geo.bordes_rendijas()[1 if len(posiciones) > 1 else 0]
+        _cota(ax, (y1, height+0.02), (y2, height+0.02), ((y1+y2)/2, height+0.04), f'2h = {y2 - y1:.3f} m',
+              color='blue', lw=1.5, fontsize=9, va='bottom')
+
+    ax.set_xlim(-0.15, width+0.05)
+    ax.set_ylim(-0.15, height+0.1)
+    ax.grid(True, alpha=0.3)
+
+# ========== VISTA LATERAL (B) ==========
+def _vista_lateral(ax, geo):
+    ax.set_title('VISTA LATERAL', fontweight='bold')
+    ax.set_aspect('equal')
+    length, height, wall_thickness = geo.length, geo.height, geo.wall_thickness
+
+    # Carcasa lateral y paredes superior e inferior
+    ax.add_patch(patches.Rectangle((0, 0), length, height, linewidth=2, edgecolor='black', facecolor='lightgray', alpha=0.3))
+    ax.add_patch(patches.Rectangle((0, 0), length, wall_thickness, linewidth=1, edgecolor='black', facecolor='gray'))
+    ax.add_patch(patches.Rectangle((0, height-wall_thickness), length, wall_thickness, linewidth=1, edgecolor='black', facecolor='gray'))
+
+    # Medidas laterales: longitud y altura
+    _cota(ax, (0, -0.05), (length, -0.05), (length/2, -0.08), f'L1 = {length:.3f} m')
+    _cota(ax, (-0.05, 0), (-0.05, height), (-0.08, height/2), f'H = {height:.3f} m', vertical=True)
+
+    ax.set_xlim(-0.15, length+0.05)
+    ax.set_ylim(-0.15, height+0.05)
+    ax.grid(True, alpha=0.3)
+
+# ========== VISTA SUPERIOR (C) ==========
+def _vista_superior(ax, geo):
+    ax.set_title('VISTA SUPERIOR', fontweight='bold')
+    ax.set_aspect('equal')
+    length, width, wall_thickness = geo.length, geo.width, geo.wall_thickness
+
+    # Carcasa superior y paredes frontal y trasera
+    ax.add_patch(patches.Rectangle((0, 0), length, width, linewidth=2, edgecolor='black', facecolor='lightgray', alpha=0.3))
+    ax.add_patch(patches.Rectangle((0, 0), wall_thickness, width, linewidth=1, edgecolor='black', facecolor='gray'))
+    ax.add_patch(patches.Rectangle((length-wall_thickness, 0), wall_thickness, width, linewidth=1, edgecolor='black', facecolor='gray'))
+
+    # Baffles vista superior (cada uno en su tramo si están escalonados)
+    centros, tamanos = geo.cajas_baffles()
+    for (x, y, _), (dx, dy, _) in zip(centros, tamanos):
+        ax.add_patch(patches.Rectangle((x - dx/2, y - dy/2), dx, dy,
+                                       linewidth=1, edgecolor='blue', facecolor='lightblue', alpha=0.7))
+
+    # Medidas superiores: longitud y ancho
+    _cota(ax, (0, -0.05), (length, -0.05), (length/2, -0.08), f'L1 = {length:.3f} m')
+    _cota(ax, (-0.05, 0), (-0.05, width), (-0.08, width/2), f'L2 = {width:.3f} m', vertical=True)
+
+    ax.set_xlim(-0.15, length+0.05)
+    ax.set_ylim(-0.15, width+0.05)
+    ax.grid(True, alpha=0.3)
+
+# ========== TABLA DE ESPECIFICACIONES ==========
+def _tabla_especificaciones(ax, geo):
+    ax.set_title('ESPECIFICACIONES TÉCNICAS', fontweight='bold')
+    ax.axis('off')
+    length, height, wall_thickness, disposicion = geo.length, geo.height, geo.wall_thickness, geo.disposicion
 
-def generate_technical_drawings(length, width, height, n_baffles, gap, baffle_thickness, wall_thickness, output_dir):
-    """
-    Genera planos técnicos: vista frontal, lateral y superior con medidas
-    """
-    # Configuración de estilo técnico
-    plt.style.use('default')
-    fig, axes = plt.subplots(2, 2, figsize=(16, 12))
-    fig.suptitle('SILENCIADOR TIPO SPLITTER - PLANOS TÉCNICOS', fontsize=16, fontweight='bold')
-    
-    # Calcular posiciones de baffles
-    interior_width = width - 2 * wall_thickness
-    total_thickness = n_baffles * baffle_thickness + (n_baffles - 1) * gap
-    start_y = wall_thickness + (interior_width - total_thickness) / 2 + baffle_thickness / 2
-    
-    baffle_positions = []
-    for i in range(n_baffles):
-        y = start_y + i * (baffle_thickness + gap)
-        baffle_positions.append(y)
-    
-    # ========== VISTA FRONTAL (A) ==========
-    ax1 = axes[0, 0]
-    ax1.set_title('VISTA FRONTAL', fontweight='bold')
-    ax1.set_aspect('equal')
-    
-    # Carcasa externa
-    rect_outer = patches.Rectangle((0, 0), width, height, linewidth=2, edgecolor='black', facecolor='lightgray', alpha=0.3)
-    ax1.add_patch(rect_outer)
-    
-    # Paredes laterales
-    rect_left = patches.Rectangle((0, 0), wall_thickness, height, linewidth=1, edgecolor='black', facecolor='gray')
-    rect_right = patches.Rectangle((width-wall_thickness, 0), wall_thickness, height, linewidth=1, edgecolor='black', facecolor='gray')
-    ax1.add_patch(rect_left)
-    ax1.add_patch(rect_right)
-    
-    # Baffles
-    for y_pos in baffle_positions:
-        baffle_rect = patches.Rectangle((y_pos - baffle_thickness/2, wall_thickness), 
-                                      baffle_thickness, height - 2*wall_thickness, 
-                                      linewidth=1, edgecolor='blue', facecolor='lightblue', alpha=0.7)
-        ax1.add_patch(baffle_rect)
-    
-    # Medidas frontales
-    # Ancho total
-    ax1.annotate('', xy=(0, -0.05), xytext=(width, -0.05), arrowprops=dict(arrowstyle='<->', color='red', lw=2))
-    ax1.text(width/2, -0.08, f'L2 = {width:.3f} m', ha='center', va='top', fontsize=10, color='red', fontweight='bold')
-    
-    # Altura total
-    ax1.annotate('', xy=(-0.05, 0), xytext=(-0.05, height), arrowprops=dict(arrowstyle='<->', color='red', lw=2))
-    ax1.text(-0.08, height/2, f'H = {height:.3f} m', ha='right', va='center', fontsize=10, color='red', fontweight='bold', rotation=90)
-    
-    # Separación entre baffles
-    if len(baffle_positions) > 1:
-        y1 = baffle_positions[0] + baffle_thickness/2
-        y2 = baffle_positions[1] - baffle_thickness/2
-        ax1.annotate('', xy=(y1, height+0.02), xytext=(y2, height+0.02), arrowprops=dict(arrowstyle='<->', color='blue', lw=1.5))
-        ax1.text((y1+y2)/2, height+0.04, f'2h = {gap:.3f} m', ha='center', va='bottom', fontsize=9, color='blue', fontweight='bold')
-    
-    ax1.set_xlim(-0.15, width+0.05)
-    ax1.set_ylim(-0.15, height+0.1)
-    ax1.grid(True, alpha=0.3)
-    
-    # ========== VISTA LATERAL (B) ==========
-    ax2 = axes[0, 1]
-    ax2.set_title('VISTA LATERAL', fontweight='bold')
-    ax2.set_aspect('equal')
-    
-    # Carcasa lateral
-    rect_lateral = patches.Rectangle((0, 0), length, height, linewidth=2, edgecolor='black', facecolor='lightgray', alpha=0.3)
-    ax2.add_patch(rect_lateral)
-    
-    # Paredes superior e inferior
-    rect_bottom = patches.Rectangle((0, 0), length, wall_thickness, linewidth=1, edgecolor='black', facecolor='gray')
-    rect_top = patches.Rectangle((0, height-wall_thickness), length, wall_thickness, linewidth=1, edgecolor='black', facecolor='gray')
-    ax2.add_patch(rect_bottom)
-    ax2.add_patch(rect_top)
-    
-    # Medidas laterales
-    # Longitud total
-    ax2.annotate('', xy=(0, -0.05), xytext=(length, -0.05), arrowprops=dict(arrowstyle='<->', color='red', lw=2))
-    ax2.text(length/2, -0.08, f'L1 = {length:.3f} m', ha='center', va='top', fontsize=10, color='red', fontweight='bold')
-    
-    # Altura total
-    ax2.annotate('', xy=(-0.05, 0), xytext=(-0.05, height), arrowprops=dict(arrowstyle='<->', color='red', lw=2))
-    ax2.text(-0.08, height/2, f'H = {height:.3f} m', ha='right', va='center', fontsize=10, color='red', fontweight='bold', rotation=90)
-    
-    ax2.set_xlim(-0.15, length+0.05)
-    ax2.set_ylim(-0.15, height+0.05)
-    ax2.grid(True, alpha=0.3)
-    
-    # ========== VISTA SUPERIOR (C) ==========
-    ax3 = axes[1, 0]
-    ax3.set_title('VISTA SUPERIOR', fontweight='bold')
-    ax3.set_aspect('equal')
-    
-    # Carcasa superior
-    rect_top_view = patches.Rectangle((0, 0), length, width, linewidth=2, edgecolor='black', facecolor='lightgray', alpha=0.3)
-    ax3.add_patch(rect_top_view)
-    
-    # Paredes frontal y trasera
-    rect_front = patches.Rectangle((0, 0), wall_thickness, width, linewidth=1, edgecolor='black', facecolor='gray')
-    rect_back = patches.Rectangle((length-wall_thickness, 0), wall_thickness, width, linewidth=1, edgecolor='black', facecolor='gray')
-    ax3.add_patch(rect_front)
-    ax3.add_patch(rect_back)
-    
-    # Baffles vista superior
-    for y_pos in baffle_positions:
-        baffle_top = patches.Rectangle((wall_thickness, y_pos - baffle_thickness/2), 
-                                     length - 2*wall_thickness, baffle_thickness, 
-                                     linewidth=1, edgecolor='blue', facecolor='lightblue', alpha=0.7)
-        ax3.add_patch(baffle_top)
-    
-    # Medidas superiores
-    ax3.annotate('', xy=(0, -0.05), xytext=(length, -0.05), arrowprops=dict(arrowstyle='<->', color='red', lw=2))
-    ax3.text(length/2, -0.08, f'L1 = {length:.3f} m', ha='center', va='top', fontsize=10, color='red', fontweight='bold')
-    
-    ax3.annotate('', xy=(-0.05, 0), xytext=(-0.05, width), arrowprops=dict(arrowstyle='<->', color='red', lw=2))
-    ax3.text(-0.08, width/2, f'L2 = {width:.3f} m', ha='right', va='center', fontsize=10, color='red', fontweight='bold', rotation=90)
-    
-    ax3.set_xlim(-0.15, length+0.05)
-    ax3.set_ylim(-0.15, width+0.05)
-    ax3.grid(True, alpha=0.3)
-    
-    # ========== TABLA DE ESPECIFICACIONES ==========
-    ax4 = axes[1, 1]
-    ax4.set_title('ESPECIFICACIONES TÉCNICAS', fontweight='bold')
-    ax4.axis('off')
-    
-    # Crear tabla de especificaciones
     specs = [
         ['PARÁMETRO', 'VALOR', 'UNIDAD'],
         ['Longitud total (L1)', f'{length:.3f}', 'm'],
-        ['Ancho total (L2)', f'{width:.3f}', 'm'],
+        ['Ancho total (L2)', f'{geo.width:.3f}', 'm'],
         ['Altura total (H)', f'{height:.3f}', 'm'],
-        ['Número de baffles', f'{n_baffles}', 'unid'],
-        ['Espesor de baffle', f'{baffle_thickness:.3f}', 'm'],
-        ['Separación (2h)', f'{gap:.3f}', 'm'],
+        ['Número de baffles', f'{geo.n_baffles}', 'unid'],
+        ['Espesor de baffle', _rango(geo.espesores_baffles), 'm'],
+        ['Separación (2h)', _rango(geo.anchos_rendijas), 'm'],
         ['Espesor de pared', f'{wall_thickness:.3f}', 'm'],
-        ['Rendijas', f'{n_baffles + 1}', 'unid']
+        ['Rendijas', f'{geo.n_rendijas}', 'unid']
     ]
-    
-    table = ax4.table(cellText=specs[1:], colLabels=specs[0], loc='center', cellLoc='center')
+    if any(geo.medios_baffles):
+        specs.append(['Medios baffles (izq./der.)', ' / '.join(f'{m:.3f}' for m in geo.medios_baffles), 'm'])
+    if disposicion is not None and (disposicion.inicio_baffles or disposicion.fin_baffles):
+        specs.append(['Tramo de baffle', _rango(geo.x_baffles[:, 1] - geo.x_baffles[:, 0]), 'm'])
+
+    table = ax.table(cellText=specs[1:], colLabels=specs[0], loc='center', cellLoc='center')
     table.auto_set_font_size(False)
     table.set_fontsize(10)
     table.scale(1, 2)
-    
+
     # Estilo de la tabla
     for i in range(len(specs)):
         for j in range(len(specs[0])):
@@ -161,12 +148,151 @@ def generate_technical_drawings(length, width, height, n_baffles, gap, baffle_th
                 cell.set_text_props(weight='bold', color='white')
             else:
                 cell.set_facecolor('#F2F2F2' if i % 2 == 0 else 'white')
-    
-    plt.tight_layout()
-    
-    # Guardar planos técnicos
-    output_path = f"{output_dir}/planos_tecnicos.png"
-    plt.savefig(output_path, dpi=300, bbox_inches='tight')
-    plt.close()
-    
-    return output_path
\ No newline at end of file
+
+# --------------------------------------------
+# Valor único o rango mín.–máx. (disposiciones no uniformes)
+# --------------------------------------------
+def _rango(valores):
+    if len(valores) == 0:
+        return '-'
+    minimo, maximo = min(valores), max(valores)
+    return f'{minimo:.3f}' if round(minimo, 3) == round(maximo, 3) else f'{minimo:.3f} – {maximo:.3f}'
+
+DIBUJOS = {'frontal': _vista_frontal, 'lateral': _vista_lateral,
+           'superior': _vista_superior, 'tabla': _tabla_especificaciones}
+
+# --------------------------------------------
+# Figura Agg independiente (sin pyplot: segura en hilos y procesos)
+# --------------------------------------------
+def _figura_png(figsize, dpi, dibujar):
+    fig = Figure(figsize=figsize, dpi=dpi)
+    canvas = FigureCanvasAgg(fig)
+    dibujar(fig)
+    canvas.draw()
+    imagen = Image.frombuffer('RGBA', canvas.get_width_height(), canvas.buffer_rgba()).convert('RGB')
+    buffer = io.BytesIO()
+    imagen.save(buffer, format='png', compress_level=1)
+    return buffer.getvalue()
+
+# --------------------------------------------
+# Renderiza una vista a bytes PNG (también en procesos trabajadores)
+# --------------------------------------------
+def render_vista(nombre, geo, dpi=DPI):
+    """geo es la geometria.Geometria del diseño, común a todas las vistas"""
+    def dibujar(fig):
+        ax = fig.add_subplot(111)
+        DIBUJOS[nombre](ax, geo)
+        fig.tight_layout()
+    return _figura_png(TAMANO_VISTA, dpi, dibujar)
+
+def _render_trabajo(trabajo):
+    return render_vista(*trabajo)
+
+# --------------------------------------------
+# Franja con el título de la lámina (no depende del diseño)
+# --------------------------------------------
+@lru_cache(maxsize=4)
+def _titulo_png(ancho_px, dpi):
+    def dibujar(fig):
+        fig.text(0.5, 0.5, TITULO, ha='center', va='center', fontsize=16, fontweight='bold')
+    return _figura_png((ancho_px / dpi, 0.6), dpi, dibujar)
+
+# --------------------------------------------
+# Pool de procesos reutilizado entre exportaciones
+# --------------------------------------------
+_ejecutor = None
+_n_procesos_ejecutor = None
+
+def _pool(n_procesos):
+    """Se recrea si cambia n_procesos; se cierra al salir del intérprete"""
+    global _ejecutor, _n_procesos_ejecutor
+    if _ejecutor is not None and _n_procesos_ejecutor != n_procesos:
+        _cerrar_pool()
+    if _ejecutor is None:
+        from concurrent.futures import ProcessPoolExecutor
+        if _n_procesos_ejecutor is None:
+            atexit.register(_cerrar_pool)
+        _ejecutor = ProcessPoolExecutor(max_workers=n_procesos)
+        _n_procesos_ejecutor = n_procesos
+    return _ejecutor
+
+def _cerrar_pool():
+    global _ejecutor
+    if _ejecutor is not None:
+        _ejecutor.shutdown()
+        _ejecutor = None
+
+# --------------------------------------------
+# Renderiza las vistas que falten (en paralelo si hay más de una)
+# --------------------------------------------
+def _render_vistas(geo, parametros, dpi, cache, n_procesos):
+    pendientes = list(ORDEN_LAMINA)
+    vistas = {}
+    if cache is not None:
+        # Solo se consultan las entradas ya existentes; las que falten se
+        # generan abajo (quizá en paralelo) y se guardan en la caché
+        for nombre in ORDEN_LAMINA:
+            ruta = cache.existente('vista', _clave_vista(nombre, parametros, dpi), f"{nombre}.png")
+            if ruta is not None:
+                with open(ruta, 'rb') as f:
+                    vistas[nombre] = f.read()
+        pendientes = [nombre for nombre in ORDEN_LAMINA if nombre not in vistas]
+
+    trabajos = [(nombre, geo, dpi) for nombre in pendientes]
+    if n_procesos is None:
+        n_procesos = min(len(VISTAS), os.cpu_count() or 1)
+    if n_procesos == 1 or len(trabajos) < 2:
+        nuevas = [_render_trabajo(t) for t in trabajos]
+    else:
+        nuevas = list(_pool(n_procesos).map(_render_trabajo, trabajos))
+
+    for nombre, png in zip(pendientes, nuevas):
+        vistas[nombre] = png
+        if cache is not None:
+            cache.guardar_bytes('vista', _clave_vista(nombre, parametros, dpi), f"{nombre}.png", png)
+    return vistas
+
+def _clave_vista(nombre, parametros, dpi):
+    return (nombre, dpi, *(parametros[clave] for clave in VISTAS[nombre]))
+
+# --------------------------------------------
+# Compone las cuatro vistas y el título en una lámina
+# --------------------------------------------
+def _componer(vistas, dpi):
+    imagenes = [Image.open(io.BytesIO(vistas[nombre])) for nombre in ORDEN_LAMINA]
+    ancho, alto = imagenes[0].size
+    titulo = Image.open(io.BytesIO(_titulo_png(2 * ancho, dpi)))
+    lamina = Image.new('RGB', (2 * ancho, titulo.height + 2 * alto), 'white')
+    lamina.paste(titulo, (0, 0))
+    for i, imagen in enumerate(imagenes):
+        lamina.paste(imagen, ((i % 2) * ancho, titulo.height + (i // 2) * alto))
+    return lamina
+
+def generate_technical_drawings(length, width, height, n_baffles, baffle_thickness, wall_thickness, output_dir,
+                                cache=None, n_procesos=None, dpi=DPI, disposicion=None):
+    """
+    Genera planos técnicos: vista frontal, lateral y superior con medidas.
+    Si output_dir es None devuelve los bytes PNG en lugar de escribir a disco.
+    Cada vista se dibuja en su propia figura (en procesos trabajadores si hay
+    más de un núcleo y n_procesos no es 1) y se compone en la lámina final. Con una
+    CacheArtefactos cada vista se guarda por separado según solo los
+    parámetros que dibuja (ver VISTAS). La geometría se calcula una vez y
+    la comparten las tres vistas y la tabla. Con una geometria.Disposicion
+    el ancho y el número de baffles salen de ella
+    """
+    if disposicion is not None:
+        width, n_baffles = disposicion.ancho_total(wall_thickness), disposicion.n_baffles
+    parametros = {'length': length, 'width': width, 'height': height, 'n_baffles': int(n_baffles),
+                  'baffle_thickness': baffle_thickness, 'wall_thickness': wall_thickness, 'disposicion': disposicion}
+    geo = geometria(length, width, height, n_baffles, baffle_thickness, wall_thickness, disposicion)
+    lamina = _componer(_render_vistas(geo, parametros, dpi, cache, n_procesos), dpi)
+
+    # Guardar planos técnicos (en disco o en memoria)
+    buffer = io.BytesIO()
+    lamina.save(buffer, format='png', compress_level=1, dpi=(dpi, dpi))
+    if output_dir is None:
+        return buffer.getvalue()
+    output_path = os.path.join(output_dir, "planos_tecnicos.png")
+    with open(output_path, 'wb') as f:
+        f.write(buffer.getvalue())
+    return output_path
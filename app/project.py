@@ -0,0 +1,161 @@
+# --------------------------------------------
+# project.py
+# Archivos de proyecto binarios: entradas, resultados, comparación e imágenes
+# --------------------------------------------
+
+import json
+from datetime import datetime
+import numpy as np
+from app.simulation.comparison import ComparacionDisenos
+from app.simulation.resultados import ResultadoDiseno
+
+EXTENSION = ".asiss"
+VERSION_FORMATO = 1
+
+# Claves del diseño que son imágenes en caché (se cargan solo cuando se piden)
+CLAVES_RENDER = ('graph_png', 'model_image', 'technical_drawings_png')
+
+# --------------------------------------------
+# Convierte escalares numpy a tipos JSON
+# --------------------------------------------
+def _json_escalar(valor):
+    return valor.item() if isinstance(valor, np.generic) else valor
+
+# --------------------------------------------
+# Guarda un proyecto en un contenedor npz (sin comprimir) con cabecera JSON
+# --------------------------------------------
+def guardar_proyecto(ruta, entradas, data=None, comparacion=None):
+    """
+    entradas son los valores de la GUI (Q_m3h, V, H, L, material, muestras
+    Monte Carlo, material personalizado, color de baffles). De data (el
+    diccionario de MainApp.simular) los escalares van a la cabecera y los
+    arreglos e imágenes a entradas separadas del npz: 'diseno/…',
+    'incertidumbre/…', 'render/…' (PNG como bytes o arreglos RGB) y
+    'comparacion/…'. La cabecera es la primera entrada del archivo
+    """
+    metadatos = {'version': VERSION_FORMATO, 'creado': datetime.now().isoformat(timespec='seconds'),
+                 'entradas': entradas, 'diseno': None, 'incertidumbre': None, 'comparacion': None}
+    arreglos = {}
+
+    if data:
+        escalares, nulos, renders = {}, [], {}
+        for clave, valor in data.items():
+            if clave == 'incertidumbre':
+                continue
+            if valor is None:
+                nulos.append(clave)
+            elif isinstance(valor, (bytes, bytearray, memoryview)):
+                arreglos[f'render/{clave}'] = np.frombuffer(valor, dtype=np.uint8)
+                renders[clave] = 'bytes'
+            elif isinstance(valor, np.ndarray):
+                prefijo = 'render' if clave in CLAVES_RENDER else 'diseno'
+                arreglos[f'{prefijo}/{clave}'] = valor
+                if prefijo == 'render':
+                    renders[clave] = 'arreglo'
+            else:
+                escalares[clave] = _json_escalar(valor)
+        metadatos['diseno'] = {'escalares': escalares, 'nulos': nulos, 'renders': renders}
+
+        incertidumbre = data.get('incertidumbre')
+        if incertidumbre is not None:
+            metadatos['incertidumbre'] = {'n_muestras': int(incertidumbre['n_muestras']),
+                                          'percentiles': [int(q) for q in incertidumbre['percentiles']]}
+            for clave in ('freq', 'media', 'varianza', 'desviacion'):
+                arreglos[f'incertidumbre/{clave}'] = incertidumbre[clave]
+            for q, valores in incertidumbre['percentiles'].items():
+                arreglos[f'incertidumbre/p{q}'] = valores
+
+    if comparacion is not None and len(comparacion):
+        metadatos['comparacion'] = {'nombres': comparacion.nombres, 'materiales': comparacion.materiales}
+        for clave, valor in comparacion.arreglos().items():
+            arreglos[f'comparacion/{clave}'] = valor
+
+    cabecera = np.frombuffer(json.dumps(metadatos, ensure_ascii=False).encode('utf-8'), dtype=np.uint8)
+    with open(ruta, 'wb') as f:
+        np.savez(f, __metadatos__=cabecera, **arreglos)
+    return ruta
+
+# --------------------------------------------
+# Proyecto abierto: cabecera leída, arreglos bajo demanda
+# --------------------------------------------
+class Proyecto:
+    """
+    np.load sobre un npz no lee ninguna entrada hasta que se accede a ella,
+    así que abrir un proyecto solo lee la cabecera JSON. Las curvas se leen
+    al reconstruir el diseño y las imágenes en caché solo con render()
+    """
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self._npz = np.load(ruta, allow_pickle=False)
+        self.metadatos = json.loads(self._npz['__metadatos__'].tobytes().decode('utf-8'))
+        if self.metadatos.get('version', 0) > VERSION_FORMATO:
+            raise ValueError(f"El proyecto usa un formato más nuevo ({self.metadatos['version']})")
+
+    @property
+    def entradas(self):
+        return self.metadatos['entradas']
+
+    def cerrar(self):
+        self._npz.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    # --------------------------------------------
+    # Reconstruye el diseño (sin imágenes)
+    # --------------------------------------------
+    def datos(self):
+        """
+        Devuelve el ResultadoDiseno equivalente al de MainApp.simular (o {}
+        si el proyecto no tiene diseño); las imágenes quedan en None y se
+        obtienen con render()
+        """
+        diseno = self.metadatos['diseno']
+        if diseno is None:
+            return {}
+        data = dict(diseno['escalares'])
+        data.update({clave: None for clave in diseno['nulos']})
+        data.update({clave: None for clave in diseno['renders']})
+        for nombre in self._npz.files:
+            if nombre.startswith('diseno/'):
+                data[nombre[len('diseno/'):]] = self._npz[nombre]
+
+        info = self.metadatos['incertidumbre']
+        data['incertidumbre'] = None if info is None else {
+            'n_muestras': info['n_muestras'],
+            **{clave: self._npz[f'incertidumbre/{clave}'] for clave in ('freq', 'media', 'varianza', 'desviacion')},
+            'percentiles': {q: self._npz[f'incertidumbre/p{q}'] for q in info['percentiles']},
+        }
+        return ResultadoDiseno(data)
+
+    # --------------------------------------------
+    # Imagen en caché guardada con el proyecto (o None)
+    # --------------------------------------------
+    def render(self, clave):
+        diseno = self.metadatos['diseno'] or {'renders': {}}
+        tipo = diseno['renders'].get(clave)
+        if tipo is None:
+            return None
+        valor = self._npz[f'render/{clave}']
+        return valor.tobytes() if tipo == 'bytes' else valor
+
+    # --------------------------------------------
+    # Comparación de diseños fijados (o una vacía)
+    # --------------------------------------------
+    def comparacion(self):
+        info = self.metadatos['comparacion']
+        if info is None:
+            return ComparacionDisenos()
+        arreglos = {nombre[len('comparacion/'):]: self._npz[nombre]
+                    for nombre in self._npz.files if nombre.startswith('comparacion/')}
+        return ComparacionDisenos.desde_arreglos(arreglos, info['nombres'], info['materiales'])
+
+# --------------------------------------------
+# Abre un proyecto guardado con guardar_proyecto
+# --------------------------------------------
+def abrir_proyecto(ruta):
+    return Proyecto(ruta)
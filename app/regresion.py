@@ -0,0 +1,270 @@
+# --------------------------------------------
+# regresion.py
+# Resultados de referencia (golden) con tolerancias numéricas y presupuestos de tiempo y memoria
+# --------------------------------------------
+
+"""
+Uso:
+
+    python -m app.regresion                  # compara con las referencias guardadas
+    python -m app.regresion --casos lana100  # solo los casos cuyo nombre contiene el texto
+    python -m app.regresion --actualizar     # regenera las referencias (tras un cambio intencional)
+
+Cada caso evalúa una de las funciones cubiertas (calcular_parametros,
+calcular_parametros_custom, SplitterSilencer, calcular_atenuacion) y compara
+todos sus arreglos con los de REFERENCIAS en una sola operación vectorizada
+por campo. Además mide el mejor tiempo de 'repeticiones' ejecuciones y el
+pico de memoria (tracemalloc) y falla si supera su presupuesto. Una
+reescritura por rendimiento se adopta si este comando sigue terminando en 0.
+"""
+
+import os
+import sys
+import time
+import argparse
+import tracemalloc
+from typing import NamedTuple
+import numpy as np
+
+REFERENCIAS = os.path.join(os.path.dirname(__file__), 'simulation', 'referencias_regresion.npz')
+
+# Tolerancia (relativa, absoluta) por defecto y por campo. El error
+# permitido es atol + rtol·|referencia| elemento a elemento
+TOLERANCIA = (1e-9, 1e-12)
+TOLERANCIAS_CAMPO = {
+    # n_espacios y n_baffles son enteros: deben coincidir exactamente
+    'n_espacios': (0.0, 0.0),
+    'n_baffles': (0.0, 0.0),
+}
+
+# --------------------------------------------
+# Caso de regresión
+# --------------------------------------------
+class Caso(NamedTuple):
+    nombre: str
+    funcion: str            # Clave de EVALUADORES
+    entradas: dict
+    tiempo_ms: float        # Presupuesto del mejor tiempo de ejecución [ms]
+    memoria_mb: float       # Presupuesto del pico de memoria asignada [MB]
+    repeticiones: int = 5
+
+# Los presupuestos dejan un margen de ~10x sobre lo medido en un núcleo
+# (0.03-0.5 ms por diseño suelto, 160 ms y 140 MB el lote de 20000): detectan
+# una regresión de orden de magnitud sin fallar por ruido de la máquina.
+# En equipos más lentos se escalan con --factor-presupuesto
+# Diseños de referencia: el ejemplo de la consola original, los extremos del
+# rango habitual y bandas de frecuencia distintas a 100-500 Hz
+DISENOS = {
+    'base': dict(Q_m3h=10000, V=12, H=0.3, L=1.7),
+    'chico': dict(Q_m3h=1000, V=4, H=0.2, L=0.5),
+    'grande': dict(Q_m3h=50000, V=20, H=1.2, L=3.0),
+    'banda_ancha': dict(Q_m3h=20000, V=8, H=0.6, L=2.2, fmin=63, fmax=1000),
+}
+MATERIALES = ('lana50', 'lana70', 'lana100')
+CUSTOM = dict(custom_freqs=[63, 125, 250, 500, 1000, 2000], custom_alphas=[0.08, 0.22, 0.55, 0.85, 0.95, 0.97])
+
+CASOS = (
+    [Caso(f'parametros/{d}/{m}', 'calcular_parametros', {**DISENOS[d], 'material': m}, 1.0, 0.25)
+     for d in DISENOS for m in MATERIALES]
+    + [Caso(f'parametros/{d}/espesores', 'calcular_parametros',
+            {**DISENOS[d], 'baffle_thickness': 0.05, 'wall_thickness': 0.002}, 1.0, 0.25) for d in ('base', 'grande')]
+    + [Caso(f'custom/{d}', 'calcular_parametros_custom',
+            {**DISENOS[d], 'fmin': DISENOS[d].get('fmin', 100), 'fmax': DISENOS[d].get('fmax', 500), **CUSTOM}, 1.0, 0.25)
+       for d in DISENOS]
+    + [Caso(f'splitter/{d}/{m}', 'splitter', {**DISENOS[d], 'material': m}, 2.0, 0.25)
+       for d in DISENOS for m in MATERIALES]
+    + [Caso('splitter/lote_20000', 'splitter_lote', {'n_disenos': 20000, 'semilla': 0, 'paso': 97}, 800.0, 200.0, 3)]
+    + [Caso(f'atenuacion/{d}/{m}', 'calcular_atenuacion', {**DISENOS[d], 'material': m}, 5.0, 0.25)
+       for d in DISENOS for m in MATERIALES]
+)
+
+# --------------------------------------------
+# Evaluadores: entradas -> {campo: arreglo}
+# --------------------------------------------
+def _campos_numericos(params):
+    """Campos numéricos de un ParametrosDiseno (material es texto y no se compara)"""
+    return {campo: np.asarray(valor, dtype=float) for campo, valor in params.items()
+            if campo != 'material' and valor is not None}
+
+def _parametros(entradas):
+    from app.simulation.solver import calcular_parametros
+    return calcular_parametros(**entradas)
+
+def _evaluar_parametros(entradas):
+    return _campos_numericos(_parametros(entradas))
+
+def _evaluar_custom(entradas):
+    from app.simulation.solver import calcular_parametros_custom
+    return _campos_numericos(calcular_parametros_custom(**entradas))
+
+def _evaluar_splitter(entradas):
+    from app.simulation.models import SplitterSilencer
+    params = _parametros(entradas)
+    splitter = SplitterSilencer(params['L'], params['width'], params['n_baffles'], params['alpha_interp'])
+    freq = params['freq']
+    return {'TL': splitter.transmission_loss(freq), 'delta_L': splitter.delta_L(freq),
+            'TL_total': splitter.total_attenuation(freq), 'splitter_width': np.asarray(splitter.splitter_width)}
+
+def _evaluar_splitter_lote(entradas):
+    """Barrido vectorizado; se guarda un diseño de cada 'paso' para que la referencia sea pequeña"""
+    from app.simulation.solver import calcular_parametros_lote
+    from app.simulation.models import SplitterSilencer
+    rng = np.random.default_rng(entradas['semilla'])
+    n = entradas['n_disenos']
+    geo = calcular_parametros_lote(rng.uniform(1000, 50000, n), rng.uniform(4, 20, n),
+                                   rng.uniform(0.2, 1.2, n), rng.uniform(0.5, 3.0, n))
+    splitter = SplitterSilencer(geo['L'][:, None], geo['width'][:, None], geo['n_baffles'][:, None], geo['alpha_interp'])
+    muestra = slice(None, None, entradas['paso'])
+    return {'TL_total': splitter.total_attenuation(geo['freq'])[muestra],
+            'width': geo['width'][muestra], 'n_baffles': geo['n_baffles'][muestra], 'dp_total': geo['dp_total'][muestra]}
+
+def _evaluar_atenuacion(entradas):
+    from app.simulation.acoustics import calcular_atenuacion
+    TL, delta_L, TL_total = calcular_atenuacion(_parametros(entradas))
+    return {'TL': TL, 'delta_L': delta_L, 'TL_total': TL_total}
+
+EVALUADORES = {
+    'calcular_parametros': _evaluar_parametros,
+    'calcular_parametros_custom': _evaluar_custom,
+    'splitter': _evaluar_splitter,
+    'splitter_lote': _evaluar_splitter_lote,
+    'calcular_atenuacion': _evaluar_atenuacion,
+}
+
+# --------------------------------------------
+# Ejecución medida de un caso
+# --------------------------------------------
+def medir(caso):
+    """(resultado, mejor tiempo [ms], pico de memoria [MB])"""
+    evaluar = EVALUADORES[caso.funcion]
+    tiempos = []
+    for _ in range(max(caso.repeticiones, 1)):
+        inicio = time.perf_counter()
+        evaluar(caso.entradas)
+        tiempos.append((time.perf_counter() - inicio) * 1e3)
+
+    # La memoria se mide aparte: tracemalloc hace más lenta la ejecución
+    tracemalloc.start()
+    try:
+        resultado = evaluar(caso.entradas)
+        pico = tracemalloc.get_traced_memory()[1] / 1024 ** 2
+    finally:
+        tracemalloc.stop()
+    return resultado, min(tiempos), pico
+
+# --------------------------------------------
+# Comparación vectorizada con la referencia
+# --------------------------------------------
+def comparar(resultado, referencia):
+    """
+    Devuelve una lista de fallos (texto) y el error relativo máximo. Un
+    campo falla si cambia de forma, si falta o sobra, o si algún elemento
+    sale de atol + rtol·|ref| (NaN solo coincide con NaN)
+    """
+    fallos = []
+    error_maximo = 0.0
+    for campo in sorted(resultado.keys() | referencia.keys()):
+        if campo not in referencia or campo not in resultado:
+            fallos.append(f"{campo}: {'no está en la referencia' if campo not in referencia else 'falta en el resultado'}")
+            continue
+        valor, esperado = np.asarray(resultado[campo], dtype=float), np.asarray(referencia[campo], dtype=float)
+        if valor.shape != esperado.shape:
+            fallos.append(f"{campo}: forma {valor.shape} != {esperado.shape}")
+            continue
+        rtol, atol = TOLERANCIAS_CAMPO.get(campo, TOLERANCIA)
+        iguales = np.isclose(valor, esperado, rtol=rtol, atol=atol, equal_nan=True)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            relativo = np.abs(valor - esperado) / np.maximum(np.abs(esperado), np.finfo(float).tiny)
+        relativo = relativo[np.isfinite(relativo)]
+        if relativo.size:
+            error_maximo = max(error_maximo, float(relativo.max()))
+        if not iguales.all():
+            peor = np.unravel_index(np.argmax(np.where(iguales, -np.inf, np.abs(valor - esperado))), valor.shape)
+            fallos.append(f"{campo}: {np.count_nonzero(~iguales)}/{iguales.size} fuera de tolerancia "
+                          f"(p. ej. [{', '.join(map(str, peor))}] = {float(valor[peor])!r}, referencia {float(esperado[peor])!r})")
+    return fallos, error_maximo
+
+# --------------------------------------------
+# Referencias en disco (un .npz con claves 'caso:campo')
+# --------------------------------------------
+def cargar_referencias(ruta=REFERENCIAS):
+    referencias = {}
+    with np.load(ruta) as datos:
+        for clave in datos.files:
+            caso, campo = clave.rsplit(':', 1)
+            referencias.setdefault(caso, {})[campo] = datos[clave]
+    return referencias
+
+def actualizar_referencias(ruta=REFERENCIAS, casos=CASOS):
+    """
+    Evalúa los casos con el código actual y los guarda como referencia; las
+    referencias de los demás casos que ya estaban en 'ruta' se conservan
+    """
+    nombres = {caso.nombre for caso in casos}
+    anteriores = cargar_referencias(ruta) if os.path.exists(ruta) else {}
+    arreglos = {f"{nombre}:{campo}": valor for nombre, campos in anteriores.items() if nombre not in nombres
+                for campo, valor in campos.items()}
+    arreglos.update({f"{caso.nombre}:{campo}": np.asarray(valor)
+                     for caso in casos for campo, valor in EVALUADORES[caso.funcion](caso.entradas).items()})
+    np.savez_compressed(ruta, **arreglos)
+    return ruta
+
+# --------------------------------------------
+# Ejecuta los casos y devuelve una fila por caso
+# --------------------------------------------
+def comprobar(casos=CASOS, ruta=REFERENCIAS, factor_presupuesto=1.0, presupuestos=True):
+    """
+    Cada fila lleva 'caso', 'ok', 'fallos', 'error_relativo', 'tiempo_ms',
+    'memoria_mb' y los presupuestos. factor_presupuesto escala los
+    presupuestos (p. ej. 3 en una máquina lenta)
+    """
+    referencias = cargar_referencias(ruta)
+    filas = []
+    for caso in casos:
+        resultado, tiempo, memoria = medir(caso)
+        if caso.nombre in referencias:
+            fallos, error = comparar(resultado, referencias[caso.nombre])
+        else:
+            fallos, error = ["sin referencia (ejecute con --actualizar)"], float('nan')
+        limite_tiempo, limite_memoria = caso.tiempo_ms * factor_presupuesto, caso.memoria_mb * factor_presupuesto
+        if presupuestos and tiempo > limite_tiempo:
+            fallos.append(f"tiempo {tiempo:.3g} ms > presupuesto {limite_tiempo:.3g} ms")
+        if presupuestos and memoria > limite_memoria:
+            fallos.append(f"memoria {memoria:.3g} MB > presupuesto {limite_memoria:.3g} MB")
+        filas.append({'caso': caso.nombre, 'ok': not fallos, 'fallos': fallos, 'error_relativo': error,
+                      'tiempo_ms': tiempo, 'presupuesto_ms': limite_tiempo,
+                      'memoria_mb': memoria, 'presupuesto_mb': limite_memoria})
+    return filas
+
+# --------------------------------------------
+# Punto de entrada
+# --------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m app.regresion',
+                                     description="Compara las funciones de cálculo con los resultados de referencia.")
+    parser.add_argument('--actualizar', action='store_true', help="regenera las referencias con el código actual")
+    parser.add_argument('--casos', default='', help="solo los casos cuyo nombre contiene este texto")
+    parser.add_argument('--referencias', default=REFERENCIAS, help="archivo .npz de referencias")
+    parser.add_argument('--factor-presupuesto', type=float, default=1.0,
+                        help="multiplica los presupuestos de tiempo y memoria")
+    parser.add_argument('--sin-presupuestos', action='store_true', help="solo compara resultados")
+    args = parser.parse_args(argv)
+
+    casos = [caso for caso in CASOS if args.casos in caso.nombre]
+    if args.actualizar:
+        print(f"Referencias de {len(casos)} casos guardadas en {actualizar_referencias(args.referencias, casos)}")
+        return 0
+
+    filas = comprobar(casos, args.referencias, args.factor_presupuesto, not args.sin_presupuestos)
+    for fila in filas:
+        print(f"{'OK   ' if fila['ok'] else 'FALLA'} {fila['caso']:<32} err {fila['error_relativo']:.1e}  "
+              f"{fila['tiempo_ms']:8.2f}/{fila['presupuesto_ms']:g} ms  "
+              f"{fila['memoria_mb']:7.2f}/{fila['presupuesto_mb']:g} MB")
+        for fallo in fila['fallos']:
+            print(f"      {fallo}")
+    fallidos = sum(not fila['ok'] for fila in filas)
+    print(f"{len(filas) - fallidos}/{len(filas)} casos correctos")
+    return 1 if fallidos else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -8,15 +8,22 @@
 # --------------------------------------------
 
 import numpy as np
+from app.simulation.precision import tipo_complejo
 
 # --------------------------------------------
 # Calcula el número de onda complejo para cada frecuencia y absorción
 # --------------------------------------------
-def wavenumber_complex(freq, alpha):
+def wavenumber_complex(freq, alpha, dtype=None):
+    """dtype complex128 por defecto o complex64 (ver precision.py)"""
     c = 343  # Velocidad del sonido en aire [m/s]
-    omega = 2 * np.pi * freq
-    # Número de onda complejo considerando la absorción
-    return omega / c - 1j * alpha
+    complejo = tipo_complejo(dtype)
+    real = np.dtype(f'f{complejo.itemsize // 2}')
+    omega = 2 * np.pi * np.asarray(freq, dtype=real)
+    # Número de onda complejo considerando la absorción, armado sin pasar por complex128
+    k = np.empty(np.broadcast_shapes(np.shape(omega), np.shape(alpha)), dtype=complejo)
+    k.real = omega / c
+    k.imag = -np.asarray(alpha, dtype=real)
+    return k
 
 # --------------------------------------------
 # Calcula la atenuación adicional empírica
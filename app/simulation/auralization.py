@@ -0,0 +1,225 @@
+# --------------------------------------------
+# auralization.py
+# Auralización: filtra grabaciones WAV con la respuesta del silenciador
+# --------------------------------------------
+
+# --------------------------------------------
+# Importar librerías necesarias
+# --------------------------------------------
+
+import struct
+import numpy as np
+
+FORMATO_PCM = 1
+FORMATO_FLOAT = 3
+FORMATO_EXTENSIBLE = 0xFFFE
+MAX_RIFF = 0xFFFFFFFF  # Tamaño máximo de un bloque RIFF; por encima se usa RF64 (EBU Tech 3306)
+
+# --------------------------------------------
+# FIR de fase lineal a partir de la curva de atenuación
+# --------------------------------------------
+def respuesta_silenciador(freq, TL_total, fs, n_taps=4097):
+    """
+    Diseño por muestreo en frecuencia: la ganancia 10^(-TL/20) se interpola
+    sobre la malla de la FFT (fuera del rango simulado se mantiene la
+    atenuación del extremo más cercano), se pasa al tiempo con fase cero, se
+    centra y se aplica una ventana de Hann. n_taps impar da un retardo
+    entero de (n_taps - 1) / 2 muestras
+    """
+    n_fft = 1 << int(np.ceil(np.log2(4 * n_taps)))
+    f_fft = np.fft.rfftfreq(n_fft, 1 / fs)
+    ganancia = 10 ** (-np.interp(f_fft, freq, TL_total) / 20)
+
+    h = np.fft.irfft(ganancia, n_fft)
+    h = np.roll(h, n_taps // 2)[:n_taps]
+    return h * np.hanning(n_taps)
+
+# --------------------------------------------
+# Lector de WAV sobre un arreglo mapeado en memoria
+# --------------------------------------------
+class LectorWav:
+    """
+    Lee la cabecera RIFF (o RF64) y mapea el bloque de datos con np.memmap:
+    ningún dato de audio se carga hasta que se pide un bloque. Admite PCM de
+    8, 16, 24 y 32 bits y coma flotante de 32 y 64 bits (también
+    WAVE_FORMAT_EXTENSIBLE)
+    """
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        with open(ruta, 'rb') as f:
+            riff, _, wave = struct.unpack('<4sI4s', f.read(12))
+            if riff not in (b'RIFF', b'RF64') or wave != b'WAVE':
+                raise ValueError(f"{ruta} no es un archivo WAV (RIFF/WAVE)")
+            formato = None
+            tamano_datos_64 = None
+            while True:
+                cabecera = f.read(8)
+                if len(cabecera) < 8:
+                    raise ValueError(f"{ruta} no tiene bloque de datos")
+                id_bloque, tamano = struct.unpack('<4sI', cabecera)
+                if id_bloque == b'ds64':
+                    # RF64: tamaños de 64 bits (RIFF, datos, muestras)
+                    _, tamano_datos_64, _ = struct.unpack('<QQQ', f.read(24))
+                    f.seek(tamano - 24 + tamano % 2, 1)
+                elif id_bloque == b'fmt ':
+                    fmt = f.read(tamano)
+                    formato, self.canales, self.fs, _, self.alineacion, self.bits = struct.unpack('<HHIIHH', fmt[:16])
+                    if formato == FORMATO_EXTENSIBLE:
+                        formato = struct.unpack('<H', fmt[24:26])[0]
+                    f.seek(tamano % 2, 1)
+                elif id_bloque == b'data':
+                    if tamano == MAX_RIFF and tamano_datos_64 is not None:
+                        tamano = tamano_datos_64
+                    self._offset = f.tell()
+                    self.n_muestras = tamano // self.alineacion
+                    break
+                else:
+                    f.seek(tamano + tamano % 2, 1)
+        if formato is None:
+            raise ValueError(f"{ruta} no tiene bloque 'fmt '")
+
+        ancho = self.bits // 8
+        if formato == FORMATO_FLOAT and self.bits in (32, 64):
+            dtype, forma = np.dtype(f'<f{ancho}'), (self.n_muestras, self.canales)
+        elif formato == FORMATO_PCM and self.bits in (8, 16, 32):
+            dtype, forma = np.dtype('u1' if self.bits == 8 else f'<i{ancho}'), (self.n_muestras, self.canales)
+        elif formato == FORMATO_PCM and self.bits == 24:
+            dtype, forma = np.dtype('u1'), (self.n_muestras, self.canales, 3)
+        else:
+            raise ValueError(f"Formato WAV no soportado: {formato} con {self.bits} bits")
+        self.formato = formato
+        self._datos = np.memmap(ruta, dtype=dtype, mode='r', offset=self._offset, shape=forma)
+
+    @property
+    def duracion(self):
+        return self.n_muestras / self.fs
+
+    # --------------------------------------------
+    # Convierte un tramo del mapa a float64 en [-1, 1)
+    # --------------------------------------------
+    def leer(self, inicio, fin):
+        x = self._datos[inicio:fin]
+        if self.formato == FORMATO_FLOAT:
+            return x.astype(np.float64)
+        if self.bits == 8:
+            return (x.astype(np.float64) - 128) / 128
+        if self.bits == 24:
+            enteros = x[..., 0].astype(np.int32) | (x[..., 1].astype(np.int32) << 8) | (x[..., 2].astype(np.int32) << 16)
+            enteros = np.where(enteros >= 1 << 23, enteros - (1 << 24), enteros)
+            return enteros / float(1 << 23)
+        return x / float(1 << (self.bits - 1))
+
+    def bloques(self, tam_bloque):
+        for inicio in range(0, self.n_muestras, tam_bloque):
+            yield self.leer(inicio, inicio + tam_bloque)
+
+# --------------------------------------------
+# Escritor de WAV por bloques (PCM 16 bits o coma flotante 32 bits)
+# --------------------------------------------
+class EscritorWav:
+    """
+    Escribe la cabecera al abrir y corrige los tamaños al cerrar. La cabecera
+    reserva un bloque JUNK del tamaño de 'ds64': si los datos superan los
+    4 GiB del formato RIFF, al cerrar el archivo pasa a RF64 sin mover el audio
+    """
+
+    def __init__(self, ruta, fs, canales, bits=16):
+        if bits not in (16, 32):
+            raise ValueError("bits debe ser 16 (PCM) o 32 (coma flotante)")
+        self.fs, self.canales, self.bits = fs, canales, bits
+        self.n_muestras = 0
+        self._f = open(ruta, 'wb')
+        self._escribir_cabecera()
+
+    def _escribir_cabecera(self):
+        alineacion = self.canales * self.bits // 8
+        tamano_datos = self.n_muestras * alineacion
+        tamano_riff = 72 + tamano_datos  # 4 (WAVE) + 36 (JUNK/ds64) + 24 (fmt) + 8 (data) + datos
+        formato = FORMATO_PCM if self.bits == 16 else FORMATO_FLOAT
+        if tamano_riff <= MAX_RIFF:
+            self._f.write(struct.pack('<4sI4s', b'RIFF', tamano_riff, b'WAVE'))
+            self._f.write(struct.pack('<4sI28x', b'JUNK', 28))
+        else:
+            self._f.write(struct.pack('<4sI4s', b'RF64', MAX_RIFF, b'WAVE'))
+            self._f.write(struct.pack('<4sIQQQI', b'ds64', 28, tamano_riff, tamano_datos, self.n_muestras, 0))
+        self._f.write(struct.pack('<4sIHHIIHH', b'fmt ', 16, formato, self.canales, self.fs,
+                                  self.fs * alineacion, alineacion, self.bits))
+        self._f.write(struct.pack('<4sI', b'data', min(tamano_datos, MAX_RIFF)))
+
+    def escribir(self, bloque):
+        if self.bits == 16:
+            datos = np.clip(np.round(bloque * 32768), -32768, 32767).astype('<i2')
+        else:
+            datos = bloque.astype('<f4')
+        self._f.write(datos.tobytes())
+        self.n_muestras += len(bloque)
+
+    def cerrar(self):
+        self._f.seek(0)
+        self._escribir_cabecera()
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+# --------------------------------------------
+# Convolución por bloques con FFT (overlap-add)
+# --------------------------------------------
+def filtrar_bloques(bloques, h, tam_bloque):
+    """
+    bloques es un iterable de arreglos (b, canales) con b == tam_bloque
+    salvo el último. Devuelve un generador de bloques filtrados del mismo
+    tamaño, ya sin el retardo de grupo del FIR, y al final vacía la cola;
+    la salida tiene exactamente tantas muestras como la entrada. La memoria
+    es constante: un bloque, su FFT y la cola de len(h) - 1 muestras
+    """
+    n_taps = len(h)
+    n_fft = 1 << int(np.ceil(np.log2(tam_bloque + n_taps - 1)))
+    H = np.fft.rfft(h, n_fft)[:, None]
+    retardo = (n_taps - 1) // 2
+
+    cola = None
+    pendiente = retardo        # Muestras iniciales que se descartan (retardo)
+    restantes = 0              # Muestras de entrada aún no emitidas
+    for x in bloques:
+        y = np.fft.irfft(np.fft.rfft(x, n_fft, axis=0) * H, n_fft, axis=0)[:len(x) + n_taps - 1]
+        if cola is None:
+            cola = np.zeros((n_taps - 1, x.shape[1]))
+        y[:n_taps - 1] += cola
+        cola = y[len(x):].copy()
+        salida = y[:len(x)]
+        restantes += len(x)
+
+        if pendiente:
+            descartar = min(pendiente, len(salida))
+            salida = salida[descartar:]
+            pendiente -= descartar
+        restantes -= len(salida)
+        if len(salida):
+            yield salida
+
+    # Últimas muestras: salen de la cola del filtro
+    if cola is not None and restantes:
+        yield cola[pendiente:pendiente + restantes]
+
+# --------------------------------------------
+# Aplica la atenuación del silenciador a una grabación WAV
+# --------------------------------------------
+def auralizar(entrada, salida, freq, TL_total, n_taps=4097, tam_bloque=1 << 16, bits=16):
+    """
+    Lee 'entrada' mapeada en memoria, la filtra con el FIR de
+    respuesta_silenciador en bloques de tam_bloque muestras (todos los
+    canales a la vez) y escribe 'salida' con la misma frecuencia de
+    muestreo y número de canales. Devuelve un resumen de la grabación
+    """
+    lector = LectorWav(entrada)
+    h = respuesta_silenciador(freq, TL_total, lector.fs, n_taps)
+    with EscritorWav(salida, lector.fs, lector.canales, bits) as escritor:
+        for bloque in filtrar_bloques(lector.bloques(tam_bloque), h, tam_bloque):
+            escritor.escribir(bloque)
+    return {'fs': lector.fs, 'canales': lector.canales, 'muestras': lector.n_muestras,
+            'duracion': lector.duracion, 'salida': salida}
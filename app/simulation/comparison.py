@@ -0,0 +1,194 @@
+# --------------------------------------------
+# comparison.py
+# Espacio de comparación: varios diseños fijados en arreglos compactos
+# --------------------------------------------
+
+# --------------------------------------------
+# Importar librerías necesarias
+# --------------------------------------------
+
+import numpy as np
+from app.simulation.solver import calcular_parametros_lote, FREQS_MATERIAL, ALPHAS_MATERIALES
+from app.simulation.models import SplitterSilencer
+from app.simulation.sensitivity import promedio_por_banda, BANDAS_OCTAVA
+
+# Magnitudes escalares que se guardan de cada diseño (columnas de la tabla)
+CAMPOS_ESCALARES = ('Q_m3h', 'V', 'H', 'L', 'width', 'n_baffles', 'v_paso', 'dp_total', 'TL_max')
+CURVAS = ('TL', 'delta_L', 'TL_total')
+
+# --------------------------------------------
+# Promedio por banda ignorando los NaN (curvas fuera de su rango de frecuencias)
+# --------------------------------------------
+def _promedio_banda_valido(freq, valores):
+    validos = ~np.isnan(valores)
+    suma = promedio_por_banda(freq, np.where(validos, valores, 0))
+    fraccion = promedio_por_banda(freq, validos.astype(float))
+    return np.where(fraccion > 0, suma / np.where(fraccion > 0, fraccion, 1), np.nan)
+
+# --------------------------------------------
+# Conjunto de diseños fijados sobre una malla de frecuencias común
+# --------------------------------------------
+class ComparacionDisenos:
+    """
+    Cada curva se guarda como una fila de una matriz (capacidad, n_freq) que
+    crece por duplicación, y cada magnitud escalar como un arreglo de
+    longitud 'capacidad'. Al fijar un diseño solo se calcula ese diseño;
+    los ya fijados no se vuelven a evaluar. Las curvas con otra malla de
+    frecuencias (material personalizado) se interpolan a la malla común y
+    quedan en NaN fuera de su rango
+    """
+
+    def __init__(self, fmin=100, fmax=500, n_freq=300, capacidad=16):
+        self.freq = np.linspace(fmin, fmax, n_freq)
+        self.n = 0
+        self.nombres = []
+        self.materiales = []
+        self._curvas = {nombre: np.empty((capacidad, n_freq)) for nombre in CURVAS}
+        self._bandas = np.empty((capacidad, len(BANDAS_OCTAVA)))
+        self._escalares = {campo: np.empty(capacidad) for campo in CAMPOS_ESCALARES}
+
+    def __len__(self):
+        return self.n
+
+    # --------------------------------------------
+    # Vistas de los diseños fijados (sin copiar)
+    # --------------------------------------------
+    def curva(self, nombre):
+        return self._curvas[nombre][:self.n]
+
+    @property
+    def bandas(self):
+        """TL_total promedio por banda de octava (n, n_bandas)"""
+        return self._bandas[:self.n]
+
+    def escalar(self, campo):
+        return self._escalares[campo][:self.n]
+
+    # --------------------------------------------
+    # Reserva espacio para 'extra' diseños más
+    # --------------------------------------------
+    def _reservar(self, extra):
+        capacidad = len(self._bandas)
+        if self.n + extra <= capacidad:
+            return
+        nueva = max(2 * capacidad, self.n + extra)
+        for nombre, arreglo in self._curvas.items():
+            self._curvas[nombre] = np.resize(arreglo, (nueva, arreglo.shape[1]))
+        self._bandas = np.resize(self._bandas, (nueva, self._bandas.shape[1]))
+        for campo, arreglo in self._escalares.items():
+            self._escalares[campo] = np.resize(arreglo, nueva)
+
+    # --------------------------------------------
+    # Fija diseños ya calculados (curvas (k, n_freq) sobre 'freq')
+    # --------------------------------------------
+    def _agregar(self, freq, TL, delta_L, escalares, nombres, materiales):
+        TL, delta_L = np.atleast_2d(TL), np.atleast_2d(delta_L)
+        k = TL.shape[0]
+        self._reservar(k)
+        s = slice(self.n, self.n + k)
+
+        if len(freq) == len(self.freq) and np.allclose(freq, self.freq):
+            self._curvas['TL'][s] = TL
+            self._curvas['delta_L'][s] = delta_L
+        else:
+            for nombre, curvas in (('TL', TL), ('delta_L', delta_L)):
+                self._curvas[nombre][s] = [np.interp(self.freq, freq, c, left=np.nan, right=np.nan) for c in curvas]
+        TL_total = self._curvas['TL'][s] + self._curvas['delta_L'][s]
+        self._curvas['TL_total'][s] = TL_total
+        self._bandas[s] = _promedio_banda_valido(self.freq, TL_total)
+
+        escalares = {**escalares, 'TL_max': np.nanmax(TL_total, axis=1)}
+        for campo in CAMPOS_ESCALARES:
+            self._escalares[campo][s] = escalares[campo]
+        self.nombres.extend(nombres)
+        self.materiales.extend(materiales)
+        self.n += k
+        return list(range(s.start, s.stop))
+
+    # --------------------------------------------
+    # Fija el diseño simulado actual (resultado de calcular_parametros + curvas)
+    # --------------------------------------------
+    def fijar(self, data, nombre=None):
+        """
+        data es el diccionario de MainApp.simular (parámetros, TL y delta_L).
+        Devuelve el índice del diseño fijado
+        """
+        Q_m3h = data['Q'] * 3600
+        escalares = {'Q_m3h': Q_m3h, 'V': data['Q'] / data['S'], 'H': data['H'], 'L': data['L'],
+                     'width': data['width'], 'n_baffles': data['n_baffles'],
+                     'v_paso': data['v_paso'], 'dp_total': data['dp_total']}
+        if nombre is None:
+            nombre = f"D{self.n + 1}: V={escalares['V']:.1f} H={data['H']:.2f} L={data['L']:.2f}"
+        return self._agregar(data['freq'], data['TL'], data['delta_L'], escalares,
+                             [nombre], [data['material']])[0]
+
+    # --------------------------------------------
+    # Calcula y fija un lote de diseños en una sola evaluación vectorizada
+    # --------------------------------------------
+    def fijar_lote(self, Q_m3h, V, H, L, material='lana100', nombres=None):
+        """
+        Q_m3h, V, H y L escalares o arreglos (N,); con todos escalares se fija
+        un solo diseño. Devuelve los índices de los diseños fijados
+        """
+        geo = calcular_parametros_lote(Q_m3h, V, H, L, self.freq[0], self.freq[-1], material)
+        alpha = np.interp(self.freq, FREQS_MATERIAL, ALPHAS_MATERIALES[material])
+        splitter = SplitterSilencer(geo['L'][:, None], geo['width'][:, None], geo['n_baffles'][:, None], alpha)
+        TL = splitter.transmission_loss(self.freq)
+        delta_L = np.broadcast_to(splitter.delta_L(self.freq), TL.shape)
+
+        V = geo['Q'] / geo['S']
+        escalares = {'Q_m3h': geo['Q'] * 3600, 'V': V, 'H': geo['H'], 'L': geo['L'],
+                     'width': geo['width'], 'n_baffles': geo['n_baffles'],
+                     'v_paso': geo['v_paso'], 'dp_total': geo['dp_total']}
+        k = len(geo['L'])
+        if nombres is None:
+            nombres = [f"D{self.n + i + 1}: V={V[i]:.1f} H={geo['H'][i]:.2f} L={geo['L'][i]:.2f}" for i in range(k)]
+        return self._agregar(self.freq, TL, delta_L, escalares, nombres, [material] * k)
+
+    # --------------------------------------------
+    # Quita los diseños indicados (compacta los arreglos)
+    # --------------------------------------------
+    def quitar(self, indices):
+        conservar = np.setdiff1d(np.arange(self.n), indices)
+        m = len(conservar)
+        for arreglo in (*self._curvas.values(), self._bandas, *self._escalares.values()):
+            arreglo[:m] = arreglo[conservar]
+        self.nombres = [self.nombres[i] for i in conservar]
+        self.materiales = [self.materiales[i] for i in conservar]
+        self.n = m
+
+    def limpiar(self):
+        self.quitar(np.arange(self.n))
+
+    # --------------------------------------------
+    # Arreglos compactos para guardar en un proyecto y reconstrucción
+    # --------------------------------------------
+    def arreglos(self):
+        """Diccionario plano de arreglos (solo los n diseños fijados)"""
+        return {'freq': self.freq, 'bandas': self.bandas,
+                **{nombre: self.curva(nombre) for nombre in CURVAS},
+                **{campo: self.escalar(campo) for campo in CAMPOS_ESCALARES}}
+
+    @classmethod
+    def desde_arreglos(cls, arreglos, nombres, materiales):
+        """Reconstruye la comparación sin recalcular ningún diseño"""
+        freq = np.asarray(arreglos['freq'])
+        comparacion = cls(freq[0], freq[-1], len(freq), capacidad=max(len(nombres), 1))
+        comparacion.freq = freq
+        n = len(nombres)
+        for nombre in CURVAS:
+            comparacion._curvas[nombre][:n] = arreglos[nombre]
+        comparacion._bandas[:n] = arreglos['bandas']
+        for campo in CAMPOS_ESCALARES:
+            comparacion._escalares[campo][:n] = arreglos[campo]
+        comparacion.nombres = list(nombres)
+        comparacion.materiales = list(materiales)
+        comparacion.n = n
+        return comparacion
+
+    # --------------------------------------------
+    # Segmentos (n, n_freq, 2) para una LineCollection
+    # --------------------------------------------
+    def segmentos(self, curva='TL_total'):
+        Y = self.curva(curva)
+        return np.stack([np.broadcast_to(self.freq, Y.shape), Y], axis=-1)
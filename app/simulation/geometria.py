@@ -0,0 +1,246 @@
+# --------------------------------------------
+# geometria.py
+# Geometría única del silenciador: carcasa, paredes, baffles y rendijas (un diseño o un lote)
+# --------------------------------------------
+
+# --------------------------------------------
+# Importar librerías necesarias
+# --------------------------------------------
+
+from functools import lru_cache
+from typing import NamedTuple
+import numpy as np
+
+# Sistema de coordenadas común a la acústica, el modelo 3D y los planos:
+# x a lo largo del flujo (0..length), y a lo ancho (0..width), z en altura (0..height).
+# A lo ancho: pared | rendija | baffle | rendija | ... | baffle | rendija | pared
+
+# --------------------------------------------
+# Ancho interior y total a partir de las rendijas (vectorizado)
+# --------------------------------------------
+def ancho_envolvente(n_espacios, ancho_rendija, baffle_thickness=0.02, wall_thickness=0.005):
+    """
+    n_espacios rendijas de ancho_rendija separadas por n_espacios - 1
+    baffles. Devuelve (ancho interior, ancho total) [m]
+    """
+    interior = (n_espacios - 1) * baffle_thickness + n_espacios * ancho_rendija
+    return interior, interior + 2 * wall_thickness
+
+# --------------------------------------------
+# Ancho de rendija que cabe en un ancho total dado (inversa de ancho_envolvente)
+# --------------------------------------------
+def ancho_rendija(width, n_baffles, baffle_thickness=0.02, wall_thickness=0.005):
+    return (width - 2 * wall_thickness - n_baffles * baffle_thickness) / (n_baffles + 1)
+
+# --------------------------------------------
+# Disposición de baffles y rendijas (uniforme, irregular o escalonada)
+# --------------------------------------------
+class Disposicion(NamedTuple):
+    """
+    Descripción inmutable (y hashable) de la disposición a lo ancho y a lo
+    largo, independiente de la longitud y la altura del silenciador:
+      - anchos_rendijas (n_baffles + 1) y espesores_baffles (n_baffles) [m]
+      - medios_baffles: espesor del medio baffle adosado a cada pared
+        lateral (izquierda, derecha) [m]; 0 es pared desnuda
+      - inicio_baffles / fin_baffles: tramo que ocupa cada baffle como
+        fracción de la longitud (vacío = toda la longitud); con tramos
+        alternados los baffles quedan escalonados
+      - materiales / materiales_medios: material del revestimiento de cada
+        baffle y de cada medio baffle (vacío o None = material del diseño).
+        Una pared con material pero sin espesor es una pared revestida
+    Usar crear_disposicion, Disposicion.uniforme o escalonar para construirla
+    """
+    anchos_rendijas: tuple
+    espesores_baffles: tuple
+    medios_baffles: tuple = (0.0, 0.0)
+    inicio_baffles: tuple = ()
+    fin_baffles: tuple = ()
+    materiales: tuple = ()
+    materiales_medios: tuple = (None, None)
+
+    @classmethod
+    def uniforme(cls, width, n_baffles, baffle_thickness=0.02, wall_thickness=0.005):
+        """La disposición que supone calcular_parametros"""
+        n_baffles = int(n_baffles)
+        rendija = float(ancho_rendija(width, n_baffles, baffle_thickness, wall_thickness))
+        return cls((rendija,) * (n_baffles + 1), (float(baffle_thickness),) * n_baffles)
+
+    @property
+    def n_baffles(self):
+        return len(self.espesores_baffles)
+
+    @property
+    def es_uniforme(self):
+        return (len(set(self.anchos_rendijas)) <= 1 and len(set(self.espesores_baffles)) <= 1
+                and not any(self.medios_baffles) and not self.inicio_baffles and not self.fin_baffles)
+
+    def tramos(self):
+        """(inicio, fin) de cada baffle como fracción de la longitud, arreglos (n_baffles,)"""
+        inicio = np.asarray(self.inicio_baffles or (0.0,) * self.n_baffles, dtype=float)
+        fin = np.asarray(self.fin_baffles or (1.0,) * self.n_baffles, dtype=float)
+        return inicio, fin
+
+    def material(self, i, defecto):
+        return (self.materiales[i] if self.materiales else None) or defecto
+
+    def ancho_total(self, wall_thickness=0.005):
+        return sum(self.anchos_rendijas) + sum(self.espesores_baffles) + sum(self.medios_baffles) + 2 * wall_thickness
+
+def crear_disposicion(anchos_rendijas, espesores_baffles, medios_baffles=(0.0, 0.0), inicio_baffles=None,
+                      fin_baffles=None, materiales=None, materiales_medios=(None, None)):
+    """
+    Valida y normaliza una disposición. espesores_baffles puede ser un
+    escalar (el mismo para todos); anchos_rendijas define el número de baffles
+    """
+    anchos = tuple(float(a) for a in np.atleast_1d(anchos_rendijas))
+    n_baffles = len(anchos) - 1
+    espesores = tuple(float(t) for t in np.broadcast_to(np.asarray(espesores_baffles, dtype=float), (n_baffles,)))
+    if n_baffles < 0 or min(anchos) <= 0 or (espesores and min(espesores) <= 0):
+        raise ValueError("Se necesita al menos una rendija y todos los anchos y espesores deben ser positivos")
+
+    tramos = []
+    for valores, defecto in ((inicio_baffles, 0.0), (fin_baffles, 1.0)):
+        tramos.append(() if valores is None else
+                      tuple(float(v) for v in np.broadcast_to(np.asarray(valores, dtype=float), (n_baffles,))))
+    inicio, fin = (np.asarray(t or (d,) * n_baffles) for t, d in zip(tramos, (0.0, 1.0)))
+    if np.any(inicio < 0) or np.any(fin > 1) or np.any(fin <= inicio):
+        raise ValueError("Los tramos de los baffles deben cumplir 0 <= inicio < fin <= 1")
+
+    materiales = () if materiales is None else tuple(materiales)
+    if materiales and len(materiales) != n_baffles:
+        raise ValueError(f"Se esperaban {n_baffles} materiales de baffle, no {len(materiales)}")
+    medios = tuple(float(m) for m in medios_baffles)
+    return Disposicion(anchos, espesores, medios, *tramos, materiales, tuple(materiales_medios))
+
+# --------------------------------------------
+# Baffles escalonados: tramos alternados a lo largo del silenciador
+# --------------------------------------------
+def escalonar(disposicion, fraccion=0.6):
+    """
+    Los baffles pares ocupan la primera 'fraccion' de la longitud y los
+    impares la última (con fraccion > 0.5 se solapan en el centro)
+    """
+    if not 0 < fraccion <= 1:
+        raise ValueError("fraccion debe estar en (0, 1]")
+    pares = np.arange(disposicion.n_baffles) % 2 == 0
+    inicio = tuple(float(v) for v in np.where(pares, 0.0, 1 - fraccion))
+    fin = tuple(float(v) for v in np.where(pares, fraccion, 1.0))
+    return disposicion._replace(inicio_baffles=inicio, fin_baffles=fin)
+
+# --------------------------------------------
+# Geometría de un diseño
+# --------------------------------------------
+class Geometria:
+    """
+    Coordenadas de todas las piezas de un diseño con cualquier
+    Disposicion. Los arreglos son de solo lectura porque la instancia se
+    comparte desde la caché de geometria()
+    """
+    __slots__ = ('length', 'width', 'height', 'wall_thickness', 'disposicion', 'interior_width',
+                 'anchos_rendijas', 'espesores_baffles', 'medios_baffles', 'y_baffles', 'y_rendijas', 'x_baffles')
+
+    def __init__(self, length, height, disposicion, wall_thickness=0.005):
+        self.length, self.height, self.wall_thickness = length, height, wall_thickness
+        self.disposicion = disposicion
+        self.anchos_rendijas = np.asarray(disposicion.anchos_rendijas, dtype=float)
+        self.espesores_baffles = np.asarray(disposicion.espesores_baffles, dtype=float)
+        self.medios_baffles = np.asarray(disposicion.medios_baffles, dtype=float)
+        self.width = disposicion.ancho_total(wall_thickness)
+        self.interior_width = self.width - 2 * wall_thickness
+
+        # Bordes a lo ancho: rendija, baffle, rendija, ... intercalados desde el medio baffle izquierdo
+        n = len(self.espesores_baffles)
+        tramos = np.empty(2 * n + 1)
+        tramos[0::2], tramos[1::2] = self.anchos_rendijas, self.espesores_baffles
+        bordes = wall_thickness + self.medios_baffles[0] + np.concatenate([[0.0], np.cumsum(tramos)])
+        self.y_rendijas = (bordes[0:-1:2] + bordes[1::2]) / 2
+        self.y_baffles = (bordes[1:-1:2] + bordes[2:-1:2]) / 2
+
+        # Tramo de cada baffle a lo largo (dentro de las paredes de entrada y salida)
+        interior = length - 2 * wall_thickness
+        inicio, fin = disposicion.tramos()
+        self.x_baffles = np.column_stack([wall_thickness + inicio * interior, wall_thickness + fin * interior])
+
+        for arreglo in (self.anchos_rendijas, self.espesores_baffles, self.medios_baffles,
+                        self.y_rendijas, self.y_baffles, self.x_baffles):
+            arreglo.flags.writeable = False
+
+    @property
+    def n_baffles(self):
+        return len(self.espesores_baffles)
+
+    @property
+    def n_rendijas(self):
+        return len(self.anchos_rendijas)
+
+    @property
+    def ancho_rendija(self):
+        """Ancho de rendija de una disposición uniforme (el medio si no lo es)"""
+        return float(self.anchos_rendijas.mean())
+
+    # --------------------------------------------
+    # Cajas alineadas con los ejes (centros y tamaños (N, 3))
+    # --------------------------------------------
+    def cajas_carcasa(self):
+        """Seis paredes: entrada, salida, laterales, techo y piso"""
+        L, W, H, t = self.length, self.width, self.height, self.wall_thickness
+        centros = np.array([
+            (t / 2, W / 2, H / 2), (L - t / 2, W / 2, H / 2),
+            (L / 2, t / 2, H / 2), (L / 2, W - t / 2, H / 2),
+            (L / 2, W / 2, H - t / 2), (L / 2, W / 2, t / 2),
+        ])
+        tamanos = np.array([
+            (t, W, H), (t, W, H),
+            (L, t, H), (L, t, H),
+            (L, W, t), (L, W, t),
+        ])
+        return centros, tamanos
+
+    def cajas_baffles(self):
+        """Baffles y, si los hay, medios baffles adosados a las paredes"""
+        n, t = self.n_baffles, self.wall_thickness
+        centros = np.column_stack([self.x_baffles.mean(axis=1), self.y_baffles, np.full(n, self.height / 2)])
+        tamanos = np.column_stack([np.diff(self.x_baffles, axis=1)[:, 0], self.espesores_baffles,
+                                   np.full(n, self.height - 2 * t)])
+        medios = self.bordes_medios()
+        if len(medios):
+            centros = np.vstack([centros, np.column_stack([np.full(len(medios), self.length / 2), medios.mean(axis=1),
+                                                           np.full(len(medios), self.height / 2)])])
+            tamanos = np.vstack([tamanos, np.column_stack([np.full(len(medios), self.length - 2 * t),
+                                                           np.diff(medios, axis=1)[:, 0],
+                                                           np.full(len(medios), self.height - 2 * t)])])
+        return centros, tamanos
+
+    # --------------------------------------------
+    # Bordes a lo ancho de cada pieza (N, 2)
+    # --------------------------------------------
+    def bordes_baffles(self):
+        return np.column_stack([self.y_baffles - self.espesores_baffles / 2, self.y_baffles + self.espesores_baffles / 2])
+
+    def bordes_rendijas(self):
+        return np.column_stack([self.y_rendijas - self.anchos_rendijas / 2, self.y_rendijas + self.anchos_rendijas / 2])
+
+    def bordes_medios(self):
+        """Medios baffles con espesor (0, 1 o 2 filas)"""
+        t, (izq, der) = self.wall_thickness, self.medios_baffles
+        bordes = [(t, t + izq)] if izq > 0 else []
+        if der > 0:
+            bordes.append((self.width - t - der, self.width - t))
+        return np.array(bordes).reshape(-1, 2)
+
+# --------------------------------------------
+# Geometría de un diseño, calculada una sola vez por combinación de entradas
+# --------------------------------------------
+@lru_cache(maxsize=256)
+def _geometria(length, height, disposicion, wall_thickness):
+    return Geometria(length, height, disposicion, wall_thickness)
+
+def geometria(length, width, height, n_baffles, baffle_thickness=0.02, wall_thickness=0.005, disposicion=None):
+    """
+    Geometria en caché: la 3D, los planos y la malla exportada comparten la
+    misma instancia. Sin 'disposicion' se usa la uniforme de width,
+    n_baffles y baffle_thickness; con ella esos tres se ignoran
+    """
+    if disposicion is None:
+        disposicion = Disposicion.uniforme(width, n_baffles, baffle_thickness, wall_thickness)
+    return _geometria(float(length), float(height), disposicion, float(wall_thickness))
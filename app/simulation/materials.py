@@ -0,0 +1,99 @@
+# --------------------------------------------
+# materials.py
+# Modelos empíricos de materiales porosos (Delany–Bazley / Miki)
+# --------------------------------------------
+
+# --------------------------------------------
+# Importar librerías necesarias
+# --------------------------------------------
+
+import numpy as np
+
+RHO0 = 1.21  # Densidad del aire [kg/m³]
+C0 = 343     # Velocidad del sonido en aire [m/s]
+
+# Coeficientes (a, b, c, d, e, f, g, h) de cada modelo empírico:
+#   Zc = ρ0·c0·(1 + a·X^-b - j·c·X^-d)
+#   kc = ω/c0·(1 + e·X^-f - j·g·X^-h)      con X = s·f/σ
+# Delany–Bazley ajusta sobre X = ρ0·f/σ y Miki (1990) sobre X = f/σ, así
+# que la escala s de cada modelo está en ESCALA_FRECUENCIA
+COEFICIENTES_MODELOS = {
+    'delany_bazley': (0.0571, 0.754, 0.087, 0.732, 0.0978, 0.700, 0.189, 0.595),
+    'miki': (0.0699, 0.632, 0.1071, 0.632, 0.1093, 0.618, 0.1597, 0.618),
+}
+ESCALA_FRECUENCIA = {
+    'delany_bazley': RHO0,
+    'miki': 1.0,
+}
+
+# --------------------------------------------
+# Impedancia característica y número de onda del material poroso
+# --------------------------------------------
+def propiedades_poroso(freq, sigma, modelo='delany_bazley'):
+    """
+    Calcula la impedancia característica Zc [Pa·s/m] y el número de onda
+    complejo kc [1/m] de un material poroso a partir de su resistividad
+    al flujo sigma [Pa·s/m²]. freq y sigma se combinan por broadcasting.
+    """
+    if modelo not in COEFICIENTES_MODELOS:
+        raise ValueError(f"Modelo de material desconocido: {modelo}")
+    a, b, c, d, e, f, g, h = COEFICIENTES_MODELOS[modelo]
+
+    freq = np.asarray(freq, dtype=float)
+    X = ESCALA_FRECUENCIA[modelo] * freq / np.asarray(sigma, dtype=float)
+    omega = 2 * np.pi * freq
+
+    Zc = RHO0 * C0 * (1 + a * X ** -b - 1j * c * X ** -d)
+    kc = omega / C0 * (1 + e * X ** -f - 1j * g * X ** -h)
+    return Zc, kc
+
+# --------------------------------------------
+# Impedancia superficial de una capa sobre fondo rígido
+# --------------------------------------------
+def impedancia_superficial(freq, sigma, espesor, modelo='delany_bazley'):
+    """
+    Impedancia superficial Zs = -j·Zc·cot(kc·d) de una capa porosa de
+    espesor d [m] montada sobre una superficie rígida (baffle).
+    """
+    Zc, kc = propiedades_poroso(freq, sigma, modelo)
+    return -1j * Zc / np.tan(kc * np.asarray(espesor, dtype=float))
+
+# --------------------------------------------
+# Coeficiente de absorción de la capa porosa
+# --------------------------------------------
+def absorcion_poroso(freq, sigma, espesor, modelo='delany_bazley', incidencia='difusa', n_angulos=45):
+    """
+    Coeficiente de absorción de una capa porosa sobre fondo rígido.
+    incidencia='normal' usa la reflexión a 0°, incidencia='difusa' integra
+    la absorción de reacción local sobre ángulos (fórmula de Paris), que es
+    como se tabulan los valores de catálogo de 'alphas_dict'.
+    """
+    Zs = impedancia_superficial(freq, sigma, espesor, modelo) / (RHO0 * C0)
+
+    if incidencia == 'normal':
+        R = (Zs - 1) / (Zs + 1)
+        return 1 - np.abs(R) ** 2
+    if incidencia != 'difusa':
+        raise ValueError(f"Tipo de incidencia desconocido: {incidencia}")
+
+    # Integración por punto medio de α(θ)·sin(2θ) entre 0 y 90°
+    theta = (np.arange(n_angulos) + 0.5) * (np.pi / 2) / n_angulos
+    cos_t = np.cos(theta).reshape(theta.shape + (1,) * Zs.ndim)
+    peso = (np.sin(2 * theta) * (np.pi / 2) / n_angulos).reshape(cos_t.shape)
+    R = (Zs * cos_t - 1) / (Zs * cos_t + 1)
+    return np.sum((1 - np.abs(R) ** 2) * peso, axis=0)
+
+# --------------------------------------------
+# Barrido de absorción sobre la malla resistividad × espesor × frecuencia
+# --------------------------------------------
+def barrido_absorcion(freq, sigmas, espesores, modelo='delany_bazley', incidencia='difusa'):
+    """
+    Devuelve un arreglo (n_sigmas, n_espesores, n_freq) con el coeficiente
+    de absorción de cada especificación de recubrimiento. El resultado puede
+    pasarse directamente como 'absorption' a SplitterSilencer.
+    """
+    freq = np.asarray(freq, dtype=float)
+    sigmas = np.asarray(sigmas, dtype=float).reshape(-1, 1, 1)
+    espesores = np.asarray(espesores, dtype=float).reshape(1, -1, 1)
+    alpha = absorcion_poroso(freq[None, None, :], sigmas, espesores, modelo, incidencia)
+    return np.clip(alpha, 0.0, 1.0)
@@ -12,7 +12,8 @@
 # --------------------------------------------
 
 import numpy as np
-from app.simulation.acoustics import wavenumber_complex, delta_L_additional
+from app.simulation.acoustics import delta_L_additional
+from app.simulation.precision import tipo_real
 
 # --------------------------------------------
 # Clase para el modelo físico del silenciador tipo splitter
@@ -21,45 +22,49 @@ class SplitterSilencer:
     # --------------------------------------------
     # Inicializa el modelo con dimensiones y absorción
     # --------------------------------------------
-    def __init__(self, length, width, n_splitters, absorption):
+    def __init__(self, length, width, n_splitters, absorption, dtype=None):
         self.length = length  # Longitud del silenciador [m]
         self.width = width    # Ancho total del silenciador [m]
         self.n_splitters = n_splitters  # Número de baffles
         self.absorption = absorption    # Vector de coeficiente de absorción
         self.splitter_width = width / (n_splitters + 1)  # Ancho de cada rendija
+        self.dtype = tipo_real(dtype)   # float64 por defecto; float32 para barridos (ver precision.py)
+
+    # --------------------------------------------
+    # Convierte una magnitud geométrica a la precisión del modelo
+    # --------------------------------------------
+    def _en_precision(self, valor):
+        return np.asarray(valor, dtype=self.dtype)
+
+    # --------------------------------------------
+    # Devuelve la absorción como arreglo alineado con las frecuencias
+    # --------------------------------------------
+    def _absorption_vector(self, freq):
+        if np.isscalar(self.absorption):
+            return np.full(np.shape(freq), self.absorption, dtype=self.dtype)
+        # Admite mallas (..., n_freq), p. ej. las de materials.barrido_absorcion
+        return np.asarray(self.absorption, dtype=self.dtype)
 
     # --------------------------------------------
     # Calcula la pérdida de transmisión (TL) en función de la frecuencia
     # --------------------------------------------
     def transmission_loss(self, freq):
-        c = 343  # Velocidad del sonido en aire [m/s]
-        if np.isscalar(self.absorption):
-            alpha_vec = np.full_like(freq, self.absorption)
-        else:
-            alpha_vec = self.absorption
+        alpha_vec = self._absorption_vector(freq)
 
-        k = wavenumber_complex(freq, alpha_vec)
-        TL = []
-        for alpha_i in alpha_vec:
-            alpha = 4 * alpha_i / self.splitter_width
-            TLf = 10 * np.log10(np.exp(2 * alpha * self.length))
-            TL.append(TLf)
-        return np.array(TL)
+        # Forma cerrada de 10·log10(e^(2·α·L)), sin desbordar exp() y
+        # vectorizada sobre cualquier malla (..., n_freq) de absorción
+        alpha = 4 * alpha_vec / self._en_precision(self.splitter_width)
+        return 10 * float(np.log10(np.e)) * 2 * alpha * self._en_precision(self.length)
 
     # --------------------------------------------
     # Calcula la atenuación adicional por absorción lateral
     # --------------------------------------------
     def delta_L(self, freq):
-        if np.isscalar(self.absorption):
-            alpha_vec = np.full_like(freq, self.absorption)
-        else:
-            alpha_vec = self.absorption
+        alpha_vec = self._absorption_vector(freq)
 
-        a = self.splitter_width
+        a = self._en_precision(self.splitter_width)
         h = a / 2
-        return np.array([
-            delta_L_additional(alpha_i, a, h) for alpha_i in alpha_vec
-        ])
+        return delta_L_additional(alpha_vec, a, h)
 
     # --------------------------------------------
     # Calcula la atenuación total (TL + ΔL)
@@ -68,3 +73,96 @@ class SplitterSilencer:
         TL = self.transmission_loss(freq)
         ΔL = self.delta_L(freq)
         return TL + ΔL
+
+# --------------------------------------------
+# Silenciador con disposición no uniforme: acústica por canal
+# --------------------------------------------
+class SplitterCanales(SplitterSilencer):
+    """
+    Cada rendija es un canal con su ancho, su paso (el ancho de rendija más
+    la parte que le toca de baffles y paredes) y el revestimiento de sus dos
+    lados: el baffle vecino con su material y su tramo a lo largo, o la pared
+    lateral, que solo absorbe si la disposición le da medio baffle o material.
+    TL y ΔL se calculan como arreglos (canales × frecuencias) y se combinan
+    por energía ponderando cada canal por su fracción del área de paso.
+
+    Con una disposición uniforme y las dos paredes revestidas del material
+    del diseño da lo mismo que SplitterSilencer. Los baffles escalonados se
+    tratan como canales revestidos solo en el tramo del baffle (sin el
+    acoplamiento entre canales donde falta el baffle)
+    """
+    def __init__(self, length, disposicion, absorption, absorciones=None, wall_thickness=0.005, dtype=None):
+        super().__init__(length, disposicion.ancho_total(wall_thickness), disposicion.n_baffles, absorption, dtype)
+        self.disposicion = disposicion
+        self.wall_thickness = wall_thickness
+        self.absorciones = absorciones or {}  # Curvas de absorción de otros materiales (nombre -> α(f))
+
+        anchos = np.asarray(disposicion.anchos_rendijas, dtype=float)
+        solido = sum(disposicion.espesores_baffles) + sum(disposicion.medios_baffles) + 2 * wall_thickness
+        self.anchos = anchos
+        self.pasos = anchos + solido / len(anchos)  # Paso de cada canal [m]
+        self.pesos = anchos / anchos.sum()          # Fracción del área de paso
+
+    # --------------------------------------------
+    # Absorción de un revestimiento (None = material del diseño)
+    # --------------------------------------------
+    def _absorcion_material(self, material, freq):
+        if material is None:
+            return self._absorption_vector(freq)
+        if material not in self.absorciones:
+            from app.simulation.solver import FREQS_MATERIAL, ALPHAS_MATERIALES
+            if material not in ALPHAS_MATERIALES:
+                raise ValueError(f"Material desconocido: {material}")
+            self.absorciones[material] = np.interp(freq, FREQS_MATERIAL, ALPHAS_MATERIALES[material])
+        return np.asarray(self.absorciones[material], dtype=self.dtype)
+
+    # --------------------------------------------
+    # α·longitud revestida de los lados de cada canal (canales × frecuencias)
+    # --------------------------------------------
+    def _absorcion_lados(self, freq):
+        disp = self.disposicion
+        inicio, fin = disp.tramos()
+        tramos = (fin - inicio)  # Fracción de la longitud revestida por cada baffle
+
+        lados = []  # (material, fracción revestida) de cada pieza: pared izq., baffles, pared der.
+        for i, medio in zip((0, 1), disp.medios_baffles):
+            revestida = medio > 0 or disp.materiales_medios[i] is not None
+            lados.append((disp.materiales_medios[i], 1.0 if revestida else 0.0))
+        piezas = [lados[0]] + [(disp.materiales[i] if disp.materiales else None, tramos[i])
+                               for i in range(disp.n_baffles)] + [lados[1]]
+
+        curvas = np.stack([self._absorcion_material(material, freq) * self._en_precision(fraccion)
+                           for material, fraccion in piezas])
+        # Cada canal c está entre las piezas c y c+1
+        return (curvas[:-1] + curvas[1:]) * self._en_precision(self.length)
+
+    # --------------------------------------------
+    # TL y ΔL de cada canal (canales × frecuencias)
+    # --------------------------------------------
+    def canales(self, freq):
+        absorcion = self._absorcion_lados(freq)  # α_izq·L_izq + α_der·L_der
+        p = self._en_precision(self.pasos)[:, None]
+        TL = 10 * float(np.log10(np.e)) * 2 * (2 / p) * absorcion
+        alpha_media = absorcion / (2 * self._en_precision(self.length))
+        ΔL = delta_L_additional(alpha_media, p, p / 2)
+        return TL, ΔL
+
+    # --------------------------------------------
+    # Suma energética de canales ponderada por el área de paso
+    # --------------------------------------------
+    def _combinar(self, atenuacion):
+        minimo = atenuacion.min(axis=0)
+        pesos = self._en_precision(self.pesos)[:, None]
+        suma = np.sum(pesos * 10 ** (-(atenuacion - minimo) / 10), axis=0)
+        return minimo - 10 * np.log10(suma)
+
+    def transmission_loss(self, freq):
+        return self._combinar(self.canales(freq)[0])
+
+    def total_attenuation(self, freq):
+        TL, ΔL = self.canales(freq)
+        return self._combinar(TL + ΔL)
+
+    def delta_L(self, freq):
+        """La parte de la atenuación combinada que no explica el TL combinado"""
+        return self.total_attenuation(freq) - self.transmission_loss(freq)
@@ -0,0 +1,287 @@
+# --------------------------------------------
+# network.py
+# Red de ductos: silenciadores y tramos en serie y en ramales hacia varias salidas
+# --------------------------------------------
+
+# --------------------------------------------
+# Importar librerías necesarias
+# --------------------------------------------
+
+import numpy as np
+from app.simulation.models import SplitterSilencer
+from app.simulation.pressure import caida_presion, factor_friccion, RHO_AIRE, NU_AIRE
+
+RUGOSIDAD_DUCTO = 0.00015  # Rugosidad absoluta de chapa galvanizada [m]
+SIN_CAUDAL_DB = 1000.0     # Atenuación de una rama sin caudal (finita para las sumas acumuladas)
+
+# Parámetros de cada tipo de elemento (un arreglo por campo, NaN si no aplica)
+CAMPOS_DUCTO = ('longitud', 'ancho', 'alto', 'atenuacion_dB_m')
+CAMPOS_SILENCIADOR = ('L', 'width', 'n_baffles', 'H', 'n_espacios', 'h', 'wall_thickness')
+RAIZ, DUCTO, SILENCIADOR = 0, 1, 2
+
+# --------------------------------------------
+# Red en árbol con raíz en el ventilador
+# --------------------------------------------
+class RedDuctos:
+    """
+    Cada nodo salvo la raíz (el ventilador) tiene un único padre y el
+    elemento (tramo de ducto o silenciador) está en la arista que llega a
+    él. Los caudales se obtienen de las demandas de las salidas; la potencia
+    sonora se reparte en cada derivación según la fracción de caudal y se
+    atenúa en cada elemento.
+
+    Los nodos se numeran en preorden (recorrido de Euler), así que el
+    subárbol de un nodo ocupa el tramo contiguo [entrada, salida). La
+    atenuación acumulada desde el ventilador se calcula para toda la red con
+    un arreglo de diferencias y una suma acumulada (n_nodos, n_freq), y un
+    cambio en un elemento solo suma su diferencia al tramo de su subárbol
+    """
+
+    def __init__(self, freq=None):
+        self.freq = np.linspace(100, 500, 300) if freq is None else np.asarray(freq, dtype=float)
+        self.padres = [-1]
+        self.tipos = [RAIZ]
+        self.nombres = ['Ventilador']
+        self.demandas = [0.0]
+        self.elementos = [None]
+        self._indexada = False
+
+    def __len__(self):
+        return len(self.padres)
+
+    # --------------------------------------------
+    # Construcción de la red
+    # --------------------------------------------
+    def _agregar(self, padre, tipo, elemento, nombre):
+        if not 0 <= padre < len(self.padres):
+            raise ValueError(f"El nodo padre {padre} no existe")
+        self.padres.append(padre)
+        self.tipos.append(tipo)
+        self.elementos.append(elemento)
+        self.demandas.append(0.0)
+        self.nombres.append(nombre or f"N{len(self.padres) - 1}")
+        self._indexada = False
+        return len(self.padres) - 1
+
+    def agregar_ducto(self, padre, longitud, ancho, alto, atenuacion_dB_m=0.0, nombre=None):
+        """Tramo rectangular; atenuacion_dB_m es escalar o un arreglo sobre freq"""
+        return self._agregar(padre, DUCTO, {'longitud': longitud, 'ancho': ancho, 'alto': alto,
+                                            'atenuacion_dB_m': atenuacion_dB_m}, nombre)
+
+    def agregar_silenciador(self, padre, params, nombre=None):
+        """params es el resultado de calcular_parametros (o uno de sus variantes)"""
+        return self._agregar(padre, SILENCIADOR, self._elemento_silenciador(params), nombre)
+
+    def _elemento_silenciador(self, params):
+        elemento = {campo: float(params[campo]) for campo in CAMPOS_SILENCIADOR}
+        elemento['alpha'] = np.interp(self.freq, params['freq'], params['alpha_interp'])
+        return elemento
+
+    def fijar_demanda(self, nodo, Q_m3h):
+        """Caudal que sale de la red en el nodo [m³/h]"""
+        if self._indexada:
+            self.modificar_demanda(nodo, Q_m3h)
+        else:
+            self.demandas[nodo] = float(Q_m3h)
+
+    # --------------------------------------------
+    # Recorrido en preorden y parámetros como arreglos
+    # --------------------------------------------
+    def _indexar(self):
+        n = len(self.padres)
+        hijos = [[] for _ in range(n)]
+        for nodo, padre in enumerate(self.padres[1:], start=1):
+            hijos[padre].append(nodo)
+
+        orden, pila = [], [0]
+        while pila:
+            nodo = pila.pop()
+            orden.append(nodo)
+            pila.extend(reversed(hijos[nodo]))
+        self.orden = np.array(orden)
+        self.entrada = np.empty(n, dtype=int)
+        self.entrada[self.orden] = np.arange(n)
+        tamano = np.ones(n, dtype=int)
+        for nodo in orden[:0:-1]:                      # Hijos antes que padres
+            tamano[self.padres[nodo]] += tamano[nodo]
+        self.salida = self.entrada + tamano
+        self.hijos = hijos
+
+        self.padre = np.array(self.padres)
+        self.tipo = np.array(self.tipos)
+        self.demanda = np.array(self.demandas)
+        self.param = {campo: np.full(n, np.nan) for campo in CAMPOS_DUCTO + CAMPOS_SILENCIADOR}
+        self.param['atenuacion_dB_m'] = np.zeros((n, len(self.freq)))
+        self.alpha = np.zeros((n, len(self.freq)))
+        for nodo, elemento in enumerate(self.elementos):
+            if elemento is not None:
+                self._cargar_elemento(nodo, elemento)
+        self._indexada = True
+
+    def _cargar_elemento(self, nodo, elemento):
+        for campo, valor in elemento.items():
+            if campo == 'alpha':
+                self.alpha[nodo] = valor
+            else:
+                self.param[campo][nodo] = valor
+
+    # --------------------------------------------
+    # Atenuación (dB) y caída de presión (Pa) de un conjunto de elementos
+    # --------------------------------------------
+    def _atenuacion(self, nodos):
+        D = np.zeros((len(nodos), len(self.freq)))
+        p = {campo: valores[nodos] for campo, valores in self.param.items()}
+        ducto = self.tipo[nodos] == DUCTO
+        D[ducto] = p['atenuacion_dB_m'][ducto] * p['longitud'][ducto, None]
+        sil = self.tipo[nodos] == SILENCIADOR
+        if sil.any():
+            splitter = SplitterSilencer(p['L'][sil, None], p['width'][sil, None], p['n_baffles'][sil, None],
+                                        self.alpha[nodos][sil])
+            D[sil] = splitter.total_attenuation(self.freq)
+        return D
+
+    def _caida(self, nodos):
+        Q = self.Q[nodos] / 3600
+        dp = np.zeros(len(nodos))
+        p = {campo: valores[nodos] for campo, valores in self.param.items() if campo != 'atenuacion_dB_m'}
+        ducto = self.tipo[nodos] == DUCTO
+        if ducto.any():
+            a, b, longitud = p['ancho'][ducto], p['alto'][ducto], p['longitud'][ducto]
+            Dh = 2 * a * b / (a + b)
+            v = Q[ducto] / (a * b)
+            f = factor_friccion(v * Dh / NU_AIRE, RUGOSIDAD_DUCTO / Dh)
+            dp[ducto] = f * longitud / Dh * 0.5 * RHO_AIRE * v ** 2
+        sil = self.tipo[nodos] == SILENCIADOR
+        if sil.any():
+            dp[sil] = caida_presion(Q[sil], p['width'][sil], p['H'][sil], p['n_espacios'][sil], p['h'][sil],
+                                    p['L'][sil], p['wall_thickness'][sil])['dp_total']
+        return dp
+
+    def _reparto(self, nodos):
+        """Atenuación por derivación: -10·log10(Q_rama / Q_padre) (0 en la raíz)"""
+        S = np.zeros(len(nodos))
+        rama = self.padre[nodos] >= 0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            S[rama] = -10 * np.log10(self.Q[nodos[rama]] / self.Q[self.padre[nodos[rama]]])
+        return np.minimum(np.nan_to_num(S, nan=SIN_CAUDAL_DB), SIN_CAUDAL_DB)
+
+    # --------------------------------------------
+    # Suma en cada tramo [entrada, salida) con un arreglo de diferencias
+    # --------------------------------------------
+    def _acumular(self, valores):
+        n = len(self.padre)
+        diferencias = np.zeros((n + 1,) + valores.shape[1:])
+        diferencias[self.entrada] += valores
+        np.subtract.at(diferencias, self.salida, valores)
+        return np.cumsum(diferencias, axis=0)[:n]
+
+    # --------------------------------------------
+    # Solución completa (vectorizada sobre nodos y frecuencias)
+    # --------------------------------------------
+    def resolver(self):
+        if not self._indexada:
+            self._indexar()
+        nodos = np.arange(len(self.padre))
+
+        # Caudal de cada arista: demandas de su subárbol (sumas en preorden)
+        acumulada = np.concatenate([[0.0], np.cumsum(self.demanda[self.orden])])
+        self.Q = acumulada[self.salida] - acumulada[self.entrada]
+
+        self.D = self._atenuacion(nodos)
+        self.S = self._reparto(nodos)
+        self.dp = self._caida(nodos)
+
+        # Atenuación y caída de presión acumuladas desde el ventilador (en preorden)
+        self._A = self._acumular(self.D + self.S[:, None])
+        self._P = self._acumular(self.dp)
+        return self
+
+    # --------------------------------------------
+    # Cambios incrementales
+    # --------------------------------------------
+    def _sumar_subarbol(self, nodo, dA=None, dP=None):
+        tramo = slice(self.entrada[nodo], self.salida[nodo])
+        if dA is not None:
+            self._A[tramo] += dA
+        if dP is not None:
+            self._P[tramo] += dP
+
+    def modificar_silenciador(self, nodo, params):
+        """Reemplaza el silenciador del nodo; solo se recalcula su subárbol"""
+        self._modificar_elemento(nodo, SILENCIADOR, self._elemento_silenciador(params))
+
+    def modificar_ducto(self, nodo, longitud, ancho, alto, atenuacion_dB_m=0.0):
+        self._modificar_elemento(nodo, DUCTO, {'longitud': longitud, 'ancho': ancho, 'alto': alto,
+                                               'atenuacion_dB_m': atenuacion_dB_m})
+
+    def _modificar_elemento(self, nodo, tipo, elemento):
+        self.tipos[nodo], self.elementos[nodo] = tipo, elemento
+        if not self._indexada:
+            return
+        self.tipo[nodo] = tipo
+        for campo in self.param:
+            self.param[campo][nodo] = 0.0 if campo == 'atenuacion_dB_m' else np.nan
+        self._cargar_elemento(nodo, elemento)
+
+        nodos = np.array([nodo])
+        D, dp = self._atenuacion(nodos)[0], self._caida(nodos)[0]
+        self._sumar_subarbol(nodo, D - self.D[nodo], dp - self.dp[nodo])
+        self.D[nodo], self.dp[nodo] = D, dp
+
+    def modificar_demanda(self, nodo, Q_m3h):
+        """
+        Cambia el caudal de una salida: el caudal cambia en el camino hasta
+        el ventilador y el reparto en esos nodos y sus hermanos
+        """
+        delta = float(Q_m3h) - self.demandas[nodo]
+        self.demandas[nodo] = float(Q_m3h)
+        if not self._indexada:
+            return
+        self.demanda[nodo] = float(Q_m3h)
+
+        camino = [nodo]
+        while self.padre[camino[-1]] >= 0:
+            camino.append(self.padre[camino[-1]])
+        camino = np.array(camino)
+        self.Q[camino] += delta
+
+        dp = self._caida(camino)
+        for i, dP in zip(camino, dp - self.dp[camino]):
+            self._sumar_subarbol(i, dP=dP)
+        self.dp[camino] = dp
+
+        afectados = np.unique(np.concatenate([camino] + [self.hijos[i] for i in camino]).astype(int))
+        S = self._reparto(afectados)
+        for i, dS in zip(afectados, S - self.S[afectados]):
+            if dS != 0:
+                self._sumar_subarbol(i, dA=dS)
+        self.S[afectados] = S
+
+    # --------------------------------------------
+    # Resultados
+    # --------------------------------------------
+    @property
+    def atenuacion(self):
+        """Atenuación desde el ventilador hasta cada nodo (n_nodos, n_freq) [dB]"""
+        return self._A[self.entrada]
+
+    @property
+    def presion(self):
+        """Caída de presión acumulada desde el ventilador hasta cada nodo [Pa]"""
+        return self._P[self.entrada]
+
+    def salidas(self):
+        return np.flatnonzero(self.demanda > 0) if self._indexada else np.flatnonzero(np.array(self.demandas) > 0)
+
+    def niveles(self, Lw_ventilador):
+        """
+        Lw_ventilador escalar o (n_freq,) en dB. Devuelve la potencia en cada
+        nodo, la emitida por cada salida (fracción de su caudal que sale
+        ahí), el caudal por arista [m³/h] y la presión necesaria del ventilador
+        """
+        Lw = np.asarray(Lw_ventilador, dtype=float) - self.atenuacion
+        salidas = self.salidas()
+        with np.errstate(divide='ignore'):
+            emitida = Lw[salidas] + 10 * np.log10(self.demanda[salidas] / self.Q[salidas])[:, None]
+        return {'Lw': Lw, 'salidas': salidas, 'Lw_salidas': emitida, 'Q_m3h': self.Q,
+                'dp': self.presion, 'dp_ventilador': self.presion[salidas].max() if len(salidas) else 0.0}
@@ -0,0 +1,119 @@
+# --------------------------------------------
+# pareto.py
+# Frente de Pareto: atenuación vs. tamaño vs. caída de presión
+# --------------------------------------------
+
+# --------------------------------------------
+# Importar librerías necesarias
+# --------------------------------------------
+
+import numpy as np
+from app.simulation.solver import calcular_parametros_lote, FREQS_MATERIAL, ALPHAS_MATERIALES
+from app.simulation.models import SplitterSilencer
+
+# --------------------------------------------
+# Filtra los puntos no dominados de una matriz de objetivos (minimización)
+# --------------------------------------------
+def frente_pareto(objetivos, tam_bloque=1024, n_elite=32):
+    """
+    Devuelve una máscara booleana con los puntos no dominados de
+    'objetivos' (N, M), donde todos los objetivos se minimizan.
+    Tras ordenar lexicográficamente (O(n log n)) un punto sólo puede ser
+    dominado por puntos anteriores, así que basta comparar cada bloque con
+    el frente acumulado y consigo mismo; el costo es O(n·|F|) vectorizado.
+    Los n_elite puntos del frente con menor suma normalizada (los que más
+    puntos dominan) se prueban primero para descartar la mayoría del bloque
+    """
+    objetivos = np.asarray(objetivos, dtype=float)
+    n, m = objetivos.shape
+    orden = np.lexsort(objetivos.T[::-1])
+    ordenados = objetivos[orden]
+
+    # Suma de objetivos normalizados para elegir los puntos élite
+    rango = np.ptp(ordenados, axis=0)
+    suma = ((ordenados - ordenados.min(axis=0)) / np.where(rango > 0, rango, 1)).sum(axis=1)
+
+    frente = np.empty((0, m))
+    suma_frente = np.empty(0)
+    es_frente = np.zeros(n, dtype=bool)
+
+    for inicio in range(0, n, tam_bloque):
+        bloque = ordenados[inicio:inicio + tam_bloque]
+        vivos = np.ones(len(bloque), dtype=bool)
+
+        # Primero contra la élite y luego contra el frente completo (por sub-bloques)
+        elite = frente[np.argsort(suma_frente)[:n_elite]]
+        for F in [elite] + [frente[j:j + tam_bloque] for j in range(0, len(frente), tam_bloque)]:
+            idx = np.flatnonzero(vivos)
+            if len(idx) == 0 or len(F) == 0:
+                continue
+            vivos[idx[_dominados_por(bloque[idx], F)]] = False
+
+        # Dominancia dentro del bloque entre los supervivientes
+        idx = np.flatnonzero(vivos)
+        idx_vivos = idx[~_dominados_por(bloque[idx], bloque[idx])]
+
+        es_frente[inicio + idx_vivos] = True
+        frente = np.concatenate([frente, bloque[idx_vivos]])
+        suma_frente = np.concatenate([suma_frente, suma[inicio + idx_vivos]])
+
+    mascara = np.zeros(n, dtype=bool)
+    mascara[orden] = es_frente
+    return mascara
+
+# --------------------------------------------
+# Indica qué puntos (P, M) son dominados por algún punto de F (K, M)
+# --------------------------------------------
+def _dominados_por(puntos, F):
+    menor_igual = np.all(F[None, :, :] <= puntos[:, None, :], axis=2)
+    estricto = np.any(F[None, :, :] < puntos[:, None, :], axis=2)
+    return (menor_igual & estricto).any(axis=1)
+
+# --------------------------------------------
+# Barrido de diseños sobre una malla V × H × L
+# --------------------------------------------
+def barrido_disenos(Q_m3h, V_vals, H_vals, L_vals, fmin=100, fmax=500, material='lana100',
+                    alpha_interp=None, tam_bloque=65536, dtype=None):
+    """
+    Evalúa todas las combinaciones de V, H y L para un caudal dado y devuelve
+    arreglos planos con las entradas, las dimensiones, la atenuación máxima
+    y la caída de presión de cada diseño. Con dtype=float32 todo el barrido
+    se evalúa y se devuelve en simple precisión (ver precision.py)
+    """
+    V, H, L = (x.ravel() for x in np.meshgrid(V_vals, H_vals, L_vals, indexing='ij'))
+    geo = calcular_parametros_lote(Q_m3h, V, H, L, fmin, fmax, material, dtype=dtype)
+    freq = geo['freq']
+    if alpha_interp is None:
+        alpha_interp = np.interp(freq, FREQS_MATERIAL, ALPHAS_MATERIALES[material])
+    alpha_interp = np.asarray(alpha_interp, dtype=freq.dtype)
+
+    # Atenuación máxima por diseño, por bloques para acotar la memoria
+    TL_max = np.empty(len(V), dtype=freq.dtype)
+    for inicio in range(0, len(V), tam_bloque):
+        s = slice(inicio, inicio + tam_bloque)
+        splitter = SplitterSilencer(geo['L'][s, None], geo['width'][s, None], geo['n_baffles'][s, None], alpha_interp,
+                                    dtype=freq.dtype)
+        TL_max[s] = splitter.total_attenuation(freq).max(axis=1)
+
+    return {
+        'Q_m3h': np.broadcast_to(np.asarray(Q_m3h, dtype=freq.dtype), V.shape),
+        'V': V.astype(freq.dtype, copy=False), 'H': geo['H'], 'L': geo['L'],
+        'width': geo['width'],
+        'n_baffles': geo['n_baffles'],
+        'TL_max': TL_max,
+        'dp': geo['dp_total'],
+        'material': material,
+    }
+
+# --------------------------------------------
+# Objetivos a minimizar: -TL_max, width, L y caída de presión
+# --------------------------------------------
+def objetivos_barrido(barrido):
+    return np.column_stack([-barrido['TL_max'], barrido['width'], barrido['L'], barrido['dp']])
+
+# --------------------------------------------
+# Calcula el frente de Pareto de un barrido
+# --------------------------------------------
+def frente_barrido(barrido):
+    """Devuelve los índices de los diseños no dominados del barrido"""
+    return np.flatnonzero(frente_pareto(objetivos_barrido(barrido)))
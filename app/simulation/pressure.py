@@ -0,0 +1,61 @@
+# --------------------------------------------
+# pressure.py
+# Velocidad de paso y caída de presión a través de las rendijas del silenciador
+# --------------------------------------------
+
+# --------------------------------------------
+# Importar librerías necesarias
+# --------------------------------------------
+
+import numpy as np
+
+RHO_AIRE = 1.2       # Densidad del aire [kg/m³]
+NU_AIRE = 1.5e-5     # Viscosidad cinemática del aire a 20 °C [m²/s]
+RUGOSIDAD_LANA = 0.0015  # Rugosidad absoluta de lana de vidrio con velo (ASHRAE) [m]
+
+# --------------------------------------------
+# Factor de fricción de Darcy (laminar / Haaland)
+# --------------------------------------------
+def factor_friccion(Re, rugosidad_relativa):
+    Re = np.maximum(Re, 1e-12)
+    turbulento = (-1.8 * np.log10((rugosidad_relativa / 3.7) ** 1.11 + 6.9 / Re)) ** -2
+    return np.where(Re < 2300, 64 / Re, turbulento)
+
+# --------------------------------------------
+# Calcula velocidades y caída de presión del silenciador
+# --------------------------------------------
+def caida_presion(Q, width, H, n_espacios, h, L, wall_thickness=0.005,
+                  rugosidad=RUGOSIDAD_LANA, rho=RHO_AIRE, nu=NU_AIRE):
+    """
+    Modelo de pérdidas: contracción a la entrada de las rendijas
+    (ζ = 0.5·(1 - σ)), expansión brusca a la salida (ζ = (1 - σ)², Borda–Carnot)
+    y fricción de Darcy a lo largo de L, todo referido a la presión dinámica en
+    las rendijas. σ es la relación de área libre / área frontal. Todas las
+    entradas pueden ser escalares o arreglos (barridos); Q en m³/s
+    """
+    area_frontal = (width - 2 * wall_thickness) * H
+    area_libre = n_espacios * 2 * h * H
+    sigma = area_libre / area_frontal
+
+    v_frontal = Q / area_frontal
+    v_paso = Q / area_libre
+    presion_dinamica = 0.5 * rho * v_paso ** 2
+
+    # Diámetro hidráulico de cada rendija (2h × H)
+    Dh = 2 * (2 * h) * H / (2 * h + H)
+    Re = v_paso * Dh / nu
+    f = factor_friccion(Re, rugosidad / Dh)
+
+    dp_entrada = 0.5 * (1 - sigma) * presion_dinamica
+    dp_friccion = f * L / Dh * presion_dinamica
+    dp_salida = (1 - sigma) ** 2 * presion_dinamica
+
+    return {
+        'v_frontal': v_frontal,
+        'v_paso': v_paso,
+        'Re': Re,
+        'dp_entrada': dp_entrada,
+        'dp_friccion': dp_friccion,
+        'dp_salida': dp_salida,
+        'dp_total': dp_entrada + dp_friccion + dp_salida,
+    }
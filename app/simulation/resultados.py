@@ -0,0 +1,247 @@
+# --------------------------------------------
+# resultados.py
+# Tipos de resultado: un diseño (objeto con __slots__) y un lote de diseños (estructura de arreglos)
+# --------------------------------------------
+
+# --------------------------------------------
+# Importar librerías necesarias
+# --------------------------------------------
+
+from collections.abc import Mapping
+import numpy as np
+
+# Campos de calcular_parametros, en el orden del diccionario original
+CAMPOS_DISENO = (
+    'Q', 'S', 'h', 'n_espacios', 'n_baffles', 'width', 'L', 'H', 'baffle_thickness', 'wall_thickness',
+    'interior_width', 'freq', 'alpha_interp', 'material',
+    'v_frontal', 'v_paso', 'Re', 'dp_entrada', 'dp_friccion', 'dp_salida', 'dp_total',
+)
+# Campos que MainApp.simular agrega al diseño (curvas, incertidumbre e imágenes)
+CAMPOS_RESULTADO = (
+    'TL', 'delta_L', 'TL_total', 'incertidumbre',
+    'pdf_path', 'graph_png', 'model_image', 'technical_drawings_png',
+)
+ENTEROS = ('n_espacios', 'n_baffles')
+
+# --------------------------------------------
+# Parámetros de un diseño
+# --------------------------------------------
+class ParametrosDiseno(Mapping):
+    """
+    Resultado de calcular_parametros. Los campos son atributos
+    (params.width) y también claves (params['width']), así que el código que
+    lo trataba como diccionario sigue funcionando: get, items, {**params}...
+    Solo admite los campos de CAMPOS; los que no se pasan quedan en None
+    """
+    __slots__ = CAMPOS_DISENO
+    CAMPOS = CAMPOS_DISENO
+
+    def __init__(self, *base, **campos):
+        valores = dict(*base, **campos)
+        desconocidos = valores.keys() - set(self.CAMPOS)
+        if desconocidos:
+            raise KeyError(f"Campos desconocidos para {type(self).__name__}: {', '.join(sorted(desconocidos))}")
+        for campo in self.CAMPOS:
+            setattr(self, campo, valores.get(campo))
+
+    # --------------------------------------------
+    # Acceso por clave (compatibilidad con el diccionario)
+    # --------------------------------------------
+    def __getitem__(self, clave):
+        if clave not in self.CAMPOS:
+            raise KeyError(clave)
+        return getattr(self, clave)
+
+    def __setitem__(self, clave, valor):
+        if clave not in self.CAMPOS:
+            raise KeyError(f"Campo desconocido para {type(self).__name__}: {clave}")
+        setattr(self, clave, valor)
+
+    def __iter__(self):
+        return iter(self.CAMPOS)
+
+    def __len__(self):
+        return len(self.CAMPOS)
+
+    def __repr__(self):
+        escalares = ", ".join(f"{campo}={getattr(self, campo)!r}" for campo in self.CAMPOS
+                              if np.ndim(getattr(self, campo)) == 0 and getattr(self, campo) is not None
+                              and not isinstance(getattr(self, campo), (bytes, dict)))
+        return f"{type(self).__name__}({escalares})"
+
+    def copy(self):
+        return type(self)(self)
+
+    def a_dict(self):
+        return dict(self)
+
+    def como_lote(self):
+        """Lote de un solo diseño (solo los campos de CAMPOS_DISENO)"""
+        return LoteDisenos.desde_disenos([self])
+
+# --------------------------------------------
+# Diseño simulado: parámetros, curvas e imágenes
+# --------------------------------------------
+class ResultadoDiseno(ParametrosDiseno):
+    """Lo que antes era el diccionario self.data de MainApp"""
+    __slots__ = CAMPOS_RESULTADO
+    CAMPOS = CAMPOS_DISENO + CAMPOS_RESULTADO
+
+# --------------------------------------------
+# Lote de diseños como estructura de arreglos
+# --------------------------------------------
+class LoteDisenos:
+    """
+    Resultado de calcular_parametros_lote: un arreglo (N,) por campo en
+    lugar de N diccionarios. freq (n_freq,) es común a todo el lote;
+    alpha_interp es común (n_freq,) o por diseño (N, n_freq); material es un
+    texto común o un arreglo (N,); h es un escalar común o un arreglo (N,).
+
+    lote['width'] devuelve el arreglo del campo, lote[i] un ParametrosDiseno
+    y lote[a:b] otro lote que es una vista de este (sin copiar); con una
+    máscara o un arreglo de índices se copia, como en numpy. Iterar recorre
+    los diseños; keys/items/get mantienen la interfaz del diccionario
+    """
+    __slots__ = CAMPOS_DISENO
+    CAMPOS = CAMPOS_DISENO
+
+    def __init__(self, **campos):
+        faltantes = set(self.CAMPOS) - campos.keys()
+        desconocidos = campos.keys() - set(self.CAMPOS)
+        if faltantes or desconocidos:
+            raise KeyError(f"Campos faltantes {sorted(faltantes)} o desconocidos {sorted(desconocidos)}")
+        for campo, valor in campos.items():
+            setattr(self, campo, valor)
+
+    # --------------------------------------------
+    # Indica si el valor de un campo tiene un elemento por diseño
+    # --------------------------------------------
+    @staticmethod
+    def _por_diseno(campo, valor):
+        if campo == 'freq':
+            return False
+        if campo == 'alpha_interp':
+            return np.ndim(valor) == 2
+        return np.ndim(valor) >= 1
+
+    def __len__(self):
+        return len(self.L)
+
+    def __getitem__(self, clave):
+        if isinstance(clave, str):
+            if clave not in self.CAMPOS:
+                raise KeyError(clave)
+            return getattr(self, clave)
+        if isinstance(clave, (int, np.integer)):
+            return self.diseno(clave)
+        return LoteDisenos(**{campo: (valor[clave] if self._por_diseno(campo, valor) else valor)
+                              for campo, valor in self.items()})
+
+    def __iter__(self):
+        return (self.diseno(i) for i in range(len(self)))
+
+    def __contains__(self, clave):
+        return clave in self.CAMPOS
+
+    def __repr__(self):
+        return f"LoteDisenos({len(self)} diseños, material={self.material!r}, {self.nbytes / 1e6:.1f} MB)"
+
+    def keys(self):
+        return self.CAMPOS
+
+    def values(self):
+        return [getattr(self, campo) for campo in self.CAMPOS]
+
+    def items(self):
+        return [(campo, getattr(self, campo)) for campo in self.CAMPOS]
+
+    def get(self, clave, defecto=None):
+        return getattr(self, clave) if clave in self.CAMPOS else defecto
+
+    def a_dict(self):
+        return dict(self.items())
+
+    @property
+    def nbytes(self):
+        return sum(valor.nbytes for valor in self.values() if isinstance(valor, np.ndarray))
+
+    # --------------------------------------------
+    # Diseño i del lote como ParametrosDiseno (escalares de Python)
+    # --------------------------------------------
+    def diseno(self, i):
+        campos = {}
+        for campo, valor in self.items():
+            if self._por_diseno(campo, valor):
+                valor = valor[i]
+                if campo != 'alpha_interp':
+                    valor = valor.item()
+            elif isinstance(valor, np.generic):
+                valor = valor.item()
+            campos[campo] = int(valor) if campo in ENTEROS else valor
+        return ParametrosDiseno(**campos)
+
+    # --------------------------------------------
+    # Valores por diseño de un campo (los comunes se expanden sin copiar)
+    # --------------------------------------------
+    def columna(self, campo):
+        valor = getattr(self, campo)
+        if self._por_diseno(campo, valor):
+            return np.asarray(valor)
+        valor = np.asarray(valor)
+        return np.broadcast_to(valor, (len(self),) + valor.shape)
+
+    # --------------------------------------------
+    # Construcción a partir de diseños sueltos o de otros lotes
+    # --------------------------------------------
+    @classmethod
+    def desde_disenos(cls, disenos):
+        """Empaqueta ParametrosDiseno (o diccionarios con los mismos campos) en un lote"""
+        disenos = list(disenos)
+        if not disenos:
+            raise ValueError("Se necesita al menos un diseño")
+        freq = np.asarray(disenos[0]['freq'])
+        if any(not _iguales(d['freq'], freq) for d in disenos[1:]):
+            raise ValueError("Los diseños tienen mallas de frecuencias distintas")
+
+        campos = {'freq': freq}
+        for campo in CAMPOS_DISENO:
+            if campo == 'freq':
+                continue
+            valores = [d[campo] for d in disenos]
+            if campo in ('alpha_interp', 'material') and all(_iguales(v, valores[0]) for v in valores[1:]):
+                campos[campo] = valores[0] if campo == 'material' else np.asarray(valores[0])
+            else:
+                campos[campo] = np.array(valores)
+        return cls(**campos)
+
+    @classmethod
+    def concatenar(cls, lotes):
+        """
+        Une lotes con la misma malla de frecuencias. Los campos comunes que
+        coinciden en todos los lotes siguen siendo comunes; si difieren se
+        pasan a un valor por diseño
+        """
+        lotes = list(lotes)
+        if not lotes:
+            raise ValueError("Se necesita al menos un lote")
+        freq = lotes[0].freq
+        if any(not _iguales(lote.freq, freq) for lote in lotes[1:]):
+            raise ValueError("Los lotes tienen mallas de frecuencias distintas")
+
+        campos = {'freq': freq}
+        for campo in CAMPOS_DISENO:
+            if campo == 'freq':
+                continue
+            valores = [getattr(lote, campo) for lote in lotes]
+            comun = not any(cls._por_diseno(campo, v) for v in valores)
+            if comun and all(_iguales(v, valores[0]) for v in valores[1:]):
+                campos[campo] = valores[0]
+            else:
+                campos[campo] = np.concatenate([lote.columna(campo) for lote in lotes])
+        return cls(**campos)
+
+# --------------------------------------------
+# Igualdad de campos comunes (misma referencia o mismos valores)
+# --------------------------------------------
+def _iguales(a, b):
+    return a is b or np.array_equal(a, b)
@@ -0,0 +1,264 @@
+# --------------------------------------------
+# seccion.py
+# Solver numérico de la sección transversal de un canal revestido (diferencias finitas + autovalores dispersos)
+# --------------------------------------------
+
+# --------------------------------------------
+# Importar librerías necesarias
+# --------------------------------------------
+
+from typing import NamedTuple
+import numpy as np
+import scipy.sparse as sp
+from scipy.linalg import eig
+from scipy.sparse.linalg import splu, eigs
+from app.simulation.materials import propiedades_poroso, RHO0, C0
+
+# Dominio: un cuarto de la sección de un canal (simetría en el centro de la
+# rendija, y = 0, y a media altura, z = 0). A lo ancho: aire en [0, h] y
+# material poroso en [h, h + espesor], con fondo rígido (o el plano medio de
+# un baffle macizo) en y = h + espesor. En altura: aire hasta H/2 y, si
+# espesor_techo > 0, revestimiento en techo y piso.
+#
+# Fluido equivalente (Delany–Bazley / Miki) con ρ = Zc·kc/ω y K = Zc·ω/kc.
+# Para un modo p(y, z)·e^(-j·kx·x) la ecuación es
+#     ∇·(1/ρ ∇p) + ω²/K·p = kx²/ρ·p   ->   A(ω)·p = λ·M(ω)·p,  λ = kx²
+# con volúmenes finitos sobre celdas (1/ρ armónica en las caras, paredes
+# exteriores rígidas). A y M son complejas simétricas, así que el cociente
+# de Rayleigh sin conjugar converge cuadráticamente
+
+DB_NEPER = 20 * np.log10(np.e)  # dB por neper (8.686)
+
+# --------------------------------------------
+# Malla de la sección
+# --------------------------------------------
+class MallaSeccion:
+    """
+    Celdas de tamaño uniforme (dy, dz) y las tres matrices de adyacencia
+    (aire-aire, poroso-poroso, aire-poroso) con el mismo patrón disperso: A(ω)
+    se arma en cada frecuencia combinando sus 'data' sin reconstruir índices
+    """
+
+    def __init__(self, h, espesor, altura, espesor_techo=0.0, n_y=200, n_z=None):
+        if h <= 0 or espesor < 0 or altura <= 0 or not 0 <= espesor_techo < altura / 2:
+            raise ValueError("Dimensiones de la sección no válidas")
+        ancho, alto = h + espesor, altura / 2
+        self.dy = ancho / n_y
+        if n_z is None:
+            # Sin revestimiento en techo y piso el modo es uniforme en altura:
+            # basta una fila de celdas
+            n_z = 1 if espesor_techo == 0 else max(int(round(alto / self.dy)), 1)
+        self.n_y, self.n_z = n_y, n_z
+        self.dz = alto / n_z
+        self.h, self.espesor, self.altura, self.espesor_techo = h, espesor, altura, espesor_techo
+
+        y = (np.arange(n_y) + 0.5) * self.dy
+        z = (np.arange(n_z) + 0.5) * self.dz
+        Y, Z = np.meshgrid(y, z, indexing='ij')
+        self.poroso = ((Y > h) | (Z > alto - espesor_techo)).ravel()
+
+        # Caras interiores en y y en z (celda i con celda j)
+        indices = np.arange(n_y * n_z).reshape(n_y, n_z)
+        caras = [(indices[:-1, :].ravel(), indices[1:, :].ravel(), 1 / self.dy ** 2),
+                 (indices[:, :-1].ravel(), indices[:, 1:].ravel(), 1 / self.dz ** 2)]
+        i = np.concatenate([c[0] for c in caras])
+        j = np.concatenate([c[1] for c in caras])
+        peso = np.concatenate([np.full(len(c[0]), c[2]) for c in caras])
+        clase = self.poroso[i].astype(int) + self.poroso[j].astype(int)  # 0 aire-aire, 2 poroso-poroso, 1 mixta
+
+        # Laplaciano (con signo de ∇²) de cada clase de cara. Todas usan las
+        # mismas filas y columnas (con ceros fuera de su clase), así que tras
+        # pasar a CSR comparten indices e indptr
+        n = n_y * n_z
+        filas = np.concatenate([i, j, i, j])
+        columnas = np.concatenate([j, i, i, j])
+        self.laplacianos = []
+        for c in (0, 1, 2):
+            w = np.where(clase == c, peso, 0.0)
+            L = sp.coo_matrix((np.concatenate([w, w, -w, -w]), (filas, columnas)), shape=(n, n)).tocsr()
+            L.sort_indices()
+            self.laplacianos.append(L.data)
+        self.indices, self.indptr = L.indices, L.indptr
+
+    @property
+    def n(self):
+        return self.n_y * self.n_z
+
+    # --------------------------------------------
+    # Matrices A(ω) y diag(M(ω)) del problema generalizado
+    # --------------------------------------------
+    def matrices(self, freq, sigma, modelo='delany_bazley'):
+        omega = 2 * np.pi * freq
+        Zc, kc = propiedades_poroso(freq, sigma, modelo)
+        rho_p, K_p = Zc * kc / omega, Zc * omega / kc
+        rho_a, K_a = RHO0, RHO0 * C0 ** 2
+
+        # 1/ρ en las caras: media armónica de ρ (continuidad de la velocidad normal)
+        coeficientes = (1 / rho_a, 2 / (rho_a + rho_p), 1 / rho_p)
+        datos = sum(c * d for c, d in zip(coeficientes, self.laplacianos))
+        A = sp.csr_matrix((datos.astype(complex), self.indices, self.indptr), shape=(self.n, self.n))
+        rigidez = np.where(self.poroso, omega ** 2 / K_p, omega ** 2 / K_a)
+        A = A + sp.diags(rigidez)
+        masa = np.where(self.poroso, 1 / rho_p, 1 / rho_a).astype(complex)
+        return A.tocsc(), masa
+
+# --------------------------------------------
+# Modo menos atenuado en una frecuencia
+# --------------------------------------------
+class Modo(NamedTuple):
+    kx: complex          # Número de onda axial (Im < 0 atenúa)
+    vector: np.ndarray   # Presión en las celdas, normalizada con vᵀ·M·v = 1
+    iteraciones: int     # Iteraciones de Davidson
+    factorizado: bool    # Si hizo falta una factorización nueva
+
+def _raiz_atenuante(lam):
+    """kx = √λ en la rama de propagación hacia +x (Re ≥ 0, Im ≤ 0)"""
+    kx = np.sqrt(np.asarray(lam) + 0j)
+    return np.where(kx.real < 0, -kx, kx)
+
+def _normalizar(v, masa):
+    return v / np.sqrt(np.sum(v * masa * v))
+
+class SolverSeccion:
+    """
+    Barrido en frecuencia del modo menos atenuado. La primera frecuencia usa
+    eigs (shift-invert) y elige el modo con menor |Im kx|; las siguientes
+    parten del modo anterior con un método de Davidson: el subespacio
+    arranca del vector anterior, el valor buscado se extrapola de las dos
+    últimas soluciones y las correcciones (de Olsen) se precondicionan con
+    la última factorización LU de A - σ·M, aunque sea de otra frecuencia.
+    Solo se refactoriza (en el valor recién hallado) cuando la convergencia
+    pasa de 'max_iter_lu' iteraciones
+    """
+
+    def __init__(self, malla, sigma, modelo='delany_bazley', tol=1e-8, max_iter=60, max_iter_lu=8,
+                 max_subespacio=20, n_modos=6):
+        self.malla, self.sigma, self.modelo = malla, sigma, modelo
+        self.tol, self.max_iter, self.max_iter_lu = tol, max_iter, max_iter_lu
+        self.max_subespacio, self.n_modos = max_subespacio, n_modos
+        self.lu = None
+        self.n_factorizaciones = 0
+        self._anteriores = []  # (freq, kx) de las dos últimas soluciones
+        self._vector = None
+
+    # --------------------------------------------
+    # Factorización de A - σ·M (el precondicionador)
+    # --------------------------------------------
+    def _factorizar(self, A, masa, shift):
+        self.lu = splu(A - sp.diags(shift * masa, format='csc'), permc_spec='MMD_AT_PLUS_A')
+        self.n_factorizaciones += 1
+
+    # --------------------------------------------
+    # Primera frecuencia: varios modos cerca de k0² y el menos atenuado
+    # --------------------------------------------
+    def _modo_inicial(self, freq, A, masa):
+        k0 = 2 * np.pi * freq / C0
+        B = (sp.diags(1 / masa) @ A).tocsc()  # M⁻¹·A (M es diagonal)
+        n_modos = min(self.n_modos, self.malla.n - 2)
+        lam, vectores = eigs(B, k=n_modos, sigma=k0 ** 2, which='LM')
+        kx = _raiz_atenuante(lam)
+        elegido = int(np.argmin(np.abs(kx.imag) + np.where(kx.real > 0, 0, np.inf)))
+        return _normalizar(vectores[:, elegido], masa), lam[elegido]
+
+    def _prediccion(self, freq):
+        """λ esperado a partir de las dos últimas soluciones (kx lineal en f)"""
+        (f1, k1), (f2, k2) = [self._anteriores[0]] * 2 if len(self._anteriores) == 1 else self._anteriores
+        kx = k2 * freq / f2 if f1 == f2 else k2 + (k2 - k1) * (freq - f2) / (f2 - f1)
+        return kx ** 2
+
+    # --------------------------------------------
+    # Davidson generalizado con corrección de Olsen
+    # --------------------------------------------
+    def modo(self, freq):
+        A, masa = self.malla.matrices(freq, self.sigma, self.modelo)
+        factorizado = False
+        if self._vector is None:
+            v, objetivo = self._modo_inicial(freq, A, masa)
+            self._factorizar(A, masa, objetivo)
+            factorizado = True
+        else:
+            v, objetivo = self._vector, self._prediccion(freq)
+
+        V = (v / np.linalg.norm(v))[:, None]
+        AV = (A @ V[:, 0])[:, None]
+        for iteracion in range(1, self.max_iter + 1):
+            # Rayleigh–Ritz en el subespacio: el valor de Ritz más cercano al buscado
+            MV = masa[:, None] * V
+            theta, Y = eig(V.conj().T @ AV, V.conj().T @ MV)
+            k = int(np.argmin(np.abs(theta - objetivo)))
+            lam, u, Au = theta[k], V @ Y[:, k], AV @ Y[:, k]
+            r = Au - lam * masa * u
+            residuo = np.linalg.norm(r) / max(np.linalg.norm(Au), 1e-300)
+            if residuo < self.tol:
+                break
+            objetivo = lam
+
+            # t = P·(ε·M·u - r) con ε tal que uᴴ·t = 0 (evita que P·r repita u)
+            Pr, PMu = self.lu.solve(r), self.lu.solve(masa * u)
+            t = (np.vdot(u, Pr) / np.vdot(u, PMu)) * PMu - Pr
+            if V.shape[1] >= self.max_subespacio:
+                V, AV = (u / np.linalg.norm(u))[:, None], (Au / np.linalg.norm(u))[:, None]
+            for _ in range(2):  # Gram–Schmidt repetido
+                t -= V @ (V.conj().T @ t)
+            t /= np.linalg.norm(t)
+            V = np.column_stack([V, t])
+            AV = np.column_stack([AV, A @ t])
+        else:
+            raise RuntimeError(f"El modo no convergió a {freq:.1f} Hz (residuo {residuo:.1e})")
+
+        if iteracion > self.max_iter_lu:
+            # La LU anterior ya precondiciona mal: la siguiente frecuencia usa una nueva
+            self._factorizar(A, masa, lam)
+            factorizado = True
+        kx = complex(_raiz_atenuante(lam))
+        self._vector = _normalizar(u, masa)
+        self._anteriores = (self._anteriores + [(freq, kx)])[-2:]
+        return Modo(kx, self._vector, iteracion, factorizado)
+
+    # --------------------------------------------
+    # Barrido completo
+    # --------------------------------------------
+    def barrido(self, freq):
+        """kx (n_freq,); n_factorizaciones cuenta las LU usadas"""
+        return np.array([self.modo(f).kx for f in np.asarray(freq, dtype=float)])
+
+# --------------------------------------------
+# Atenuación del modo menos atenuado y fórmulas empíricas equivalentes
+# --------------------------------------------
+def atenuacion_canal(freq, h, espesor, altura, sigma, longitud=1.0, espesor_techo=0.0, n_y=200, n_z=None,
+                     modelo='delany_bazley'):
+    """
+    Atenuación [dB] del modo menos atenuado a lo largo de 'longitud' para un
+    canal de semiancho h [m] revestido con 'espesor' [m] de material de
+    resistividad sigma [Pa·s/m²]. Devuelve (atenuación, kx, solver)
+    """
+    malla = MallaSeccion(h, espesor, altura, espesor_techo, n_y, n_z)
+    solver = SolverSeccion(malla, sigma, modelo)
+    kx = solver.barrido(freq)
+    return -DB_NEPER * kx.imag * longitud, kx, solver
+
+def comparar_con_empirico(freq, h, espesor, altura, sigma, longitud=1.0, n_y=200, modelo='delany_bazley'):
+    """
+    Atenuación numérica frente a la de acoustics.py / models.py para el
+    mismo canal: SplitterSilencer con la absorción difusa de la capa
+    (materials.absorcion_poroso), un paso de canal 2h + 2·espesor y
+    delta_L_additional. Devuelve un diccionario de arreglos (n_freq,)
+    """
+    from app.simulation.materials import absorcion_poroso
+    from app.simulation.models import SplitterSilencer
+
+    freq = np.asarray(freq, dtype=float)
+    numerica, kx, solver = atenuacion_canal(freq, h, espesor, altura, sigma, longitud, n_y=n_y, modelo=modelo)
+    alpha = np.clip(absorcion_poroso(freq, sigma, espesor, modelo), 0.0, 1.0)
+    paso = 2 * h + 2 * espesor
+    # Un solo canal: SplitterSilencer con un ancho igual al paso y sin baffles
+    splitter = SplitterSilencer(longitud, paso, 0, alpha)
+    return {
+        'freq': freq,
+        'numerica': numerica,
+        'kx': kx,
+        'TL': splitter.transmission_loss(freq),
+        'delta_L': splitter.delta_L(freq),
+        'TL_total': splitter.total_attenuation(freq),
+        'factorizaciones': solver.n_factorizaciones,
+    }
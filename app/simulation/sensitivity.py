@@ -0,0 +1,176 @@
+# --------------------------------------------
+# sensitivity.py
+# Análisis de sensibilidad de la atenuación a los parámetros de entrada
+# --------------------------------------------
+
+# --------------------------------------------
+# Importar librerías necesarias
+# --------------------------------------------
+
+import numpy as np
+from app.simulation.solver import calcular_parametros_lote
+from app.simulation.models import SplitterSilencer
+
+# Parámetros analizados (entradas de calcular_parametros); 'alpha' es un
+# factor multiplicativo sobre la curva de absorción del material
+PARAMETROS = ('Q_m3h', 'V', 'H', 'L', 'alpha', 'baffle_thickness', 'wall_thickness')
+UNIDADES = {'Q_m3h': 'm³/h', 'V': 'm/s', 'H': 'm', 'L': 'm', 'alpha': '-',
+            'baffle_thickness': 'm', 'wall_thickness': 'm'}
+
+BANDAS_OCTAVA = (125, 250, 500)  # Frecuencias centrales de las bandas de octava [Hz]
+
+# --------------------------------------------
+# Evalúa TL_total para una matriz de diseños (N, n_parametros) en una sola llamada
+# --------------------------------------------
+def evaluar_lote(X, freq, alpha_interp, fmax, n_espacios_continuo=False, tam_bloque=8192):
+    """
+    Devuelve TL_total (N, n_freq) para cada fila de X, cuyas columnas siguen
+    el orden de PARAMETROS. Se procesa por bloques para acotar la memoria
+    """
+    X = np.atleast_2d(np.asarray(X, dtype=float))
+    TL_total = np.empty((X.shape[0], len(freq)))
+    for inicio in range(0, X.shape[0], tam_bloque):
+        bloque = X[inicio:inicio + tam_bloque]
+        Q_m3h, V, H, L, factor_alpha, t_baffle, t_pared = bloque.T
+        geo = calcular_parametros_lote(Q_m3h, V, H, L, freq[0], fmax,
+                                       baffle_thickness=t_baffle, wall_thickness=t_pared,
+                                       n_espacios_continuo=n_espacios_continuo)
+        alpha = alpha_interp[None, :] * factor_alpha[:, None]
+        splitter = SplitterSilencer(geo['L'][:, None], geo['width'][:, None],
+                                    geo['n_baffles'][:, None], alpha)
+        TL_total[inicio:inicio + tam_bloque] = splitter.total_attenuation(freq)
+    return TL_total
+
+# --------------------------------------------
+# Promedia una magnitud (..., n_freq) dentro de cada banda de octava
+# --------------------------------------------
+def promedio_por_banda(freq, valores, bandas=BANDAS_OCTAVA):
+    resultado = []
+    for fc in bandas:
+        mascara = (freq >= fc / np.sqrt(2)) & (freq < fc * np.sqrt(2))
+        resultado.append(valores[..., mascara].mean(axis=-1) if mascara.any() else np.full(valores.shape[:-1], np.nan))
+    return np.stack(resultado, axis=-1)
+
+# --------------------------------------------
+# Vector de parámetros nominales a partir de un resultado de calcular_parametros
+# --------------------------------------------
+def _nominales(params):
+    V = params['Q'] / params['S']  # Velocidad de paso recuperada de S = Q/V
+    return np.array([params['Q'] * 3600, V, params['H'], params['L'], 1.0,
+                     params['baffle_thickness'], params['wall_thickness']])
+
+# --------------------------------------------
+# Sensibilidad local ∂TL_total/∂parámetro por diferencias centrales
+# --------------------------------------------
+def sensibilidad_local(params, paso_relativo=1e-3, n_espacios_continuo=True):
+    """
+    Evalúa las 2·P perturbaciones y el punto nominal en una única llamada por
+    lotes. Por defecto el número de rendijas se trata como continuo, ya que
+    con el redondeo entero la derivada respecto a Q, V y H es cero casi en
+    todas partes
+    """
+    freq = params['freq']
+    x0 = _nominales(params)
+    pasos = paso_relativo * np.abs(x0)
+
+    # Filas: nominal, +δ por parámetro, -δ por parámetro
+    X = np.repeat(x0[None, :], 1 + 2 * len(x0), axis=0)
+    idx = np.arange(len(x0))
+    X[1 + idx, idx] += pasos
+    X[1 + len(x0) + idx, idx] -= pasos
+
+    TL = evaluar_lote(X, freq, params['alpha_interp'], freq[-1], n_espacios_continuo)
+    TL_nominal = TL[0]
+    derivadas = (TL[1:1 + len(x0)] - TL[1 + len(x0):]) / (2 * pasos[:, None])
+
+    # Elasticidad adimensional: cambio relativo de TL por cambio relativo del parámetro
+    elasticidad = derivadas * x0[:, None] / np.where(TL_nominal != 0, TL_nominal, 1)[None, :]
+
+    return {
+        'freq': freq,
+        'nominales': x0,
+        'TL_total': TL_nominal,
+        'derivadas': derivadas,
+        'derivadas_banda': promedio_por_banda(freq, derivadas),
+        'elasticidad_banda': promedio_por_banda(freq, elasticidad),
+    }
+
+# --------------------------------------------
+# Índices de Sobol (primer orden y totales) por banda de octava
+# --------------------------------------------
+def sensibilidad_global(params, n_muestras=2048, rango_relativo=0.10, semilla=None,
+                        n_espacios_continuo=False):
+    """
+    Muestrea cada parámetro uniformemente en ±rango_relativo de su valor
+    nominal y estima los índices de Sobol con los estimadores de Saltelli
+    (primer orden) y Jansen (total). Las N·(P+2) evaluaciones de las matrices
+    A, B y AB_i se hacen en una sola llamada por lotes
+    """
+    rng = np.random.default_rng(semilla)
+    freq = params['freq']
+    x0 = _nominales(params)
+    P = len(x0)
+    bajo, alto = x0 * (1 - rango_relativo), x0 * (1 + rango_relativo)
+
+    A = bajo + (alto - bajo) * rng.random((n_muestras, P))
+    B = bajo + (alto - bajo) * rng.random((n_muestras, P))
+    AB = np.repeat(A[None, :, :], P, axis=0)
+    AB[np.arange(P), :, np.arange(P)] = B[:, np.arange(P)].T
+
+    X = np.concatenate([A, B, AB.reshape(-1, P)])
+    TL = evaluar_lote(X, freq, params['alpha_interp'], freq[-1], n_espacios_continuo)
+    Y = promedio_por_banda(freq, TL)  # (N·(P+2), n_bandas)
+
+    f_A, f_B = Y[:n_muestras], Y[n_muestras:2 * n_muestras]
+    f_AB = Y[2 * n_muestras:].reshape(P, n_muestras, -1)
+    varianza = np.concatenate([f_A, f_B]).var(axis=0)
+    varianza = np.where(varianza > 0, varianza, np.nan)
+
+    primer_orden = np.mean(f_B[None] * (f_AB - f_A[None]), axis=1) / varianza
+    total = 0.5 * np.mean((f_A[None] - f_AB) ** 2, axis=1) / varianza
+
+    return {
+        'n_muestras': n_muestras,
+        'rango_relativo': rango_relativo,
+        'varianza_banda': varianza,
+        'sobol_primer_orden': primer_orden,
+        'sobol_total': total,
+    }
+
+# --------------------------------------------
+# Genera el reporte de sensibilidad completo en texto
+# --------------------------------------------
+def formatear_reporte(local, global_=None):
+    lineas = ["REPORTE DE SENSIBILIDAD - SILENCIADOR TIPO SPLITTER",
+              "===================================================", ""]
+    encabezado = "".join(f"{fc:>14d} Hz" for fc in BANDAS_OCTAVA)
+
+    lineas.append("DERIVADAS LOCALES ∂TL_total/∂p [dB por unidad] (promedio por banda de octava):")
+    lineas.append(f"{'Parámetro':<22}{'Nominal':>12}" + encabezado)
+    for i, nombre in enumerate(PARAMETROS):
+        valores = "".join(f"{v:>17.4g}" for v in local['derivadas_banda'][i])
+        lineas.append(f"{nombre + ' [' + UNIDADES[nombre] + ']':<22}{local['nominales'][i]:>12.4g}" + valores)
+
+    lineas += ["", "ELASTICIDAD (∂TL/TL)/(∂p/p) [-]:", f"{'Parámetro':<34}" + encabezado]
+    for i, nombre in enumerate(PARAMETROS):
+        lineas.append(f"{nombre:<34}" + "".join(f"{v:>17.4f}" for v in local['elasticidad_banda'][i]))
+
+    if global_ is not None:
+        lineas += ["", f"ÍNDICES DE SOBOL ({global_['n_muestras']} muestras, ±{global_['rango_relativo']*100:.0f}% del nominal):",
+                   f"{'Parámetro':<22}{'':>12}" + "".join(f"{fc:>8d} S1/ST" for fc in BANDAS_OCTAVA)]
+        for i, nombre in enumerate(PARAMETROS):
+            valores = "".join(f"{s1:>8.3f}/{st:<5.3f}" for s1, st in
+                              zip(global_['sobol_primer_orden'][i], global_['sobol_total'][i]))
+            lineas.append(f"{nombre:<34}" + valores)
+
+    return "\n".join(lineas) + "\n"
+
+# --------------------------------------------
+# Calcula y exporta el reporte de sensibilidad a un archivo de texto
+# --------------------------------------------
+def exportar_reporte_sensibilidad(params, ruta, n_muestras=2048, semilla=None):
+    local = sensibilidad_local(params)
+    global_ = sensibilidad_global(params, n_muestras=n_muestras, semilla=semilla)
+    with open(ruta, 'w', encoding='utf-8') as f:
+        f.write(formatear_reporte(local, global_))
+    return ruta
@@ -4,13 +4,30 @@
 # --------------------------------------------
 
 import numpy as np
+from app.simulation.materials import absorcion_poroso
+from app.simulation.pressure import caida_presion
+from app.simulation.geometria import ancho_envolvente
+from app.simulation.precision import tipo_real
+from app.simulation.resultados import ParametrosDiseno, LoteDisenos
+
+# Coeficientes de absorción tabulados de los materiales
+FREQS_MATERIAL = np.array([125, 250, 500])
+ALPHAS_MATERIALES = {
+    'lana50': np.array([0.19, 0.43, 0.77]),
+    'lana70': np.array([0.33, 0.65, 0.88]),
+    'lana100': np.array([0.54, 0.87, 1.00])
+}
 
 # --------------------------------------------
 # Calcula todos los parámetros geométricos y acústicos necesarios para el silenciador tipo splitter
 # --------------------------------------------
-def calcular_parametros(Q_m3h, V, H, L, fmin=100, fmax=500, material='lana100'):
+def calcular_parametros(Q_m3h, V, H, L, fmin=100, fmax=500, material='lana100',
+                        baffle_thickness=0.02, wall_thickness=0.005):
     """
-    Calcula todos los parámetros geométricos del silenciador
+    Calcula todos los parámetros geométricos del silenciador.
+    baffle_thickness (2 cm) y wall_thickness (5 mm) son los espesores de
+    cada baffle y de las paredes del enclosure [m]. Devuelve un
+    ParametrosDiseno (se indexa igual que el diccionario de antes)
     """
     # Conversiones básicas
     Q = Q_m3h / 3600  # m³/s
@@ -28,46 +45,95 @@ def calcular_parametros(Q_m3h, V, H, L, fmin=100, fmax=500, material='lana100'):
     # Número de baffles
     n_baffles = n_espacios - 1  # Corregir: n espacios requiere n-1 baffles
     
-    # Espesor de cada baffle
-    baffle_thickness = 0.02  # 2 cm
-    
-    # Ancho total del enclosure (incluyendo paredes)
-    wall_thickness = 0.005  # 5 mm de pared
-    
-    # Ancho interior necesario para baffles y espacios
-    interior_width_needed = n_baffles * baffle_thickness + n_espacios * (2 * h)
-    
-    # Ancho total del enclosure
-    width = interior_width_needed + 2 * wall_thickness
+    # Ancho interior necesario para baffles y espacios, y ancho total del enclosure
+    interior_width_needed, width = ancho_envolvente(n_espacios, 2 * h, baffle_thickness, wall_thickness)
     
     # Frecuencias para la simulación
     freq = np.linspace(fmin, fmax, 300)
     
     # Coeficientes de absorción del material
-    freqs_material = np.array([125, 250, 500])
-    alphas_dict = {
-        'lana50': np.array([0.19, 0.43, 0.77]),
-        'lana70': np.array([0.33, 0.65, 0.88]),
-        'lana100': np.array([0.54, 0.87, 1.00])
-    }
-    alpha_interp = np.interp(freq, freqs_material, alphas_dict[material])
+    alpha_interp = np.interp(freq, FREQS_MATERIAL, ALPHAS_MATERIALES[material])
     
-    return {
-        'Q': Q,
-        'S': S,
-        'h': h,
-        'n_espacios': n_espacios,
-        'n_baffles': n_baffles,
-        'width': width,
-        'L': L,
-        'H': H,
-        'baffle_thickness': baffle_thickness,
-        'wall_thickness': wall_thickness,
-        'interior_width': interior_width_needed,
-        'freq': freq,
-        'alpha_interp': alpha_interp,
-        'material': material
-    }
+    # Velocidad de paso y caída de presión a través de las rendijas
+    presion = caida_presion(Q, width, H, n_espacios, h, L, wall_thickness)
+    
+    return ParametrosDiseno(
+        Q=Q,
+        S=S,
+        h=h,
+        n_espacios=n_espacios,
+        n_baffles=n_baffles,
+        width=width,
+        L=L,
+        H=H,
+        baffle_thickness=baffle_thickness,
+        wall_thickness=wall_thickness,
+        interior_width=interior_width_needed,
+        freq=freq,
+        alpha_interp=alpha_interp,
+        material=material,
+        **{clave: float(valor) for clave, valor in presion.items()}
+    )
+
+# --------------------------------------------
+# Versión vectorizada de calcular_parametros para lotes de diseños
+# --------------------------------------------
+def calcular_parametros_lote(Q_m3h, V, H, L, fmin=100, fmax=500, material='lana100',
+                             baffle_thickness=0.02, wall_thickness=0.005, n_espacios_continuo=False,
+                             dtype=None):
+    """
+    Calcula los parámetros geométricos de N diseños a la vez. Q_m3h, V, H, L,
+    baffle_thickness y wall_thickness pueden ser escalares o arreglos (N,);
+    si todos son escalares el lote tiene un solo diseño (N = 1).
+    Con n_espacios_continuo=True no se redondea el número de rendijas, lo que
+    hace derivable el modelo (útil para análisis de sensibilidad).
+    dtype=float32 devuelve todos los arreglos en simple precisión (ver
+    precision.py); el redondeo de n_espacios se hace siempre en float64 para
+    que el número de rendijas no dependa de la precisión. Devuelve un
+    LoteDisenos (estructura de arreglos)
+    """
+    dtype = tipo_real(dtype)
+    entradas = np.broadcast_arrays(
+        *(np.atleast_1d(np.asarray(x, dtype=float)) for x in (Q_m3h, V, H, L, baffle_thickness, wall_thickness)))
+
+    c = 343
+    h = (c / fmax) / 8 / 2
+
+    # Número de rendijas con las entradas en float64, antes de reducir la precisión
+    n_espacios = entradas[0] / 3600 / entradas[1] / (entradas[2] * 2 * h)
+    if not n_espacios_continuo:
+        n_espacios = np.ceil(n_espacios)
+    Q_m3h, V, H, L, baffle_thickness, wall_thickness = (x.astype(dtype, copy=False) for x in entradas)
+    n_espacios = n_espacios.astype(dtype, copy=False)
+
+    Q = Q_m3h / 3600
+    S = Q / V
+    n_baffles = n_espacios - 1
+
+    interior_width_needed, width = ancho_envolvente(n_espacios, 2 * h, baffle_thickness, wall_thickness)
+
+    freq = np.linspace(fmin, fmax, 300, dtype=dtype)
+    alpha_interp = np.interp(freq, FREQS_MATERIAL, ALPHAS_MATERIALES[material]).astype(dtype)
+
+    presion = caida_presion(Q, width, H, n_espacios, h, L, wall_thickness)
+
+    return LoteDisenos(
+        Q=Q,
+        S=S,
+        h=h,
+        n_espacios=n_espacios,
+        n_baffles=n_baffles,
+        width=width,
+        L=L,
+        H=H,
+        baffle_thickness=baffle_thickness,
+        wall_thickness=wall_thickness,
+        interior_width=interior_width_needed,
+        freq=freq,
+        alpha_interp=alpha_interp,
+        material=material,
+        **presion
+    )
 
 def calcular_parametros_custom(Q_m3h, V, H, L, fmin, fmax, custom_freqs, custom_alphas):
     """
@@ -81,4 +147,18 @@ def calcular_parametros_custom(Q_m3h, V, H, L, fmin, fmax, custom_freqs, custom_
     params['alpha_interp'] = np.interp(freq, custom_freqs, custom_alphas)
     params['material'] = 'Personalizado'
     
-    return params
\ No newline at end of file
+    return params
+
+def calcular_parametros_poroso(Q_m3h, V, H, L, fmin, fmax, sigma, espesor, modelo='delany_bazley'):
+    """
+    Calcula todos los parámetros geométricos del silenciador con un recubrimiento
+    poroso definido por su resistividad al flujo sigma [Pa·s/m²] y espesor [m]
+    """
+    params = calcular_parametros(Q_m3h, V, H, L, fmin, fmax, 'lana50')  # Base con un material cualquiera
+
+    # Reemplazar la absorción tabulada por la del modelo empírico
+    freq = params['freq']
+    params['alpha_interp'] = absorcion_poroso(freq, sigma, espesor, modelo)
+    params['material'] = f"Poroso σ={sigma:.0f} Pa·s/m², d={espesor*1000:.0f} mm"
+
+    return params
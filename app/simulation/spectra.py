@@ -0,0 +1,243 @@
+# --------------------------------------------
+# spectra.py
+# Espectros de ruido de ventiladores: atenuación por bandas, dB(A), NR y NC
+# --------------------------------------------
+
+# --------------------------------------------
+# Importar librerías necesarias
+# --------------------------------------------
+
+import csv
+import numpy as np
+from app.simulation.solver import calcular_parametros_lote, FREQS_MATERIAL, ALPHAS_MATERIALES
+from app.simulation.models import SplitterSilencer
+
+# Frecuencias centrales nominales [Hz]
+OCTAVAS = np.array([31.5, 63, 125, 250, 500, 1000, 2000, 4000, 8000])
+TERCIOS = np.array([25, 31.5, 40, 50, 63, 80, 100, 125, 160, 200, 250, 315, 400, 500, 630, 800,
+                    1000, 1250, 1600, 2000, 2500, 3150, 4000, 5000, 6300, 8000, 10000])
+
+# Curvas NR (ISO R1996): L_banda = a + b·NR en las bandas de octava de OCTAVAS
+NR_A = np.array([55.4, 35.5, 22.0, 12.0, 4.8, 0.0, -3.5, -6.1, -8.0])
+NR_B = np.array([0.681, 0.790, 0.870, 0.930, 0.974, 1.000, 1.015, 1.025, 1.030])
+
+# Curvas NC (Beranek) en las octavas de 63 a 8000 Hz, una fila por índice NC
+NC_INDICES = np.arange(15, 75, 5)
+NC_CURVAS = np.array([
+    [47, 36, 29, 22, 17, 14, 12, 11],
+    [51, 40, 33, 26, 22, 19, 17, 16],
+    [54, 44, 37, 31, 27, 24, 22, 21],
+    [57, 48, 41, 35, 31, 29, 28, 27],
+    [60, 52, 45, 40, 36, 34, 33, 32],
+    [64, 56, 50, 45, 41, 39, 38, 37],
+    [67, 60, 54, 49, 46, 44, 43, 42],
+    [71, 64, 58, 54, 51, 49, 48, 47],
+    [74, 67, 62, 58, 56, 54, 53, 52],
+    [77, 71, 67, 63, 61, 59, 58, 57],
+    [80, 75, 71, 68, 66, 64, 63, 62],
+    [83, 79, 75, 72, 71, 70, 69, 68],
+], dtype=float)
+
+# --------------------------------------------
+# Frecuencias centrales exactas (base 10) de las bandas nominales
+# --------------------------------------------
+def centros_exactos(bandas, fraccion):
+    """fraccion = 1 para octavas, 3 para tercios de octava"""
+    k = np.round(fraccion * 10 / 3 * np.log10(np.asarray(bandas) / 1000))
+    return 1000 * 10 ** (3 * k / (10 * fraccion))
+
+def _fraccion(bandas):
+    """Detecta si las bandas son de octava (1) o de tercio de octava (3)"""
+    bandas = np.asarray(bandas, dtype=float)
+    if np.isin(bandas, OCTAVAS).all() and (len(bandas) < 2 or np.allclose(np.diff(np.log2(bandas)), 1, atol=0.05)):
+        return 1
+    if np.isin(bandas, TERCIOS).all():
+        return 3
+    raise ValueError(f"Bandas no reconocidas (ni octavas ni tercios nominales): {bandas.tolist()}")
+
+# --------------------------------------------
+# Ponderación A (IEC 61672) en las frecuencias dadas [dB]
+# --------------------------------------------
+def ponderacion_A(f):
+    f2 = np.asarray(f, dtype=float) ** 2
+    ra = 12194.0**2 * f2**2 / ((f2 + 20.6**2) * np.sqrt((f2 + 107.7**2) * (f2 + 737.9**2)) * (f2 + 12194.0**2))
+    return 20 * np.log10(ra) + 2.00
+
+# --------------------------------------------
+# Suma energética de niveles en dB a lo largo de un eje
+# --------------------------------------------
+def suma_energetica(niveles, axis=-1):
+    return 10 * np.log10(np.sum(10 ** (np.asarray(niveles) / 10), axis=axis))
+
+# --------------------------------------------
+# Agrupa tercios de octava en octavas (suma energética de cada terna)
+# --------------------------------------------
+def tercios_a_octavas(bandas, niveles):
+    """Devuelve (octavas, niveles (..., n_octavas)); solo octavas con sus tres tercios"""
+    bandas = list(np.asarray(bandas, dtype=float))
+    octavas, columnas = [], []
+    for fc in OCTAVAS:
+        k = int(np.flatnonzero(TERCIOS == fc)[0])
+        tercios = TERCIOS[max(k - 1, 0):k + 2]
+        if len(tercios) == 3 and all(t in bandas for t in tercios):
+            octavas.append(fc)
+            columnas.append(suma_energetica(niveles[..., [bandas.index(t) for t in tercios]]))
+    return np.array(octavas), np.stack(columnas, axis=-1)
+
+# --------------------------------------------
+# Lee espectros de potencia sonora (uno por fila) de un CSV
+# --------------------------------------------
+def leer_espectros_csv(ruta):
+    """
+    Primera fila: nombre de la columna de identificación seguido de las
+    frecuencias centrales (octavas o tercios nominales). Acepta ',' o ';'
+    como separador y coma decimal cuando el separador es ';'. Devuelve
+    {'nombres', 'bandas', 'Lw' (n, n_bandas)}
+    """
+    with open(ruta, newline='', encoding='utf-8-sig') as f:
+        muestra = f.read(4096)
+        f.seek(0)
+        separador = ';' if muestra.count(';') > muestra.count(',') else ','
+        filas = [fila for fila in csv.reader(f, delimiter=separador) if fila and any(c.strip() for c in fila)]
+
+    def numero(texto):
+        texto = texto.strip()
+        return float(texto.replace(',', '.') if separador == ';' else texto)
+
+    bandas = np.array([numero(c) for c in filas[0][1:]])
+    _fraccion(bandas)
+    nombres = [fila[0].strip() for fila in filas[1:]]
+    Lw = np.array([[numero(c) for c in fila[1:]] for fila in filas[1:]], dtype=float)
+    return {'nombres': nombres, 'bandas': bandas, 'Lw': Lw}
+
+# --------------------------------------------
+# Matriz de promedios por banda sobre la malla de frecuencias del solver
+# --------------------------------------------
+def _pesos_bandas(freq, bandas):
+    """(n_bandas, n_freq): promedio de las muestras de freq dentro de cada banda"""
+    fraccion = _fraccion(bandas)
+    centros = centros_exactos(bandas, fraccion)
+    ancho = 2 ** (1 / (2 * fraccion))
+    mascara = (freq >= centros[:, None] / ancho) & (freq < centros[:, None] * ancho)
+    cuenta = mascara.sum(axis=1, keepdims=True)
+    return mascara / np.maximum(cuenta, 1), cuenta[:, 0] > 0
+
+# --------------------------------------------
+# Atenuación por banda a partir de curvas TL_total (..., n_freq)
+# --------------------------------------------
+def atenuacion_por_banda(freq, TL_total, bandas, fuera_de_rango=0.0):
+    """
+    Promedio energético de la transmisión 10^(-TL/10) dentro de cada banda
+    (espectro plano dentro de la banda). Las bandas sin ninguna frecuencia
+    simulada reciben 'fuera_de_rango' dB (0 por defecto: no se supone
+    atenuación fuera del rango del modelo)
+    """
+    pesos, cubiertas = _pesos_bandas(np.asarray(freq), bandas)
+    transmision = 10 ** (-np.asarray(TL_total) / 10) @ pesos.T
+    with np.errstate(divide='ignore'):
+        D = -10 * np.log10(transmision)
+    return np.where(cubiertas, D, fuera_de_rango)
+
+# --------------------------------------------
+# Atenuación por banda de un catálogo de silenciadores (sin guardar las curvas)
+# --------------------------------------------
+def atenuacion_catalogo(Q_m3h, V, H, L, bandas, fmin=100, fmax=500, material='lana100', tam_bloque=4096,
+                        fuera_de_rango=0.0):
+    """
+    Q_m3h, V, H y L escalares o arreglos (N,). Evalúa los diseños por
+    bloques con calcular_parametros_lote y SplitterSilencer y devuelve
+    (N, n_bandas) más la geometría del catálogo
+    """
+    geo = calcular_parametros_lote(Q_m3h, V, H, L, fmin, fmax, material)
+    freq = geo['freq']
+    alpha = np.interp(freq, FREQS_MATERIAL, ALPHAS_MATERIALES[material])
+    pesos, cubiertas = _pesos_bandas(freq, bandas)
+
+    n = len(geo['L'])
+    D = np.empty((n, len(bandas)))
+    for inicio in range(0, n, tam_bloque):
+        s = slice(inicio, inicio + tam_bloque)
+        splitter = SplitterSilencer(geo['L'][s, None], geo['width'][s, None], geo['n_baffles'][s, None], alpha)
+        with np.errstate(divide='ignore'):
+            D[s] = -10 * np.log10(10 ** (-splitter.total_attenuation(freq) / 10) @ pesos.T)
+    return np.where(cubiertas, D, fuera_de_rango), geo
+
+# --------------------------------------------
+# Interpolación lineal con extrapolación por los segmentos extremos
+# --------------------------------------------
+def _interp_extrapolado(x, xp, fp):
+    y = np.interp(x, xp, fp)
+    bajo, alto = x < xp[0], x > xp[-1]
+    y = np.where(bajo, fp[0] + (x - xp[0]) * (fp[1] - fp[0]) / (xp[1] - xp[0]), y)
+    return np.where(alto, fp[-1] + (x - xp[-1]) * (fp[-1] - fp[-2]) / (xp[-1] - xp[-2]), y)
+
+# --------------------------------------------
+# Índices NR y NC de espectros por octava (..., n_octavas)
+# --------------------------------------------
+def indice_NR(octavas, niveles):
+    """NR: máximo por banda de (L - a) / b, redondeado hacia arriba"""
+    i = np.searchsorted(OCTAVAS, octavas)
+    return np.ceil(np.max((niveles - NR_A[i]) / NR_B[i], axis=-1))
+
+def indice_NC(octavas, niveles):
+    """NC por tangencia: interpola cada banda entre curvas y toma el máximo"""
+    nc = np.full(np.shape(niveles)[:-1], -np.inf)
+    for j, fc in enumerate(octavas):
+        if fc in OCTAVAS[1:]:
+            columna = NC_CURVAS[:, list(OCTAVAS[1:]).index(fc)]
+            nc = np.maximum(nc, _interp_extrapolado(niveles[..., j], columna, NC_INDICES))
+    return np.ceil(nc)
+
+# --------------------------------------------
+# Evalúa todos los pares ventilador × silenciador en una pasada vectorizada
+# --------------------------------------------
+def evaluar_pares(Lw, D, bandas, correccion=0.0, tam_bloque=1024, espectros=False):
+    """
+    Lw (n_vent, n_bandas) potencia sonora de los ventiladores, D (n_sil,
+    n_bandas) atenuación por banda de los silenciadores (ver
+    atenuacion_catalogo). 'correccion' (escalar o por banda) convierte el
+    nivel residual en el nivel de presión al que se aplican dB(A), NR y NC
+    (p. ej. efecto de sala y distancia; 0 los evalúa sobre Lw).
+
+    dB(A) se obtiene con un producto de matrices: la energía ponderada del
+    ventilador por la transmisión del silenciador. NR y NC se calculan por
+    banda sobre bloques de silenciadores, sin formar el arreglo de
+    espectros (n_vent, n_sil, n_bandas) salvo con espectros=True.
+    Devuelve dBA, NR y NC (n_vent, n_sil) y, si se piden, los espectros
+    """
+    Lw, D = np.atleast_2d(Lw), np.atleast_2d(D)
+    bandas = np.asarray(bandas, dtype=float)
+    fraccion = _fraccion(bandas)
+    correccion = np.broadcast_to(np.asarray(correccion, dtype=float), bandas.shape)
+
+    A = ponderacion_A(centros_exactos(bandas, fraccion))
+    dBA = 10 * np.log10(10 ** ((Lw + correccion + A) / 10) @ (10 ** (-D / 10)).T)
+
+    n_vent, n_sil = len(Lw), len(D)
+    NR = np.empty((n_vent, n_sil))
+    NC = np.empty((n_vent, n_sil))
+    residuales = np.empty((n_vent, n_sil, len(bandas))) if espectros else None
+    for inicio in range(0, n_sil, tam_bloque):
+        s = slice(inicio, inicio + tam_bloque)
+        L = Lw[:, None, :] - D[None, s, :] + correccion
+        if espectros:
+            residuales[:, s] = L - correccion
+        octavas, L_oct = (bandas, L) if fraccion == 1 else tercios_a_octavas(bandas, L)
+        NR[:, s] = indice_NR(octavas, L_oct)
+        NC[:, s] = indice_NC(octavas, L_oct)
+
+    resultado = {'dBA': dBA, 'NR': NR, 'NC': NC}
+    if espectros:
+        resultado['residual'] = residuales
+    return resultado
+
+# --------------------------------------------
+# Mejor silenciador por ventilador según un criterio (con restricción opcional)
+# --------------------------------------------
+def mejor_por_ventilador(resultado, criterio='dBA', admisibles=None):
+    """admisibles es una máscara (n_sil,), p. ej. caída de presión máxima"""
+    valores = resultado[criterio]
+    if admisibles is not None:
+        valores = np.where(admisibles[None, :], valores, np.inf)
+    indices = np.argmin(valores, axis=1)
+    return indices, np.take_along_axis(valores, indices[:, None], axis=1)[:, 0]
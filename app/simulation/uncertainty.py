@@ -0,0 +1,174 @@
+# --------------------------------------------
+# uncertainty.py
+# Análisis de incertidumbre Monte Carlo con estadísticas en streaming
+# --------------------------------------------
+
+# --------------------------------------------
+# Importar librerías necesarias
+# --------------------------------------------
+
+import numpy as np
+from app.simulation.models import SplitterSilencer
+from app.simulation.precision import tipo_real
+from app.simulation.geometria import ancho_envolvente
+
+FRECUENCIAS_ANCLA = np.array([125, 250, 500])  # Frecuencias tabuladas de los materiales [Hz]
+
+# --------------------------------------------
+# Media y varianza por frecuencia con el algoritmo de Welford (por bloques)
+# --------------------------------------------
+class EstadisticaWelford:
+    def __init__(self, n_freq):
+        self.n = 0
+        self.media = np.zeros(n_freq)
+        self.M2 = np.zeros(n_freq)
+
+    # --------------------------------------------
+    # Acumula un bloque (n_muestras, n_freq) combinándolo con la fórmula de Chan
+    # --------------------------------------------
+    def actualizar(self, bloque):
+        n_b = bloque.shape[0]
+        if n_b == 0:
+            return
+        # Acumuladores en float64 aunque el bloque venga en float32
+        media_b = bloque.mean(axis=0, dtype=np.float64)
+        M2_b = ((bloque - media_b) ** 2).sum(axis=0)
+
+        n_total = self.n + n_b
+        delta = media_b - self.media
+        self.media = self.media + delta * (n_b / n_total)
+        self.M2 = self.M2 + M2_b + delta ** 2 * (self.n * n_b / n_total)
+        self.n = n_total
+
+    @property
+    def varianza(self):
+        if self.n < 2:
+            return np.zeros_like(self.M2)
+        return self.M2 / (self.n - 1)
+
+# --------------------------------------------
+# Histograma por frecuencia para estimar percentiles con memoria acotada
+# --------------------------------------------
+class HistogramaCuantiles:
+    def __init__(self, n_freq, n_bins=2048):
+        self.n_freq = n_freq
+        self.n_bins = n_bins
+        self.conteos = None
+        self.limite_inf = None
+        self.ancho_bin = None
+
+    # --------------------------------------------
+    # Acumula un bloque; el rango inicial sale del primer bloque y se
+    # amplía si un bloque posterior cae fuera de él
+    # --------------------------------------------
+    def actualizar(self, bloque):
+        if bloque.shape[0] == 0:
+            return
+        bajo, alto = bloque.min(axis=0).astype(np.float64), bloque.max(axis=0).astype(np.float64)
+        if self.conteos is None:
+            margen = np.maximum(alto - bajo, 1e-6)  # Holgura para muestras fuera del primer bloque
+            self.limite_inf = bajo - margen
+            self.ancho_bin = 3 * margen / self.n_bins
+            self.conteos = np.zeros((self.n_freq, self.n_bins), dtype=np.int64)
+        elif np.any(bajo < self.limite_inf) or np.any(alto >= self.limite_inf + self.n_bins * self.ancho_bin):
+            self._ampliar(bajo, alto)
+
+        # Índice de bin por muestra (el recorte solo absorbe el redondeo en los bordes)
+        idx = ((bloque - self.limite_inf) / self.ancho_bin).astype(np.int64)
+        np.clip(idx, 0, self.n_bins - 1, out=idx)
+        idx += np.arange(self.n_freq) * self.n_bins
+        self.conteos += np.bincount(idx.ravel(), minlength=self.n_freq * self.n_bins).reshape(self.n_freq, self.n_bins)
+
+    # --------------------------------------------
+    # Amplía el rango hasta cubrir [bajo, alto] sin perder los conteos
+    # --------------------------------------------
+    def _ampliar(self, bajo, alto):
+        """
+        Por frecuencia, el ancho de bin se multiplica por una potencia de 2
+        (k) y el límite inferior baja un número entero de bins antiguos (m):
+        cada bin antiguo cae entero en un bin nuevo y los conteos se
+        reagrupan sin error. La holgura sobrante queda del lado desbordado
+        """
+        n = self.n_bins
+        m = np.maximum(np.ceil((self.limite_inf - bajo) / self.ancho_bin), 0).astype(np.int64)
+        arriba = np.maximum(np.floor((alto - self.limite_inf) / self.ancho_bin).astype(np.int64) + 1, n)
+        k = 2 ** np.ceil(np.log2(-(-(m + arriba) // n))).astype(np.int64)
+        holgura = n * k - m - arriba
+        m += np.where(arriba > n, np.where(m > 0, holgura // 2, 0), holgura * (m > 0))
+
+        j = np.arange(n)[None, :]
+        idx = (j + m[:, None]) // k[:, None] + np.arange(self.n_freq)[:, None] * n
+        reagrupados = np.bincount(idx.ravel(), self.conteos.ravel(), minlength=self.n_freq * n)
+        self.conteos = reagrupados.astype(np.int64).reshape(self.n_freq, n)
+        self.limite_inf = self.limite_inf - m * self.ancho_bin
+        self.ancho_bin = self.ancho_bin * k
+
+    # --------------------------------------------
+    # Percentil q (0-100) por frecuencia interpolando dentro del bin
+    # --------------------------------------------
+    def percentil(self, q):
+        acumulado = np.cumsum(self.conteos, axis=1)
+        objetivo = acumulado[:, -1] * q / 100
+        i = np.minimum((acumulado < objetivo[:, None]).sum(axis=1), self.n_bins - 1)
+        filas = np.arange(self.n_freq)
+        previo = np.where(i > 0, acumulado[filas, i - 1], 0)
+        en_bin = np.maximum(self.conteos[filas, i], 1)
+        fraccion = np.clip((objetivo - previo) / en_bin, 0, 1)
+        return self.limite_inf + (i + fraccion) * self.ancho_bin
+
+# --------------------------------------------
+# Ejecuta el análisis Monte Carlo sobre un diseño de calcular_parametros
+# --------------------------------------------
+def monte_carlo(params, n_muestras=100000, sigma_alpha=0.05, sigma_espesor=0.001,
+                percentiles=(5, 50, 95), tam_bloque=10000, semilla=None, dtype=None):
+    """
+    Muestrea la absorción del material (perturbación normal de desviación
+    sigma_alpha en cada frecuencia ancla, interpolada entre ellas) y el espesor
+    de baffle (normal de desviación sigma_espesor [m]) y evalúa SplitterSilencer
+    por bloques. Media, varianza y percentiles de TL_total se acumulan en
+    streaming, por lo que la memoria no depende de n_muestras. Con
+    dtype=float32 los bloques de muestras se generan y evalúan en simple
+    precisión; las estadísticas se acumulan siempre en float64
+    """
+    dtype = tipo_real(dtype)
+    rng = np.random.default_rng(semilla)
+    freq = np.asarray(params['freq'], dtype=dtype)
+    alpha_nominal = np.asarray(params['alpha_interp'], dtype=dtype)
+    n_freq = len(freq)
+
+    # Pesos de interpolación lineal ancla -> frecuencia (n_anclas, n_freq)
+    pesos = np.array([np.interp(freq, FRECUENCIAS_ANCLA, fila) for fila in np.eye(len(FRECUENCIAS_ANCLA))], dtype=dtype)
+
+    # El ancho se recalcula por bloque con el espesor de baffle muestreado
+    n_baffles = params['n_baffles']
+
+    welford = EstadisticaWelford(n_freq)
+    histograma = HistogramaCuantiles(n_freq)
+
+    restantes = n_muestras
+    while restantes > 0:
+        n_b = min(tam_bloque, restantes)
+        restantes -= n_b
+
+        # Las perturbaciones se muestrean en float64 (son pocas columnas) para
+        # que la misma semilla dé las mismas muestras en ambas precisiones
+        delta_alpha = rng.normal(0.0, sigma_alpha, (n_b, len(FRECUENCIAS_ANCLA))).astype(dtype) @ pesos
+        alpha = np.clip(alpha_nominal + delta_alpha, 0.0, 1.0)
+        espesor = params['baffle_thickness'] + rng.normal(0.0, sigma_espesor, (n_b, 1)).astype(dtype)
+        _, width = ancho_envolvente(params['n_espacios'], 2 * params['h'], np.maximum(espesor, 0.0),
+                                    params['wall_thickness'])
+
+        splitter = SplitterSilencer(params['L'], width, n_baffles, alpha, dtype=dtype)
+        TL_total = splitter.total_attenuation(freq)
+
+        welford.actualizar(TL_total)
+        histograma.actualizar(TL_total)
+
+    return {
+        'freq': freq,
+        'n_muestras': welford.n,
+        'media': welford.media,
+        'varianza': welford.varianza,
+        'desviacion': np.sqrt(welford.varianza),
+        'percentiles': {q: histograma.percentil(q) for q in percentiles},
+    }
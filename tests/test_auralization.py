@@ -0,0 +1,50 @@
+# --------------------------------------------
+# test_auralization.py
+# Escritor/lector WAV: RIFF normal y RF64 por encima de 4 GiB
+# --------------------------------------------
+
+import struct
+import numpy as np
+from app.simulation.auralization import EscritorWav, LectorWav, MAX_RIFF
+
+def test_ida_y_vuelta_riff(tmp_path):
+    ruta = tmp_path / 'corto.wav'
+    x = np.random.default_rng(0).uniform(-0.5, 0.5, (1000, 2))
+    with EscritorWav(ruta, 48000, 2, bits=32) as w:
+        w.escribir(x)
+    with open(ruta, 'rb') as f:
+        assert f.read(4) == b'RIFF'
+    lector = LectorWav(ruta)
+    assert (lector.fs, lector.canales, lector.n_muestras) == (48000, 2, 1000)
+    assert np.allclose(lector.leer(0, 1000), x.astype(np.float32))
+
+def test_ida_y_vuelta_lector_externo(tmp_path):
+    wavfile = __import__('pytest').importorskip('scipy.io.wavfile')
+    ruta = tmp_path / 'pcm.wav'
+    x = np.linspace(-0.9, 0.9, 500)[:, None]
+    with EscritorWav(ruta, 44100, 1) as w:
+        w.escribir(x)
+    fs, datos = wavfile.read(ruta)
+    assert fs == 44100 and np.array_equal(datos, np.round(x[:, 0] * 32768).astype(np.int16))
+
+def test_mas_de_4_gib_pasa_a_rf64(tmp_path):
+    # Archivo disperso: solo el primer bloque tiene datos reales
+    ruta = tmp_path / 'largo.wav'
+    canales, bits = 8, 32
+    n_muestras = (MAX_RIFF // (canales * bits // 8)) + 1000
+    x = np.full((16, canales), 0.25)
+    w = EscritorWav(ruta, 48000, canales, bits=bits)
+    w.escribir(x)
+    w.n_muestras = n_muestras
+    w._f.truncate(80 + n_muestras * canales * bits // 8)
+    w.cerrar()
+
+    with open(ruta, 'rb') as f:
+        riff, tamano, wave, ds64, _, tamano_riff, tamano_datos, muestras, _ = struct.unpack('<4sI4s4sIQQQI', f.read(48))
+    assert (riff, tamano, wave, ds64) == (b'RF64', MAX_RIFF, b'WAVE', b'ds64')
+    assert tamano_datos == n_muestras * canales * 4 > MAX_RIFF and muestras == n_muestras
+    assert tamano_riff == ruta.stat().st_size - 8
+
+    lector = LectorWav(ruta)
+    assert lector.n_muestras == n_muestras
+    assert np.array_equal(lector.leer(0, 16), x)
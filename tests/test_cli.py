@@ -0,0 +1,56 @@
+# --------------------------------------------
+# test_cli.py
+# Registros mal formados: una línea de error por registro sin cortar el flujo
+# --------------------------------------------
+
+import io
+import json
+import pytest
+from app import cli
+
+# --------------------------------------------
+# Ejecuta la CLI con NDJSON por stdin y devuelve (código, filas)
+# --------------------------------------------
+def _ejecutar(monkeypatch, capsys, lineas, *argv):
+    monkeypatch.setattr('sys.stdin', io.StringIO('\n'.join(lineas) + '\n'))
+    codigo = cli.main(['--entrada', '-', *argv])
+    return codigo, [json.loads(linea) for linea in capsys.readouterr().out.splitlines()]
+
+@pytest.mark.parametrize('linea', ['5', '[1]', '"texto"', 'null'])
+def test_linea_que_no_es_objeto(monkeypatch, capsys, linea):
+    codigo, filas = _ejecutar(monkeypatch, capsys, [linea, '{"id": "ok"}'])
+    assert codigo == 1
+    assert 'objeto JSON' in filas[0]['error']
+    assert filas[1]['id'] == 'ok' and 'error' not in filas[1]
+
+def test_lista_json_con_elementos_que_no_son_objeto(tmp_path, capsys):
+    ruta = tmp_path / 'disenos.json'
+    ruta.write_text(json.dumps([{'id': 1}, 7, [2], {'id': 4}]), encoding='utf-8')
+    codigo = cli.main(['--entrada', str(ruta)])
+    filas = [json.loads(linea) for linea in capsys.readouterr().out.splitlines()]
+    assert codigo == 1
+    assert [fila.get('id') for fila in filas] == [1, None, None, 4]
+    assert 'error' in filas[1] and 'error' in filas[2]
+    assert 'error' not in filas[0] and 'error' not in filas[3]
+
+@pytest.mark.parametrize('material', [['x'], {'a': 1}, 3, None])
+def test_material_que_no_es_texto(monkeypatch, capsys, material):
+    registro = json.dumps({'id': 1, 'material': material})
+    codigo, filas = _ejecutar(monkeypatch, capsys, [registro, '{"id": 2}'])
+    assert codigo == 1
+    assert filas[0] == {'id': 1, 'error': filas[0]['error']} and 'material' in filas[0]['error']
+    assert 'error' not in filas[1]
+
+@pytest.mark.parametrize('campo', ['Q_m3h', 'V', 'H', 'L', 'baffle_thickness', 'wall_thickness', 'fmin', 'fmax'])
+@pytest.mark.parametrize('valor', [True, False, '12', None, [1.0]])
+def test_campo_numerico_que_no_es_numero(monkeypatch, capsys, campo, valor):
+    registro = json.dumps({'id': 1, campo: valor})
+    codigo, filas = _ejecutar(monkeypatch, capsys, [registro, '{"id": 2}'])
+    assert codigo == 1
+    assert campo in filas[0]['error']
+    assert 'error' not in filas[1]
+
+def test_registro_valido_sale_completo(monkeypatch, capsys):
+    codigo, filas = _ejecutar(monkeypatch, capsys, ['{"id": 1, "L": 2}'])
+    assert codigo == 0
+    assert filas[0]['L'] == 2.0 and filas[0]['n_baffles'] > 0
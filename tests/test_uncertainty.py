@@ -0,0 +1,36 @@
+# --------------------------------------------
+# test_uncertainty.py
+# Percentiles en streaming frente a np.percentile sobre todas las muestras
+# --------------------------------------------
+
+import numpy as np
+import pytest
+from app.simulation.uncertainty import HistogramaCuantiles
+
+def _acumular(bloques):
+    histograma = HistogramaCuantiles(bloques[0].shape[1])
+    for bloque in bloques:
+        histograma.actualizar(bloque)
+    return histograma
+
+@pytest.mark.parametrize('desplazamiento', [0.0, 30.0, -30.0])
+def test_primer_bloque_pequeno_y_muestras_fuera_de_rango(desplazamiento):
+    # El primer bloque (10 muestras) no anticipa la dispersión ni la deriva posteriores
+    rng = np.random.default_rng(3)
+    bloques = [rng.normal(0.0, 0.1, (10, 3))]
+    bloques += [rng.normal(desplazamiento * np.arange(3), 5.0, (5000, 3)) for _ in range(4)]
+    histograma = _acumular(bloques)
+    todas = np.vstack(bloques)
+    assert histograma.conteos.sum(axis=1).tolist() == [len(todas)] * 3
+    for q in (2.5, 50, 97.5):
+        exacto = np.percentile(todas, q, axis=0)
+        assert np.allclose(histograma.percentil(q), exacto, atol=0.05), q
+
+def test_ampliar_conserva_los_conteos():
+    rng = np.random.default_rng(4)
+    histograma = _acumular([rng.normal(0.0, 1.0, (1000, 2))])
+    antes = histograma.percentil(50)
+    histograma._ampliar(np.array([-40.0, 0.0]), np.array([0.0, 60.0]))
+    assert histograma.conteos.sum() == 2000
+    assert histograma.limite_inf[0] <= -40.0 and histograma.limite_inf[1] + histograma.n_bins * histograma.ancho_bin[1] > 60.0
+    assert np.allclose(histograma.percentil(50), antes, atol=histograma.ancho_bin)